@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import tenders, users, auth, awards, scrapers
+from app.api.v1.endpoints import tenders, users, auth, awards, scrapers, batch
 
 api_router = APIRouter()
 
@@ -9,4 +9,5 @@ api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(tenders.router, prefix="/tenders", tags=["tenders"])
 api_router.include_router(awards.router, prefix="/awards", tags=["awards"])
-api_router.include_router(scrapers.router, prefix="/scrapers", tags=["scrapers"]) 
\ No newline at end of file
+api_router.include_router(scrapers.router, prefix="/scrapers", tags=["scrapers"])
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"]) 
\ No newline at end of file
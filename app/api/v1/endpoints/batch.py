@@ -0,0 +1,80 @@
+"""Batch request endpoint."""
+
+import asyncio
+import re
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+
+from app.models.batch import BatchRequest, BatchRequestItem, BatchResponse, BatchResponseItem
+from app.core.database import get_tender_by_id
+from app.services.job_service import job_service
+
+router = APIRouter()
+
+MAX_BATCH_SIZE = 50
+
+# Caller credentials passed on to proxied sub-requests
+_FORWARDED_HEADERS = ("authorization", "cookie")
+
+_TENDER_PATH = re.compile(r"^/api/v1/tenders/([^/?]+)$")
+_JOB_PATH = re.compile(r"^/api/v1/scrapers/jobs/([^/?]+)$")
+
+
+async def _lookup_tender(item: BatchRequestItem, tender_id: str) -> BatchResponseItem:
+    """Resolve a tender read without going through HTTP routing."""
+    tender = await get_tender_by_id(tender_id)
+    if not tender:
+        return BatchResponseItem(id=item.id, status=404, body={"detail": "Tender not found"})
+    return BatchResponseItem(id=item.id, status=200, body=tender)
+
+
+async def _lookup_job(item: BatchRequestItem, job_id: str) -> BatchResponseItem:
+    """Resolve a scraper job read without going through HTTP routing."""
+    job = await job_service.get_job(job_id)
+    if not job:
+        return BatchResponseItem(id=item.id, status=404, body={"detail": "Job not found"})
+    return BatchResponseItem(id=item.id, status=200, body=job.model_dump(mode="json"))
+
+
+async def _dispatch(client: httpx.AsyncClient, item: BatchRequestItem) -> BatchResponseItem:
+    """Execute a single read-only sub-request."""
+    if item.method.upper() != "GET":
+        return BatchResponseItem(id=item.id, status=405, body={"detail": "Only GET sub-requests are allowed"})
+    
+    path = item.url.split("?", 1)[0]
+    
+    try:
+        match = _TENDER_PATH.match(path)
+        if match:
+            return await _lookup_tender(item, match.group(1))
+        match = _JOB_PATH.match(path)
+        if match:
+            return await _lookup_job(item, match.group(1))
+        
+        if path.rstrip("/").endswith("/batch"):
+            return BatchResponseItem(id=item.id, status=400, body={"detail": "Nested batch requests are not allowed"})
+        
+        response = await client.get(item.url)
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        return BatchResponseItem(id=item.id, status=response.status_code, body=body)
+    
+    except Exception as e:
+        return BatchResponseItem(id=item.id, status=500, body={"detail": str(e)})
+
+
+@router.post("/", response_model=BatchResponse)
+async def batch_endpoint(batch: BatchRequest, request: Request) -> BatchResponse:
+    """Execute several read-only API requests in one round-trip."""
+    if len(batch.requests) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch size exceeds {MAX_BATCH_SIZE} requests")
+    
+    transport = httpx.ASGITransport(app=request.app)
+    headers = {name: request.headers[name] for name in _FORWARDED_HEADERS if name in request.headers}
+    async with httpx.AsyncClient(transport=transport, base_url=str(request.base_url), headers=headers) as client:
+        responses = await asyncio.gather(*[_dispatch(client, item) for item in batch.requests])
+    
+    return BatchResponse(responses=responses)
@@ -2,6 +2,9 @@
 
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
 from typing import List, Optional, Dict, Any
+from fastapi_cache.decorator import cache
+
+from app.core.cache import SCRAPERS_NAMESPACE, SCHEDULER_NAMESPACE, STATUS_CACHE_TTL, invalidate_scheduler_cache
 
 from app.models.scraper_job import ScraperJob, ScraperJobCreate, ScraperJobList, ScraperStatus
 from app.services.scraper_service import scraper_service
@@ -12,6 +15,7 @@ router = APIRouter()
 
 
 @router.get("/status", response_model=List[ScraperStatus])
+@cache(expire=STATUS_CACHE_TTL, namespace=SCRAPERS_NAMESPACE)
 async def get_scraper_status():
     """Get status of all scrapers."""
     try:
@@ -21,6 +25,7 @@ async def get_scraper_status():
 
 
 @router.get("/status/{scraper_name}", response_model=ScraperStatus)
+@cache(expire=STATUS_CACHE_TTL, namespace=SCRAPERS_NAMESPACE)
 async def get_scraper_status_by_name(scraper_name: str):
     """Get status of a specific scraper."""
     try:
@@ -71,7 +76,7 @@ async def run_all_scrapers(
         raise HTTPException(status_code=500, detail=f"Failed to run scrapers: {str(e)}")
 
 
-@router.get("/jobs", response_model=ScraperJobList)
+@router.get("/jobs", response_model=ScraperJobList, response_model_exclude_none=True)
 async def get_scraper_jobs(
     limit: int = Query(50, ge=1, le=100, description="Number of results to return"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
@@ -88,7 +93,7 @@ async def get_scraper_jobs(
             except ValueError:
                 raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
         
-        result = job_service.get_jobs(limit, offset, job_status)
+        result = await job_service.get_jobs(limit, offset, job_status)
         
         return ScraperJobList(
             jobs=result["jobs"],
@@ -106,7 +111,7 @@ async def get_scraper_jobs(
 async def get_scraper_job(job_id: str):
     """Get a specific scraper job."""
     try:
-        job = job_service.get_job(job_id)
+        job = await job_service.get_job(job_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
@@ -148,6 +153,7 @@ async def cancel_scraper_job(job_id: str):
 
 
 @router.get("/scheduler/status")
+@cache(expire=STATUS_CACHE_TTL, namespace=SCHEDULER_NAMESPACE)
 async def get_scheduler_status():
     """Get scheduler status and configuration."""
     try:
@@ -161,6 +167,7 @@ async def start_scheduler():
     """Start the scheduler service."""
     try:
         await scheduler_service.start()
+        await invalidate_scheduler_cache()
         return {"message": "Scheduler started successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start scheduler: {str(e)}")
@@ -171,6 +178,7 @@ async def stop_scheduler():
     """Stop the scheduler service."""
     try:
         await scheduler_service.stop()
+        await invalidate_scheduler_cache()
         return {"message": "Scheduler stopped successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to stop scheduler: {str(e)}")
@@ -181,6 +189,7 @@ async def update_scheduler_schedule(schedule: Dict[str, str]):
     """Update the scheduler configuration."""
     try:
         scheduler_service.update_schedule(schedule)
+        await invalidate_scheduler_cache()
         return {"message": "Schedule updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update schedule: {str(e)}")
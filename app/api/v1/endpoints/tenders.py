@@ -1,60 +1,83 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List, Optional
+from functools import lru_cache
+from typing import Final, List, Optional
 from datetime import date
+from fastapi_cache.decorator import cache
 
+from app.core.cache import TENDERS_NAMESPACE, SCRAPERS_NAMESPACE, tender_list_key_builder, invalidate_tenders_cache
 from app.models.tender import Tender, TenderCreate, TenderUpdate, TenderList
 from app.core.database import get_tenders, get_tender_by_id, update_tender, delete_tender
 from app.services.scraper_service import scraper_service
 
 router = APIRouter()
 
+# Map province filter values to scraper source names
+_PROVINCE_TO_SOURCE: Final[dict[str, str]] = {
+    "federal": "canadabuys",
+    "ontario": "ontario",
+    "alberta": "apc",
+    "bc": "bcbid",
+    "manitoba": "manitoba",
+    "saskatchewan": "saskatchewan",
+    "quebec": "quebec"
+}
 
-@router.get("/", response_model=TenderList)
+
+@lru_cache(maxsize=16)
+def _resolve_source(province: Optional[str]) -> Optional[str]:
+    """Resolve a province filter value to its source_name."""
+    if not province:
+        return None
+    return _PROVINCE_TO_SOURCE.get(province.lower())
+
+
+@router.get("/", response_model=None, responses={200: {"model": TenderList}})
+@cache(expire=60, namespace=TENDERS_NAMESPACE, key_builder=tender_list_key_builder)
 async def get_tenders_endpoint(
     province: Optional[str] = Query(None, description="Filter by province"),
+    provinces: Optional[List[str]] = Query(None, description="Filter by any of several provinces"),
     naics: Optional[str] = Query(None, description="Filter by NAICS code"),
     keyword: Optional[str] = Query(None, description="Search in title and description"),
     status: Optional[str] = Query(None, description="Filter by status"),
     limit: int = Query(50, ge=1, le=100, description="Number of results to return"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
-) -> TenderList:
-    """Get list of tenders with optional filtering."""
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+) -> dict:
+    """Get list of tenders with optional filtering.
+    
+    Rows are returned as delivered by Supabase; they already match the
+    ``Tender`` shape, so per-row model construction is skipped.
+    """
     try:
-        # Map province to source_name for filtering
-        source_name = None
-        if province:
-            province_mapping = {
-                "federal": "canadabuys",
-                "ontario": "ontario",
-                "alberta": "apc",
-                "bc": "bcbid",
-                "manitoba": "manitoba",
-                "saskatchewan": "saskatchewan",
-                "quebec": "quebec"
-            }
-            source_name = province_mapping.get(province.lower())
+        # Map provinces to source_names for filtering
+        requested = ([province] if province else []) + (provinces or [])
+        source_names = list(dict.fromkeys(
+            source for source in map(_resolve_source, requested) if source
+        ))
         
-        result = get_tenders(
+        result = await get_tenders(
             limit=limit,
             offset=offset,
-            source_name=source_name,
+            source_names=source_names,
             keyword=keyword,
-            status=status
+            status=status,
+            cursor=cursor
         )
         
-        # Convert to Tender models
-        tenders = []
-        for tender_data in result["tenders"]:
-            tender = Tender(**tender_data)
-            tenders.append(tender)
-        
-        return TenderList(
-            tenders=tenders,
-            total=result["total"],
-            limit=result["limit"],
-            offset=result["offset"]
-        )
+        # Omit null columns, as response_model_exclude_none would
+        return {
+            "tenders": [
+                {k: v for k, v in row.items() if v is not None}
+                for row in result["tenders"]
+            ],
+            "total": result["total"],
+            "limit": result["limit"],
+            "offset": result["offset"],
+            "next_cursor": result["next_cursor"]
+        }
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve tenders: {str(e)}")
 
@@ -63,7 +86,7 @@ async def get_tenders_endpoint(
 async def get_tender_endpoint(tender_id: str) -> Tender:
     """Get a specific tender by ID."""
     try:
-        tender_data = get_tender_by_id(tender_id)
+        tender_data = await get_tender_by_id(tender_id)
         if not tender_data:
             raise HTTPException(status_code=404, detail="Tender not found")
         
@@ -79,14 +102,12 @@ async def get_tender_endpoint(tender_id: str) -> Tender:
 async def update_tender_endpoint(tender_id: str, tender_update: TenderUpdate) -> Tender:
     """Update a tender."""
     try:
-        # Get existing tender
-        existing_data = get_tender_by_id(tender_id)
-        if not existing_data:
-            raise HTTPException(status_code=404, detail="Tender not found")
-        
-        # Update with new data
+        # Update with new data; no returned row means no tender matched
         update_data = tender_update.dict(exclude_unset=True)
-        updated_data = update_tender(tender_id, update_data)
+        updated_data = await update_tender(tender_id, update_data)
+        if not updated_data:
+            raise HTTPException(status_code=404, detail="Tender not found")
+        await invalidate_tenders_cache()
         
         return Tender(**updated_data)
         
@@ -100,9 +121,10 @@ async def update_tender_endpoint(tender_id: str, tender_update: TenderUpdate) ->
 async def delete_tender_endpoint(tender_id: str):
     """Delete a tender."""
     try:
-        success = delete_tender(tender_id)
+        success = await delete_tender(tender_id)
         if not success:
             raise HTTPException(status_code=404, detail="Tender not found")
+        await invalidate_tenders_cache()
         
         return {"message": "Tender deleted successfully"}
         
@@ -127,6 +149,7 @@ async def unbookmark_tender(tender_id: str) -> dict:
 
 
 @router.get("/statistics/summary")
+@cache(expire=60, namespace=TENDERS_NAMESPACE)
 async def get_tender_statistics():
     """Get tender statistics."""
     try:
@@ -137,6 +160,7 @@ async def get_tender_statistics():
 
 
 @router.get("/sources/list")
+@cache(expire=60, namespace=SCRAPERS_NAMESPACE)
 async def get_available_sources():
     """Get list of available tender sources."""
     try:
@@ -0,0 +1,70 @@
+"""Response caching for read-mostly endpoints."""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from loguru import logger
+from redis import asyncio as aioredis
+
+from app.config import settings
+
+
+CACHE_PREFIX = "bidsense"
+TENDERS_NAMESPACE = "tenders"
+SCRAPERS_NAMESPACE = "scrapers"
+SCHEDULER_NAMESPACE = "scheduler"
+
+# Short TTL for status endpoints polled by dashboards
+STATUS_CACHE_TTL = 5
+
+# Query parameters that identify a distinct /tenders listing
+_TENDER_LIST_KEYS = ("province", "provinces", "naics", "keyword", "status", "limit", "offset", "cursor")
+
+
+def init_cache() -> None:
+    """Initialize the response cache, preferring Redis when configured."""
+    redis_url = getattr(settings, "redis_url", None)
+    if redis_url:
+        redis = aioredis.from_url(redis_url)
+        FastAPICache.init(RedisBackend(redis), prefix=CACHE_PREFIX)
+        logger.info("Response cache initialized with Redis backend")
+    else:
+        FastAPICache.init(InMemoryBackend(), prefix=CACHE_PREFIX)
+        logger.info("Response cache initialized with in-memory backend")
+
+
+def tender_list_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Any = None,
+    response: Any = None,
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Build a cache key for the tender listing from its filter parameters.
+    
+    ``namespace`` already arrives as "{prefix}:{namespace}", the layout
+    FastAPICache.clear(namespace=...) matches on.
+    """
+    kwargs = kwargs or {}
+    params = ":".join(str(kwargs.get(name)) for name in _TENDER_LIST_KEYS)
+    return f"{namespace}:{func.__name__}:{params}"
+
+
+async def invalidate_tenders_cache() -> None:
+    """Drop every cached response derived from the tenders table."""
+    try:
+        await FastAPICache.clear(namespace=TENDERS_NAMESPACE)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate tenders cache: {e}")
+
+
+async def invalidate_scheduler_cache() -> None:
+    """Drop cached scheduler status after the scheduler changes state."""
+    try:
+        await FastAPICache.clear(namespace=SCHEDULER_NAMESPACE)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate scheduler cache: {e}")
@@ -0,0 +1,25 @@
+"""Keyset pagination cursors for tender listings."""
+
+import base64
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: str, tender_id: str) -> str:
+    """Encode a keyset pagination cursor from the last row of a page."""
+    raw = f"{created_at}|{tender_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a keyset pagination cursor into normalized (created_at, id).
+    
+    Both parts are parsed as a timestamp and a UUID and re-serialized, so
+    nothing from the cursor reaches the PostgREST filter verbatim.
+    """
+    try:
+        created_at, tender_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at).isoformat(), str(uuid.UUID(tender_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
@@ -1,18 +1,38 @@
 """Database connection and session management."""
 
 import os
-from typing import Generator
+import re
+from typing import Generator, List, Optional
+import httpx
 from supabase import create_client, Client
 from loguru import logger
 
 from app.config import settings
+from app.core.cursor import decode_cursor, encode_cursor
+
+
+# Upper bound on free-text search input passed to PostgREST
+MAX_KEYWORD_LENGTH = 200
+
+# Anything other than word characters, whitespace and hyphens is dropped from keywords
+_KW_SAFE = re.compile(r'[^\w\s\-]')
+
+# Natural key used to dedupe scraped tenders on upsert
+TENDER_CONFLICT_COLUMNS = "source_name,external_id"
 
 
 class DatabaseManager:
-    """Database manager for Supabase connection."""
+    """Database manager for Supabase connection.
+    
+    Tender CRUD goes through a long-lived ``httpx.AsyncClient`` against the
+    PostgREST endpoint so requests never block the event loop and share a
+    keep-alive connection pool. The ``supabase-py`` client is kept for RPC
+    and aggregate queries.
+    """
     
     def __init__(self):
         self.client: Client = None
+        self.rest: Optional[httpx.AsyncClient] = None
         self._connect()
     
     def _connect(self):
@@ -32,6 +52,27 @@ class DatabaseManager:
         if not self.client:
             self._connect()
         return self.client
+    
+    def get_rest_client(self) -> httpx.AsyncClient:
+        """Get the pooled async PostgREST client, creating it on first use."""
+        if self.rest is None or self.rest.is_closed:
+            self.rest = httpx.AsyncClient(
+                base_url=f"{settings.supabase_url}/rest/v1",
+                headers={
+                    "apikey": settings.supabase_key,
+                    "Authorization": f"Bearer {settings.supabase_key}",
+                },
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=50),
+                timeout=httpx.Timeout(30.0),
+            )
+        return self.rest
+    
+    async def close(self):
+        """Close the pooled PostgREST client."""
+        if self.rest is not None:
+            await self.rest.aclose()
+            self.rest = None
 
 
 # Global database manager instance
@@ -43,6 +84,18 @@ def get_db() -> Client:
     return db_manager.get_client()
 
 
+def get_rest() -> httpx.AsyncClient:
+    """Get the async PostgREST client."""
+    return db_manager.get_rest_client()
+
+
+def _total_from_content_range(response: httpx.Response) -> int:
+    """Read the exact count from a PostgREST Content-Range header (e.g. ``0-49/1234``)."""
+    content_range = response.headers.get("content-range", "")
+    total = content_range.rpartition("/")[2]
+    return int(total) if total.isdigit() else 0
+
+
 def execute_query(query: str, params: dict = None) -> dict:
     """Execute a raw SQL query."""
     try:
@@ -54,85 +107,184 @@ def execute_query(query: str, params: dict = None) -> dict:
         raise
 
 
-def insert_tender(tender_data: dict) -> dict:
+async def insert_tender(tender_data: dict, client: Optional[httpx.AsyncClient] = None) -> dict:
     """Insert a new tender into the database."""
     try:
-        client = get_db()
-        result = client.table('tenders').insert(tender_data).execute()
-        return result.data[0] if result.data else None
+        response = await (client or get_rest()).post(
+            "/tenders",
+            json=tender_data,
+            headers={"Prefer": "return=representation"}
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data[0] if data else None
     except Exception as e:
         logger.error(f"Failed to insert tender: {e}")
         raise
 
 
-def get_tenders(
+async def upsert_tenders(
+    rows: List[dict],
+    on_conflict: str = TENDER_CONFLICT_COLUMNS,
+    client: Optional[httpx.AsyncClient] = None
+) -> int:
+    """Insert or merge many tenders in one request and return how many were written."""
+    if not rows:
+        return 0
+    try:
+        response = await (client or get_rest()).post(
+            "/tenders",
+            params={"on_conflict": on_conflict},
+            json=rows,
+            headers={"Prefer": "resolution=merge-duplicates,missing=default,return=minimal,count=exact"}
+        )
+        response.raise_for_status()
+        return _total_from_content_range(response) or len(rows)
+    except Exception as e:
+        logger.error(f"Failed to upsert tenders: {e}")
+        raise
+
+
+def normalize_keyword(keyword: Optional[str]) -> Optional[str]:
+    """Strip filter syntax, collapse whitespace and bound the length of a search keyword.
+    
+    Returns None when nothing searchable is left.
+    """
+    if not keyword:
+        return None
+    keyword = " ".join(_KW_SAFE.sub(' ', keyword).split())[:MAX_KEYWORD_LENGTH]
+    return keyword or None
+
+
+async def get_tenders(
     limit: int = 50,
     offset: int = 0,
     source_name: str = None,
     keyword: str = None,
-    status: str = None
+    status: str = None,
+    cursor: Optional[str] = None,
+    source_names: Optional[List[str]] = None
 ) -> dict:
-    """Get tenders with filtering and pagination."""
+    """Get tenders with filtering and pagination.
+    
+    Results are ordered newest first with ``id`` as a tie-breaker so pages
+    are stable. When ``cursor`` is given, keyset pagination is used and
+    ``offset`` is ignored; ``total`` then counts the rows after the cursor.
+    """
     try:
-        client = get_db()
-        query = client.table('tenders').select('*')
+        params = [("select", "*")]
+        keyword = normalize_keyword(keyword)
         
         # Apply filters
-        if source_name:
-            query = query.eq('source_name', source_name)
+        if source_names:
+            params.append(("source_name", f"in.({','.join(source_names)})"))
+        elif source_name:
+            params.append(("source_name", f"eq.{source_name}"))
         
         if keyword:
-            query = query.or_(f'title.ilike.%{keyword}%,description.ilike.%{keyword}%')
+            # Backed by the GIN index on search_vector (migration 005)
+            params.append(("search_vector", f"wfts(english).{keyword}"))
         
         if status:
-            query = query.eq('status', status)
+            params.append(("status", f"eq.{status}"))
         
-        # Get total count
-        count_result = query.execute()
-        total = len(count_result.data)
+        # Stable ordering backed by idx_tenders_created_at_id
+        params.append(("order", "created_at.desc,id.desc"))
         
         # Apply pagination
-        result = query.range(offset, offset + limit - 1).execute()
+        if cursor:
+            cur_ts, cur_id = decode_cursor(cursor)
+            params.append(
+                ("or", f'(created_at.lt."{cur_ts}",and(created_at.eq."{cur_ts}",id.lt.{cur_id}))')
+            )
+        else:
+            params.append(("offset", str(offset)))
+        params.append(("limit", str(limit)))
+        
+        # Ask PostgREST for the exact count alongside the page so a single
+        # round-trip returns both the rows and the total.
+        response = await get_rest().get(
+            "/tenders",
+            params=params,
+            headers={"Prefer": "count=exact"}
+        )
+        response.raise_for_status()
+        tenders = response.json()
+        
+        next_cursor = None
+        if len(tenders) == limit:
+            last = tenders[-1]
+            next_cursor = encode_cursor(last['created_at'], last['id'])
         
         return {
-            "tenders": result.data,
-            "total": total,
+            "tenders": tenders,
+            "total": _total_from_content_range(response),
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         }
     except Exception as e:
         logger.error(f"Failed to get tenders: {e}")
         raise
 
 
-def get_tender_by_id(tender_id: str) -> dict:
+async def get_tender_by_id(tender_id: str) -> dict:
     """Get a specific tender by ID."""
     try:
-        client = get_db()
-        result = client.table('tenders').select('*').eq('id', tender_id).execute()
-        return result.data[0] if result.data else None
+        response = await get_rest().get(
+            "/tenders",
+            params={"select": "*", "id": f"eq.{tender_id}", "limit": "1"}
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data[0] if data else None
     except Exception as e:
         logger.error(f"Failed to get tender {tender_id}: {e}")
         raise
 
 
-def update_tender(tender_id: str, update_data: dict) -> dict:
+async def tender_exists(tender_id: str) -> bool:
+    """Check whether a tender exists without fetching its row."""
+    try:
+        response = await get_rest().head(
+            "/tenders",
+            params={"select": "id", "id": f"eq.{tender_id}"},
+            headers={"Prefer": "count=exact"}
+        )
+        response.raise_for_status()
+        return _total_from_content_range(response) > 0
+    except Exception as e:
+        logger.error(f"Failed to check tender {tender_id}: {e}")
+        raise
+
+
+async def update_tender(tender_id: str, update_data: dict) -> dict:
     """Update a tender."""
     try:
-        client = get_db()
-        result = client.table('tenders').update(update_data).eq('id', tender_id).execute()
-        return result.data[0] if result.data else None
+        response = await get_rest().patch(
+            "/tenders",
+            params={"id": f"eq.{tender_id}"},
+            json=update_data,
+            headers={"Prefer": "return=representation"}
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data[0] if data else None
     except Exception as e:
         logger.error(f"Failed to update tender {tender_id}: {e}")
         raise
 
 
-def delete_tender(tender_id: str) -> bool:
+async def delete_tender(tender_id: str) -> bool:
     """Delete a tender."""
     try:
-        client = get_db()
-        result = client.table('tenders').delete().eq('id', tender_id).execute()
-        return len(result.data) > 0
+        response = await get_rest().delete(
+            "/tenders",
+            params={"id": f"eq.{tender_id}"},
+            headers={"Prefer": "return=representation"}
+        )
+        response.raise_for_status()
+        return len(response.json()) > 0
     except Exception as e:
         logger.error(f"Failed to delete tender {tender_id}: {e}")
         raise 
\ No newline at end of file
@@ -1,11 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 
 from app.config import settings
 from app.api.v1.api import api_router
-from app.services.scheduler_service import start_scheduler, stop_scheduler, setup_signal_handlers
+from app.core.cache import init_cache
+from app.core.database import db_manager
+from app.services.job_service import job_queue
+from app.services.scheduler_service import start_scheduler, stop_scheduler
+from app.services.scraper_service import scraper_service
 
 
 def create_app() -> FastAPI:
@@ -17,6 +21,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
+        default_response_class=ORJSONResponse,
     )
     
     # Add CORS middleware
@@ -34,8 +39,11 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     async def startup_event():
         """Startup event handler."""
-        # Setup signal handlers for graceful shutdown
-        setup_signal_handlers()
+        # Initialize response cache (Redis when REDIS_URL is set)
+        init_cache()
+        
+        # Start the scraper job worker pool
+        await job_queue.start_workers()
         
         # Start scheduler service
         if not settings.debug:  # Only start scheduler in production
@@ -46,6 +54,15 @@ def create_app() -> FastAPI:
         """Shutdown event handler."""
         # Stop scheduler service
         await stop_scheduler()
+        
+        # End any scraper subprocesses still running
+        await scraper_service.terminate_subprocesses()
+        
+        # Stop the scraper job worker pool
+        await job_queue.stop_workers()
+        
+        # Close pooled database connections
+        await db_manager.close()
     
     @app.get("/")
     async def root():
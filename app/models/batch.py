@@ -0,0 +1,28 @@
+"""Batch request models for BidSense API."""
+
+from typing import Any, Optional
+from pydantic import BaseModel, Field
+
+
+class BatchRequestItem(BaseModel):
+    """A single sub-request within a batch."""
+    id: str = Field(..., description="Client-supplied identifier echoed in the response")
+    method: str = Field("GET", description="HTTP method; only GET is accepted")
+    url: str = Field(..., description="API path, e.g. /api/v1/tenders/{id}")
+
+
+class BatchRequest(BaseModel):
+    """Model for batch requests."""
+    requests: list[BatchRequestItem] = Field(..., description="Sub-requests to execute")
+
+
+class BatchResponseItem(BaseModel):
+    """Result of a single sub-request."""
+    id: str = Field(..., description="Identifier of the originating sub-request")
+    status: int = Field(..., description="HTTP status code")
+    body: Optional[Any] = Field(None, description="JSON response body")
+
+
+class BatchResponse(BaseModel):
+    """Model for batch responses."""
+    responses: list[BatchResponseItem] = Field(..., description="Sub-request results in request order")
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional, Dict, Any
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class JobStatus(str, Enum):
@@ -39,8 +39,7 @@ class ScraperJob(ScraperJobBase):
     logs: Optional[str] = Field(None, description="Job execution logs")
     created_at: datetime = Field(..., description="Job creation timestamp")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
 class ScraperJobList(BaseModel):
@@ -58,4 +57,6 @@ class ScraperStatus(BaseModel):
     last_run: Optional[datetime] = Field(None, description="Last successful run")
     last_error: Optional[str] = Field(None, description="Last error message")
     total_tenders: int = Field(0, description="Total tenders from this scraper")
-    avg_duration: Optional[float] = Field(None, description="Average run duration in seconds") 
\ No newline at end of file
+    avg_duration: Optional[float] = Field(None, description="Average run duration in seconds")
+    
+    model_config = ConfigDict(from_attributes=True, frozen=True) 
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TenderBase(BaseModel):
@@ -48,8 +48,7 @@ class Tender(TenderBase):
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
 
 
 class TenderList(BaseModel):
@@ -57,4 +56,5 @@ class TenderList(BaseModel):
     tenders: list[Tender] = Field(..., description="List of tenders")
     total: int = Field(..., description="Total number of tenders")
     limit: int = Field(..., description="Number of results returned")
-    offset: int = Field(..., description="Number of results skipped") 
\ No newline at end of file
+    offset: int = Field(..., description="Number of results skipped")
+    next_cursor: Optional[str] = Field(None, description="Cursor for fetching the next page") 
\ No newline at end of file
@@ -1,22 +1,280 @@
 """Job queue management service for scraper jobs."""
 
 import asyncio
+import json
 import uuid
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 from loguru import logger
+from pydantic import TypeAdapter
+from redis import asyncio as aioredis
+from sortedcontainers import SortedList
 
+from app.config import settings
 from app.models.scraper_job import ScraperJob, JobStatus, ScraperJobCreate
 from app.services.scraper_service import scraper_service
 
 
-class JobQueue:
-    """Simple in-memory job queue for scraper jobs."""
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+# Hard cap on job records kept by the in-memory store
+MAX_IN_MEMORY_JOBS = 10_000
+
+# Worker pool bounds for executing scraper jobs
+MAX_CONCURRENT_JOBS = 4
+MAX_QUEUED_JOBS = 64
+
+# Validates a page of decoded job rows in one pass
+_JOB_LIST_ADAPTER = TypeAdapter(list[ScraperJob])
+
+
+class InMemoryJobStore:
+    """Process-local job storage, used when Redis is not configured.
     
-    def __init__(self):
+    Jobs are indexed newest-first in sorted lists (overall and per status)
+    so listing is a slice rather than a sort of every job. Once
+    ``max_jobs`` records are held, the oldest finished job is evicted on
+    each insert so memory stays bounded between cleanups.
+    """
+    
+    def __init__(self, max_jobs: int = MAX_IN_MEMORY_JOBS):
+        self.max_jobs = max_jobs
         self.jobs: Dict[str, ScraperJob] = {}
+        self._by_created = SortedList()
+        self._by_status: Dict[JobStatus, SortedList] = defaultdict(SortedList)
+        self._indexed_status: Dict[str, JobStatus] = {}
+    
+    @staticmethod
+    def _sort_key(job: ScraperJob) -> Tuple[float, str]:
+        return (-job.created_at.timestamp(), job.id)
+    
+    async def save(self, job: ScraperJob):
+        """Insert or update a job."""
+        key = self._sort_key(job)
+        previous_status = self._indexed_status.get(job.id)
+        
+        is_new = job.id not in self.jobs
+        if is_new:
+            self._by_created.add(key)
+        self.jobs[job.id] = job
+        
+        if previous_status != job.status:
+            if previous_status is not None:
+                self._by_status[previous_status].discard(key)
+            self._by_status[job.status].add(key)
+            self._indexed_status[job.id] = job.status
+        
+        if is_new and len(self.jobs) > self.max_jobs:
+            self._evict_oldest_finished()
+    
+    def _evict_oldest_finished(self):
+        """Drop the oldest finished job, if any."""
+        for _, job_id in reversed(self._by_created):
+            if self._indexed_status[job_id] in FINISHED_STATUSES:
+                self._remove(job_id)
+                return
+    
+    def _remove(self, job_id: str):
+        """Remove a job and its index entries."""
+        job = self.jobs.pop(job_id)
+        key = self._sort_key(job)
+        self._by_created.discard(key)
+        self._by_status[self._indexed_status.pop(job_id)].discard(key)
+    
+    async def get(self, job_id: str) -> Optional[ScraperJob]:
+        """Get a job by ID."""
+        return self.jobs.get(job_id)
+    
+    async def list(
+        self,
+        limit: int,
+        offset: int,
+        status: Optional[JobStatus] = None
+    ) -> Tuple[List[ScraperJob], int]:
+        """Get a page of jobs (newest first) and the total matching count."""
+        index = self._by_status[status] if status else self._by_created
+        page = [self.jobs[job_id] for _, job_id in index.islice(offset, offset + limit)]
+        return page, len(index)
+    
+    async def remove_finished_before(self, cutoff: datetime) -> int:
+        """Remove finished jobs created before the cutoff."""
+        jobs_to_remove = [
+            job_id for job_id, job in self.jobs.items()
+            if job.status in FINISHED_STATUSES and job.created_at < cutoff
+        ]
+        
+        for job_id in jobs_to_remove:
+            self._remove(job_id)
+        
+        return len(jobs_to_remove)
+
+
+class RedisJobStore:
+    """Redis-backed job storage shared across workers and restarts.
+    
+    Each job is a hash ``job:{id}``; ``jobs:by_created`` and the per-status
+    ``jobs:status:{status}`` sorted sets are scored by creation time so
+    pages are read with ZREVRANGE instead of sorting every job.
+    """
+    
+    BY_CREATED_KEY = "jobs:by_created"
+    
+    def __init__(self, redis_url: str):
+        self.redis = aioredis.from_url(redis_url, decode_responses=True)
+    
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"job:{job_id}"
+    
+    @staticmethod
+    def _status_key(status: JobStatus) -> str:
+        return f"jobs:status:{status.value}"
+    
+    @staticmethod
+    def _to_hash(job: ScraperJob) -> Dict[str, str]:
+        return {k: json.dumps(v) for k, v in job.model_dump(mode="json").items()}
+    
+    @staticmethod
+    def _decode_hash(data: Dict[str, str]) -> Dict[str, Any]:
+        return {k: json.loads(v) for k, v in data.items()}
+    
+    async def save(self, job: ScraperJob):
+        """Insert or update a job and move it to its status index."""
+        score = job.created_at.timestamp()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job.id), mapping=self._to_hash(job))
+            pipe.zadd(self.BY_CREATED_KEY, {job.id: score})
+            for status in JobStatus:
+                if status != job.status:
+                    pipe.zrem(self._status_key(status), job.id)
+            pipe.zadd(self._status_key(job.status), {job.id: score})
+            await pipe.execute()
+    
+    async def get(self, job_id: str) -> Optional[ScraperJob]:
+        """Get a job by ID."""
+        data = await self.redis.hgetall(self._job_key(job_id))
+        return ScraperJob.model_validate(self._decode_hash(data)) if data else None
+    
+    async def list(
+        self,
+        limit: int,
+        offset: int,
+        status: Optional[JobStatus] = None
+    ) -> Tuple[List[ScraperJob], int]:
+        """Get a page of jobs (newest first) and the total matching count."""
+        index_key = self._status_key(status) if status else self.BY_CREATED_KEY
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(index_key)
+            pipe.zrevrange(index_key, offset, offset + limit - 1)
+            total, job_ids = await pipe.execute()
+        
+        if not job_ids:
+            return [], total
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hgetall(self._job_key(job_id))
+            rows = await pipe.execute()
+        
+        jobs = _JOB_LIST_ADAPTER.validate_python([self._decode_hash(row) for row in rows if row])
+        return jobs, total
+    
+    async def remove_finished_before(self, cutoff: datetime) -> int:
+        """Remove finished jobs created before the cutoff."""
+        job_ids = await self.redis.zrangebyscore(self.BY_CREATED_KEY, 0, cutoff.timestamp())
+        if not job_ids:
+            return 0
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hget(self._job_key(job_id), "status")
+            statuses = await pipe.execute()
+        
+        finished = {status.value for status in FINISHED_STATUSES}
+        jobs_to_remove = [
+            job_id for job_id, raw_status in zip(job_ids, statuses)
+            if raw_status is None or json.loads(raw_status) in finished
+        ]
+        if not jobs_to_remove:
+            return 0
+        
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*[self._job_key(job_id) for job_id in jobs_to_remove])
+            pipe.zrem(self.BY_CREATED_KEY, *jobs_to_remove)
+            for status in FINISHED_STATUSES:
+                pipe.zrem(self._status_key(status), *jobs_to_remove)
+            await pipe.execute()
+        
+        return len(jobs_to_remove)
+
+
+def create_job_store():
+    """Create the job store, preferring Redis when configured."""
+    redis_url = getattr(settings, "redis_url", None)
+    if redis_url:
+        return RedisJobStore(redis_url)
+    return InMemoryJobStore()
+
+
+class JobQueue:
+    """Job queue for scraper jobs.
+    
+    Job records live in the configured store; the asyncio tasks running
+    them are always local to this process. Started jobs are queued and
+    executed by a fixed pool of workers, which caps how many scrapers
+    run at once.
+    """
+    
+    def __init__(self, store=None, worker_count: int = MAX_CONCURRENT_JOBS):
+        self.store = store or create_job_store()
         self.running_jobs: Dict[str, asyncio.Task] = {}
+        self.worker_count = worker_count
+        self.work_q: asyncio.Queue = asyncio.Queue(maxsize=MAX_QUEUED_JOBS)
+        self.workers: List[asyncio.Task] = []
+        self._queued: set = set()
+    
+    async def start_workers(self):
+        """Start the worker pool if it is not already running."""
+        self.workers = [w for w in self.workers if not w.done()]
+        for _ in range(self.worker_count - len(self.workers)):
+            self.workers.append(asyncio.create_task(self._worker()))
+    
+    async def stop_workers(self):
+        """Stop the worker pool and any jobs it is running."""
+        for task in list(self.running_jobs.values()):
+            task.cancel()
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers.clear()
+    
+    async def _worker(self):
+        """Pull queued job IDs and execute them one at a time."""
+        while True:
+            job_id = await self.work_q.get()
+            try:
+                job = await self.store.get(job_id)
+                if not job or job.status != JobStatus.PENDING:
+                    # Cancelled while waiting in the queue
+                    continue
+                
+                # Update job status
+                job.status = JobStatus.RUNNING
+                job.started_at = datetime.now(timezone.utc)
+                await self.store.save(job)
+                
+                # Run in its own task so cancel_job can stop just this job
+                task = asyncio.create_task(self._execute_job(job_id))
+                self.running_jobs[job_id] = task
+                await asyncio.wait({task})
+            except Exception as e:
+                logger.error(f"Worker failed to run job {job_id}: {e}")
+            finally:
+                self._queued.discard(job_id)
+                self.work_q.task_done()
     
     async def create_job(self, job_data: ScraperJobCreate) -> ScraperJob:
         """Create a new scraper job."""
@@ -31,34 +289,32 @@ class JobQueue:
             created_at=datetime.now(timezone.utc)
         )
         
-        self.jobs[job_id] = job
+        await self.store.save(job)
         logger.info(f"Created job {job_id} for scraper {job_data.scraper_name}")
         
         return job
     
     async def start_job(self, job_id: str) -> bool:
-        """Start a pending job."""
-        if job_id not in self.jobs:
+        """Queue a pending job for execution by the worker pool."""
+        job = await self.store.get(job_id)
+        if not job or job.status != JobStatus.PENDING or job_id in self._queued:
             return False
         
-        job = self.jobs[job_id]
-        if job.status != JobStatus.PENDING:
-            return False
+        await self.start_workers()
         
-        # Update job status
-        job.status = JobStatus.RUNNING
-        job.started_at = datetime.now(timezone.utc)
-        
-        # Create async task
-        task = asyncio.create_task(self._execute_job(job_id))
-        self.running_jobs[job_id] = task
+        try:
+            self.work_q.put_nowait(job_id)
+        except asyncio.QueueFull:
+            logger.warning(f"Job queue is full, cannot start job {job_id}")
+            return False
+        self._queued.add(job_id)
         
-        logger.info(f"Started job {job_id}")
+        logger.info(f"Queued job {job_id}")
         return True
     
     async def _execute_job(self, job_id: str):
         """Execute a scraper job."""
-        job = self.jobs[job_id]
+        job = await self.store.get(job_id)
         
         try:
             logger.info(f"Executing job {job_id} for scraper {job.scraper_name}")
@@ -72,23 +328,26 @@ class JobQueue:
             
             # Update job with results
             job.completed_at = datetime.now(timezone.utc)
-            job.tenders_scraped = result.get("tender_count", 0)
-            job.tenders_saved = result.get("tender_count", 0)  # Assuming all scraped are saved
-            job.logs = result.get("output", "")
+            job.tenders_scraped = result.tender_count
+            job.tenders_saved = result.tender_count  # Assuming all scraped are saved
+            job.logs = result.output
             
-            if result["success"]:
+            if result.success:
                 job.status = JobStatus.COMPLETED
                 logger.info(f"Job {job_id} completed successfully: {job.tenders_saved} tenders")
             else:
                 job.status = JobStatus.FAILED
-                job.error_message = result.get("error", "Unknown error")
+                job.error_message = result.error or "Unknown error"
                 logger.error(f"Job {job_id} failed: {job.error_message}")
+            
+            await self.store.save(job)
         
         except Exception as e:
             job.status = JobStatus.FAILED
             job.error_message = str(e)
             job.completed_at = datetime.now(timezone.utc)
             logger.error(f"Job {job_id} failed with exception: {e}")
+            await self.store.save(job)
         
         finally:
             # Remove from running jobs
@@ -96,12 +355,13 @@ class JobQueue:
                 del self.running_jobs[job_id]
     
     async def cancel_job(self, job_id: str) -> bool:
-        """Cancel a running job."""
-        if job_id not in self.jobs:
+        """Cancel a queued or running job."""
+        job = await self.store.get(job_id)
+        if not job:
             return False
-        
-        job = self.jobs[job_id]
-        if job.status != JobStatus.RUNNING:
+        if job.status != JobStatus.RUNNING and not (
+            job.status == JobStatus.PENDING and job_id in self._queued
+        ):
             return False
         
         # Cancel the task
@@ -113,32 +373,23 @@ class JobQueue:
         # Update job status
         job.status = JobStatus.CANCELLED
         job.completed_at = datetime.now(timezone.utc)
+        await self.store.save(job)
         
         logger.info(f"Cancelled job {job_id}")
         return True
     
-    def get_job(self, job_id: str) -> Optional[ScraperJob]:
+    async def get_job(self, job_id: str) -> Optional[ScraperJob]:
         """Get a specific job by ID."""
-        return self.jobs.get(job_id)
+        return await self.store.get(job_id)
     
-    def get_jobs(
+    async def get_jobs(
         self, 
         limit: int = 50, 
         offset: int = 0,
         status: Optional[JobStatus] = None
     ) -> Dict[str, Any]:
         """Get jobs with filtering and pagination."""
-        jobs = list(self.jobs.values())
-        
-        # Apply status filter
-        if status:
-            jobs = [j for j in jobs if j.status == status]
-        
-        # Sort by creation date (newest first)
-        jobs.sort(key=lambda x: x.created_at, reverse=True)
-        
-        total = len(jobs)
-        paginated_jobs = jobs[offset:offset + limit]
+        paginated_jobs, total = await self.store.list(limit, offset, status)
         
         return {
             "jobs": paginated_jobs,
@@ -147,20 +398,12 @@ class JobQueue:
             "offset": offset
         }
     
-    def cleanup_old_jobs(self, days: int = 7):
+    async def cleanup_old_jobs(self, days: int = 7):
         """Clean up old completed/failed jobs."""
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        removed = await self.store.remove_finished_before(cutoff_date)
         
-        jobs_to_remove = []
-        for job_id, job in self.jobs.items():
-            if (job.status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED] and 
-                job.created_at < cutoff_date):
-                jobs_to_remove.append(job_id)
-        
-        for job_id in jobs_to_remove:
-            del self.jobs[job_id]
-        
-        logger.info(f"Cleaned up {len(jobs_to_remove)} old jobs")
+        logger.info(f"Cleaned up {removed} old jobs")
 
 
 # Global job queue instance
@@ -189,7 +432,7 @@ class JobService:
         job = await self.queue.create_job(job_data)
         await self.queue.start_job(job.id)
         
-        return job
+        return await self.queue.get_job(job.id) or job
     
     async def create_job(self, job_data: ScraperJobCreate) -> ScraperJob:
         """Create a new scraper job."""
@@ -203,18 +446,18 @@ class JobService:
         """Cancel a running job."""
         return await self.queue.cancel_job(job_id)
     
-    def get_job(self, job_id: str) -> Optional[ScraperJob]:
+    async def get_job(self, job_id: str) -> Optional[ScraperJob]:
         """Get a specific job by ID."""
-        return self.queue.get_job(job_id)
+        return await self.queue.get_job(job_id)
     
-    def get_jobs(
+    async def get_jobs(
         self, 
         limit: int = 50, 
         offset: int = 0,
         status: Optional[JobStatus] = None
     ) -> Dict[str, Any]:
         """Get jobs with filtering and pagination."""
-        return self.queue.get_jobs(limit, offset, status)
+        return await self.queue.get_jobs(limit, offset, status)
     
     async def run_scheduled_jobs(self):
         """Run scheduled scraper jobs."""
@@ -239,6 +482,8 @@ class JobService:
         if not result["success"]:
             job.error_message = "Some scrapers failed"
         
+        await self.queue.store.save(job)
+        
         logger.info(f"Scheduled job completed: {result['total_tenders']} tenders")
         return job
 
@@ -1,25 +1,46 @@
 """Scheduled task manager for periodic scraper jobs."""
 
 import asyncio
-import signal
-from datetime import datetime, time
-from typing import Dict, List, Optional, Callable
+import heapq
+from datetime import datetime, time, timedelta
+from typing import Any, Awaitable, Dict, List, Optional, Callable, Set, Tuple
 from loguru import logger
 
 from app.services.job_service import job_service
 
 
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Re-anchor a daily deadline to the wall clock when they disagree by more than this (DST changes)
+MAX_CLOCK_SKEW = 60
+
+# Delay before the first job cleanup after the scheduler starts
+CLEANUP_STARTUP_DELAY = 60
+
+
 class SchedulerService:
     """Service for managing scheduled scraper jobs."""
     
     def __init__(self):
-        self.tasks: Dict[str, asyncio.Task] = {}
+        self._heap: List[Tuple[float, str, Callable[[], Awaitable[Any]]]] = []
+        # Name of the entry the dispatcher popped and is sleeping on
+        self._pending: Optional[str] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
         self.running = False
         self.schedule_config = {
             "morning": time(8, 0),    # 8:00 AM
             "afternoon": time(14, 0), # 2:00 PM
             "evening": time(20, 0),   # 8:00 PM
         }
+        self._refresh_schedule_view()
+    
+    def _refresh_schedule_view(self):
+        """Format the schedule for status responses once, when it changes."""
+        self._schedule_view = {
+            name: schedule_time.strftime("%H:%M")
+            for name, schedule_time in self.schedule_config.items()
+        }
     
     async def start(self):
         """Start the scheduler service."""
@@ -30,16 +51,18 @@ class SchedulerService:
         self.running = True
         logger.info("Starting scheduler service")
         
-        # Start scheduled tasks
+        # One dispatcher task drives every schedule from a heap of deadlines
+        loop = asyncio.get_running_loop()
+        self._heap = []
         for name, schedule_time in self.schedule_config.items():
-            task = asyncio.create_task(self._run_scheduled_task(name, schedule_time))
-            self.tasks[name] = task
+            deadline = loop.time() + self._seconds_until(schedule_time)
+            heapq.heappush(self._heap, (deadline, name, job_service.run_scheduled_jobs))
+        # Cleanup runs shortly after startup, then daily
+        heapq.heappush(self._heap, (loop.time() + CLEANUP_STARTUP_DELAY, "cleanup", self._cleanup_old_jobs))
         
-        # Start cleanup task
-        cleanup_task = asyncio.create_task(self._cleanup_old_jobs())
-        self.tasks["cleanup"] = cleanup_task
+        self._dispatcher = asyncio.create_task(self._dispatch())
         
-        logger.info(f"Started {len(self.tasks)} scheduled tasks")
+        logger.info(f"Scheduled {len(self._heap)} tasks")
     
     async def stop(self):
         """Stop the scheduler service."""
@@ -49,68 +72,81 @@ class SchedulerService:
         logger.info("Stopping scheduler service")
         self.running = False
         
-        # Cancel all tasks
-        for name, task in self.tasks.items():
+        # Cancel the dispatcher and any runs still in flight
+        tasks = [self._dispatcher, *self._inflight] if self._dispatcher else list(self._inflight)
+        for task in tasks:
             task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+        await asyncio.gather(*tasks, return_exceptions=True)
         
-        self.tasks.clear()
+        self._dispatcher = None
+        self._pending = None
+        self._heap.clear()
         logger.info("Scheduler service stopped")
     
-    async def _run_scheduled_task(self, name: str, schedule_time: time):
-        """Run a scheduled task at the specified time."""
-        logger.info(f"Started scheduled task: {name} at {schedule_time}")
+    async def _dispatch(self):
+        """Sleep until the earliest deadline, fire its job and reschedule it."""
+        loop = asyncio.get_running_loop()
         
-        while self.running:
+        while self.running and self._heap:
+            deadline, name, fn = heapq.heappop(self._heap)
+            self._pending = name
+            logger.info(f"Next {name} run in {deadline - loop.time():.0f} seconds")
+            
             try:
-                # Calculate next run time
-                now = datetime.now()
-                next_run = datetime.combine(now.date(), schedule_time)
-                
-                # If time has passed today, schedule for tomorrow
-                if next_run <= now:
-                    next_run = next_run.replace(day=next_run.day + 1)
-                
-                # Wait until next run time
-                wait_seconds = (next_run - now).total_seconds()
-                logger.info(f"Next {name} run in {wait_seconds:.0f} seconds")
-                
-                await asyncio.sleep(wait_seconds)
-                
-                if self.running:
-                    logger.info(f"Running scheduled task: {name}")
-                    await job_service.run_scheduled_jobs()
-                
+                # Sleep until the monotonic deadline so jitter doesn't accumulate
+                while (remaining := deadline - loop.time()) > 0:
+                    await asyncio.sleep(remaining)
             except asyncio.CancelledError:
-                logger.info(f"Scheduled task {name} cancelled")
-                break
-            except Exception as e:
-                logger.error(f"Error in scheduled task {name}: {e}")
-                # Wait a bit before retrying
-                await asyncio.sleep(60)
+                logger.info("Scheduler dispatcher cancelled")
+                raise
+            
+            logger.info(f"Running scheduled task: {name}")
+            task = asyncio.create_task(self._run_job(name, fn))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+            
+            heapq.heappush(self._heap, (self._next_deadline(name, deadline), name, fn))
+            self._pending = None
     
-    async def _cleanup_old_jobs(self):
-        """Periodically cleanup old jobs."""
-        logger.info("Started cleanup task")
+    async def _run_job(self, name: str, fn: Callable[[], Awaitable[Any]]):
+        """Run one scheduled job, logging instead of killing the dispatcher on failure."""
+        try:
+            await fn()
+        except asyncio.CancelledError:
+            logger.info(f"Scheduled task {name} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Error in scheduled task {name}: {e}")
+    
+    def _next_deadline(self, name: str, deadline: float) -> float:
+        """Advance a deadline by one day, re-anchoring to the wall clock after DST changes."""
+        loop = asyncio.get_running_loop()
+        next_deadline = deadline + SECONDS_PER_DAY
         
-        while self.running:
-            try:
-                # Wait 24 hours
-                await asyncio.sleep(24 * 60 * 60)
-                
-                if self.running:
-                    logger.info("Running cleanup task")
-                    job_service.queue.cleanup_old_jobs(days=7)
-                
-            except asyncio.CancelledError:
-                logger.info("Cleanup task cancelled")
-                break
-            except Exception as e:
-                logger.error(f"Error in cleanup task: {e}")
-                await asyncio.sleep(60)
+        schedule_time = self.schedule_config.get(name)
+        if schedule_time is not None:
+            wall_deadline = loop.time() + self._seconds_until(schedule_time)
+            if abs(next_deadline - wall_deadline) > MAX_CLOCK_SKEW:
+                next_deadline = wall_deadline
+        
+        return next_deadline
+    
+    @staticmethod
+    def _seconds_until(schedule_time: time) -> float:
+        """Seconds from now until the next wall-clock occurrence of schedule_time."""
+        now = datetime.now()
+        next_run = datetime.combine(now.date(), schedule_time)
+        
+        # If time has passed today, schedule for tomorrow
+        if next_run <= now:
+            next_run = next_run + timedelta(days=1)
+        
+        return (next_run - now).total_seconds()
+    
+    async def _cleanup_old_jobs(self):
+        """Cleanup old jobs."""
+        logger.info("Running cleanup task")
+        await job_service.queue.cleanup_old_jobs(days=7)
     
     async def run_now(self, scraper_name: str = "all") -> str:
         """Run a scraper job immediately."""
@@ -127,11 +163,11 @@ class SchedulerService:
         """Get information about the current schedule."""
         return {
             "running": self.running,
-            "tasks": list(self.tasks.keys()),
-            "schedule": {
-                name: time.strftime("%H:%M") 
-                for name, time in self.schedule_config.items()
-            }
+            "tasks": sorted(
+                [name for _, name, _ in self._heap]
+                + ([self._pending] if self._pending is not None else [])
+            ),
+            "schedule": self._schedule_view
         }
     
     def update_schedule(self, new_schedule: Dict[str, str]):
@@ -144,6 +180,7 @@ class SchedulerService:
             except ValueError:
                 logger.error(f"Invalid time format: {time_str}")
         
+        self._refresh_schedule_view()
         logger.info(f"Updated schedule: {self.schedule_config}")
 
 
@@ -160,12 +197,3 @@ async def stop_scheduler():
     """Stop the scheduler service."""
     await scheduler_service.stop()
 
-
-def setup_signal_handlers():
-    """Setup signal handlers for graceful shutdown."""
-    def signal_handler(signum, frame):
-        logger.info(f"Received signal {signum}, shutting down scheduler")
-        asyncio.create_task(stop_scheduler())
-    
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler) 
\ No newline at end of file
@@ -1,17 +1,66 @@
 """Scraper integration service for running scrapers and saving data."""
 
 import asyncio
+import importlib
+import inspect
+import os
+import re
+import signal
 import subprocess
 import sys
-import os
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any, Set, Tuple
 from pathlib import Path
 import json
+import httpx
 from loguru import logger
+from supabase import Client
+
+from app.core.cache import invalidate_tenders_cache
+from app.core.database import upsert_tenders, get_db, get_rest
+from app.models.scraper_job import ScraperJob, ScraperStatus, JobStatus
+
+
+# Lines of scraper output kept for job results; the rest is discarded as it streams
+OUTPUT_TAIL_LINES = 200
+
+# Rows per upsert request when saving tenders in bulk
+SAVE_BATCH_SIZE = 500
+
+# Concurrent runs allowed for scrapers in the long queue
+LONG_QUEUE_CONCURRENCY = 2
 
-from app.core.database import insert_tender, get_db
-from app.models.scraper_job import ScraperJob, JobStatus
+# Short-queue scrapers taking longer than this are moved to the long queue
+SHORT_SCRAPER_MAX_SECONDS = 300
+
+# Per-run time budgets in seconds; a scraper past its budget is killed
+SCRAPER_TIMEOUTS = {
+    "canadabuys": 1800,
+    "apc": 1200,
+    "bcbid": 1200,
+    "quebec": 1200,
+    "ontario": 600,
+    "manitoba": 600,
+    "saskatchewan": 600,
+}
+DEFAULT_SCRAPER_TIMEOUT = 1200
+
+# Time a timed-out scraper gets to exit after SIGTERM before it is killed
+TERMINATE_GRACE_SECONDS = 10
+
+
+@dataclass(slots=True, frozen=True)
+class ScraperResult:
+    """Outcome of a single scraper run."""
+    success: bool
+    tender_count: int
+    output: str
+    error: str
+    return_code: int
 
 
 class ScraperService:
@@ -28,20 +77,148 @@ class ScraperService:
             "saskatchewan",
             "quebec"
         ]
+        # Scrapers grouped by expected run time
+        self.queues: Dict[str, Set[str]] = {
+            "short": {"ontario", "manitoba", "saskatchewan"},
+            "long": {"canadabuys", "apc", "bcbid", "quebec"},
+        }
+        # Matches the runner's "<name>: <count> tenders" summary line
+        self._count_res = {
+            name: re.compile(rf"{re.escape(name)}:\s*(\d+)\s+tenders".encode())
+            for name in self.available_scrapers
+        }
+        self._enabled = frozenset(
+            name for name in self.available_scrapers
+            if (self.scrapers_dir / "scrapers" / f"{name}.py").exists()
+        )
+        self._scrapers = self._load_scrapers()
+        self._processes: Set[asyncio.subprocess.Process] = set()
+        self._client: Optional[Client] = None
+        self._rest: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> Client:
+        """Supabase client, resolved once and reused for every query."""
+        if self._client is None:
+            self._client = get_db()
+        return self._client
+    
+    @property
+    def rest(self) -> httpx.AsyncClient:
+        """Pooled PostgREST client, reused across saves."""
+        if self._rest is None or self._rest.is_closed:
+            self._rest = get_rest()
+        return self._rest
+    
+    def _load_scrapers(self) -> Dict[str, Any]:
+        """Import the scraper classes once so runs can happen in-process."""
+        scrapers_path = str(self.scrapers_dir)
+        if scrapers_path not in sys.path:
+            sys.path.insert(0, scrapers_path)
+        
+        try:
+            runner = importlib.import_module("scrapers.runner")
+            registry = runner.ScraperRunner().scrapers
+        except Exception as e:
+            logger.warning(f"Scrapers unavailable in-process, using subprocesses: {e}")
+            return {}
+        
+        return {name: registry[name] for name in self.available_scrapers if name in registry}
     
     async def run_scraper(
         self, 
         scraper_name: str, 
         limit: Optional[int] = None,
-        parameters: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
-        """Run a specific scraper and return results."""
+        parameters: Optional[Dict[str, Any]] = None,
+        use_subprocess: bool = False
+    ) -> ScraperResult:
+        """Run a specific scraper and return results.
+        
+        Scrapers run in-process as coroutines; ``use_subprocess`` (or a
+        scraper that failed to import) falls back to the CLI runner.
+        """
         
         if scraper_name not in self.available_scrapers:
             raise ValueError(f"Unknown scraper: {scraper_name}")
         
         logger.info(f"Starting scraper: {scraper_name}")
         
+        if not use_subprocess and scraper_name in self._scrapers:
+            return await self._run_in_process(scraper_name, limit, parameters)
+        
+        return await self._run_subprocess(scraper_name, limit, parameters)
+    
+    @staticmethod
+    def _constructor_kwargs(
+        scraper_name: str,
+        scraper_class: type,
+        parameters: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Select the parameters a scraper's constructor accepts."""
+        if not parameters:
+            return {}
+        accepted = inspect.signature(scraper_class).parameters
+        kwargs = {key: value for key, value in parameters.items() if key in accepted}
+        skipped = sorted(parameters.keys() - kwargs.keys())
+        if skipped:
+            logger.debug(f"Ignoring parameters {skipped} for in-process {scraper_name} run")
+        return kwargs
+    
+    async def _run_in_process(
+        self,
+        scraper_name: str,
+        limit: Optional[int] = None,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> ScraperResult:
+        """Run a scraper as a coroutine in this process.
+        
+        ``parameters`` the scraper's constructor accepts (e.g. BC Bid credentials)
+        are passed to it; the rest, such as the runner's ``headless`` flag, have
+        no in-process equivalent and are skipped.
+        """
+        scraper_class = self._scrapers[scraper_name]
+        kwargs = self._constructor_kwargs(scraper_name, scraper_class, parameters)
+        
+        try:
+            async with asyncio.timeout(self._timeout_for(scraper_name)):
+                async with scraper_class(**kwargs) as scraper:
+                    tender_count = await scraper.run(limit=limit)
+            
+            return ScraperResult(
+                success=True,
+                tender_count=tender_count,
+                output=f"{scraper_name}: {tender_count} tenders",
+                error="",
+                return_code=0
+            )
+            
+        except TimeoutError:
+            logger.error(f"Scraper {scraper_name} timed out")
+            return ScraperResult(
+                success=False,
+                tender_count=0,
+                output="",
+                error="timeout",
+                return_code=-signal.SIGTERM
+            )
+        except Exception as e:
+            logger.error(f"Error running scraper {scraper_name}: {e}")
+            return ScraperResult(
+                success=False,
+                tender_count=0,
+                output="",
+                error=str(e),
+                return_code=-1
+            )
+    
+    async def _run_subprocess(
+        self,
+        scraper_name: str,
+        limit: Optional[int] = None,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> ScraperResult:
+        """Run a scraper through the CLI runner in a child process."""
+        
         # Build command
         cmd = [
             sys.executable, "-m", "poetry", "run", "python", "-m", "scrapers.runner",
@@ -56,57 +233,161 @@ class ScraperService:
             for key, value in parameters.items():
                 cmd.extend([f"--{key}", str(value)])
         
+        # The runner writes its summary here; stdout parsing is only a fallback
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+            result_path = Path(tmp.name)
+        cmd.extend(["--result-json", str(result_path)])
+        
         try:
-            # Change to scrapers directory
-            original_cwd = os.getcwd()
-            os.chdir(self.scrapers_dir)
-            
             # Run scraper
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                cwd=self.scrapers_dir
+                cwd=self.scrapers_dir,
+                start_new_session=True
             )
+            self._processes.add(process)
             
-            stdout, stderr = await process.communicate()
+            try:
+                tender_count, output_lines, error_lines = await asyncio.wait_for(
+                    self._collect_output(process, scraper_name),
+                    self._timeout_for(scraper_name)
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"Scraper {scraper_name} timed out, terminating process group")
+                await self._kill_process_group(process)
+                return ScraperResult(
+                    success=False,
+                    tender_count=0,
+                    output="",
+                    error="timeout",
+                    return_code=-signal.SIGTERM
+                )
+            finally:
+                self._processes.discard(process)
             
-            # Parse output
-            output = stdout.decode() if stdout else ""
-            error = stderr.decode() if stderr else ""
+            tender_count = self._read_result_count(result_path, tender_count)
             
-            # Extract tender count from output
-            tender_count = 0
-            for line in output.split('\n'):
-                if f"{scraper_name}:" in line and "tenders" in line:
-                    try:
-                        tender_count = int(line.split(':')[1].strip().split()[0])
-                    except (ValueError, IndexError):
-                        pass
-                    break
+            output = "\n".join(output_lines)
+            error = "\n".join(error_lines)
             
             success = process.returncode == 0
             
-            return {
-                "success": success,
-                "tender_count": tender_count,
-                "output": output,
-                "error": error,
-                "return_code": process.returncode
-            }
+            return ScraperResult(
+                success=success,
+                tender_count=tender_count,
+                output=output,
+                error=error,
+                return_code=process.returncode
+            )
             
         except Exception as e:
             logger.error(f"Error running scraper {scraper_name}: {e}")
-            return {
-                "success": False,
-                "tender_count": 0,
-                "output": "",
-                "error": str(e),
-                "return_code": -1
-            }
+            return ScraperResult(
+                success=False,
+                tender_count=0,
+                output="",
+                error=str(e),
+                return_code=-1
+            )
         finally:
-            # Restore original directory
-            os.chdir(original_cwd)
+            result_path.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _read_result_count(result_path: Path, fallback: int) -> int:
+        """Read the tender count from the runner's result file, if it wrote one."""
+        try:
+            with open(result_path) as f:
+                return int(json.load(f)["tender_count"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return fallback
+    
+    async def _collect_output(
+        self,
+        process: asyncio.subprocess.Process,
+        scraper_name: str
+    ) -> Tuple[int, Deque[str], Deque[str]]:
+        """Stream both pipes to completion, keeping only the tail of each."""
+        error_tail = asyncio.create_task(self._tail_lines(process.stderr))
+        
+        output_lines: Deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+        tender_count = 0
+        count_seen = False
+        count_re = self._count_res[scraper_name]
+        try:
+            async for raw in process.stdout:
+                output_lines.append(raw.decode(errors='replace').rstrip('\n'))
+                
+                # Extract tender count from output
+                if not count_seen and (match := count_re.search(raw)):
+                    count_seen = True
+                    tender_count = int(match.group(1))
+            
+            error_lines = await error_tail
+            await process.wait()
+        finally:
+            error_tail.cancel()
+        
+        return tender_count, output_lines, error_lines
+    
+    @staticmethod
+    async def _kill_process_group(process: asyncio.subprocess.Process):
+        """SIGTERM the scraper's process group, then SIGKILL it if it doesn't exit."""
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            await asyncio.wait_for(process.wait(), TERMINATE_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            os.killpg(process.pid, signal.SIGKILL)
+            await process.wait()
+        except ProcessLookupError:
+            pass
+    
+    @staticmethod
+    def _timeout_for(scraper_name: str) -> float:
+        """Time budget for one run of a scraper."""
+        return SCRAPER_TIMEOUTS.get(scraper_name, DEFAULT_SCRAPER_TIMEOUT)
+    
+    @staticmethod
+    async def _tail_lines(stream: asyncio.StreamReader) -> Deque[str]:
+        """Drain a stream, keeping only its last lines."""
+        lines: Deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+        async for raw in stream:
+            lines.append(raw.decode(errors='replace').rstrip('\n'))
+        return lines
+    
+    async def terminate_subprocesses(self):
+        """Terminate scraper process groups that are still running and wait for them to exit."""
+        running = [process for process in self._processes if process.returncode is None]
+        for process in running:
+            logger.info(f"Terminating scraper process group {process.pid}")
+        await asyncio.gather(
+            *[self._kill_process_group(process) for process in running],
+            return_exceptions=True
+        )
+    
+    async def _run_queued(
+        self,
+        scraper_name: str,
+        queue: str,
+        semaphores: Dict[str, asyncio.Semaphore],
+        limit: Optional[int],
+        parameters: Optional[Dict[str, Any]]
+    ) -> ScraperResult:
+        """Run a scraper within its queue's concurrency limit."""
+        async with semaphores[queue]:
+            started = time.monotonic()
+            result = await self.run_scraper(scraper_name, limit, parameters)
+            duration = time.monotonic() - started
+        
+        # A short scraper that overran its hint moves to the long queue next time;
+        # overlapping runs may both promote it, so membership changes are idempotent
+        if queue == "short" and duration > SHORT_SCRAPER_MAX_SECONDS:
+            logger.info(f"Promoting {scraper_name} to the long queue ({duration:.0f}s)")
+            self.queues["short"].discard(scraper_name)
+            self.queues["long"].add(scraper_name)
+        
+        return result
     
     async def run_all_scrapers(
         self, 
@@ -118,105 +399,139 @@ class ScraperService:
         logger.info("Starting all scrapers")
         results = {}
         total_tenders = 0
+        any_success = False
         
-        for scraper_name in self.available_scrapers:
-            try:
-                result = await self.run_scraper(scraper_name, limit, parameters)
-                results[scraper_name] = result
-                total_tenders += result.get("tender_count", 0)
-                
-                if result["success"]:
-                    logger.info(f"{scraper_name}: {result['tender_count']} tenders")
-                else:
-                    logger.error(f"{scraper_name}: Failed - {result['error']}")
-                    
-            except Exception as e:
-                logger.error(f"Error with scraper {scraper_name}: {e}")
-                results[scraper_name] = {
-                    "success": False,
-                    "tender_count": 0,
-                    "output": "",
-                    "error": str(e),
-                    "return_code": -1
-                }
+        # Long scrapers share a small pool so they can't hold up the short ones
+        semaphores = {
+            "short": asyncio.Semaphore(max(1, len(self.queues["short"]))),
+            "long": asyncio.Semaphore(LONG_QUEUE_CONCURRENCY),
+        }
+        queue_of = {name: queue for queue, names in self.queues.items() for name in names}
+        
+        outcomes = await asyncio.gather(
+            *[
+                self._run_queued(name, queue_of.get(name, "long"), semaphores, limit, parameters)
+                for name in self.available_scrapers
+            ],
+            return_exceptions=True
+        )
+        
+        for scraper_name, result in zip(self.available_scrapers, outcomes):
+            if isinstance(result, BaseException):
+                logger.error(f"Error with scraper {scraper_name}: {result}")
+                result = ScraperResult(
+                    success=False,
+                    tender_count=0,
+                    output="",
+                    error=str(result),
+                    return_code=-1
+                )
+            
+            results[scraper_name] = result
+            total_tenders += result.tender_count
+            
+            if result.success:
+                any_success = True
+                logger.info(f"{scraper_name}: {result.tender_count} tenders")
+            else:
+                logger.error(f"{scraper_name}: Failed - {result.error}")
         
         return {
-            "success": any(r["success"] for r in results.values()),
+            "success": any_success,
             "results": results,
             "total_tenders": total_tenders,
             "scrapers_run": len(results)
         }
     
-    def get_scraper_status(self, scraper_name: str) -> Dict[str, Any]:
+    def _build_status(self, scraper_name: str, total_tenders: int) -> ScraperStatus:
+        """Assemble the status payload for a scraper."""
+        # Scraper files were checked once at startup
+        is_enabled = scraper_name in self._enabled
+        
+        # Get last run info from database (TODO: implement)
+        last_run = None
+        last_error = None
+        
+        return ScraperStatus(
+            scraper_name=scraper_name,
+            is_enabled=is_enabled,
+            last_run=last_run,
+            last_error=last_error,
+            total_tenders=total_tenders,
+            avg_duration=None
+        )
+    
+    def _get_source_counts(self) -> Dict[str, int]:
+        """Get tender counts for every source in one grouped query."""
+        try:
+            client = self.client
+            result = client.rpc('tender_counts_by_source').execute()
+            return {row['source_name']: row['tender_count'] for row in result.data or []}
+        except Exception as e:
+            logger.error(f"Failed to get tender counts by source: {e}")
+            return {}
+    
+    def get_scraper_status(self, scraper_name: str) -> ScraperStatus:
         """Get status information for a specific scraper."""
         
         if scraper_name not in self.available_scrapers:
             raise ValueError(f"Unknown scraper: {scraper_name}")
         
-        # Check if scraper file exists
-        scraper_file = self.scrapers_dir / "scrapers" / f"{scraper_name}.py"
-        is_enabled = scraper_file.exists()
-        
-        # Get last run info from database (TODO: implement)
-        last_run = None
-        last_error = None
         total_tenders = 0
+        try:
+            client = self.client
+            result = client.table('tenders').select('id', count='exact', head=True).eq('source_name', scraper_name).execute()
+            total_tenders = result.count or 0
+        except Exception as e:
+            logger.error(f"Failed to get tender count for {scraper_name}: {e}")
         
-        return {
-            "scraper_name": scraper_name,
-            "is_enabled": is_enabled,
-            "last_run": last_run,
-            "last_error": last_error,
-            "total_tenders": total_tenders,
-            "avg_duration": None
-        }
+        return self._build_status(scraper_name, total_tenders)
     
-    def get_all_scraper_status(self) -> List[Dict[str, Any]]:
+    def get_all_scraper_status(self) -> List[ScraperStatus]:
         """Get status for all scrapers."""
-        return [self.get_scraper_status(name) for name in self.available_scrapers]
+        source_counts = self._get_source_counts()
+        return [
+            self._build_status(name, source_counts.get(name, 0))
+            for name in self.available_scrapers
+        ]
     
     async def save_tender_data(self, tender_data: Dict[str, Any]) -> bool:
         """Save tender data to database."""
+        return await self.save_tender_data_bulk([tender_data]) > 0
+    
+    async def save_tender_data_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """Upsert tenders in batches and return how many were saved.
+        
+        Rows are deduplicated on (source_name, external_id).
+        """
+        if not rows:
+            return 0
+        
+        # One timestamp for the whole batch. created_at stays out of the payload:
+        # the column default sets it on insert, and a merge must not reset it
+        now = datetime.now(timezone.utc).isoformat()
+        for tender_data in rows:
+            tender_data.pop("created_at", None)
+            tender_data["updated_at"] = now
+        
+        saved = 0
         try:
-            # Add timestamp
-            tender_data["created_at"] = datetime.now(timezone.utc).isoformat()
-            tender_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-            
-            # Insert into database
-            result = insert_tender(tender_data)
-            return result is not None
-            
+            for start in range(0, len(rows), SAVE_BATCH_SIZE):
+                saved += await upsert_tenders(rows[start:start + SAVE_BATCH_SIZE], client=self.rest)
         except Exception as e:
             logger.error(f"Failed to save tender data: {e}")
-            return False
+        
+        if saved:
+            await invalidate_tenders_cache()
+        return saved
     
     def get_tender_statistics(self) -> Dict[str, Any]:
         """Get tender statistics from database."""
         try:
-            client = get_db()
-            
-            # Get total count
-            total_result = client.table('tenders').select('id', count='exact').execute()
-            total_tenders = total_result.count if hasattr(total_result, 'count') else 0
-            
-            # Get count by source
-            sources_result = client.table('tenders').select('source_name').execute()
-            source_counts = {}
-            for tender in sources_result.data:
-                source = tender.get('source_name', 'unknown')
-                source_counts[source] = source_counts.get(source, 0) + 1
-            
-            # Get recent tenders (last 7 days)
+            client = self.client
             week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-            recent_result = client.table('tenders').select('id').gte('created_at', week_ago).execute()
-            recent_tenders = len(recent_result.data)
-            
-            return {
-                "total_tenders": total_tenders,
-                "source_counts": source_counts,
-                "recent_tenders": recent_tenders,
-                "last_updated": datetime.now(timezone.utc).isoformat()
-            }
+            result = client.rpc('tender_stats', {'since': week_ago}).execute()
+            return result.data
             
         except Exception as e:
             logger.error(f"Failed to get tender statistics: {e}")
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1.endpoints import tenders, users, auth, awards, scrapers, enrichment
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 # Include all endpoint routers
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
@@ -1,5 +1,10 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
+from uuid import UUID
+import asyncio
+import logging
+
+from app.services.database import db_service
 
 # TODO: Import models and services when created
 # from app.models.award import Award, AwardCreate, AwardUpdate
@@ -7,6 +12,8 @@ from typing import List, Optional
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
 
 @router.get("/search")
 async def search_awards(
@@ -17,11 +24,45 @@ async def search_awards(
     limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
 ) -> dict:
-    """Search awards with optional filtering."""
-    # TODO: Implement award search logic
+    """Search awards with optional filtering.
+    
+    Filtering, ranking and pagination all run in the ``search_awards`` RPC.
+    """
+    params = {
+        'search_query': query,
+        'vendor_filter': vendor,
+        'min_value': min_value,
+        'max_value': max_value,
+        'limit_count': limit,
+        'offset_count': offset,
+    }
+    try:
+        query_builder = db_service.supabase.rpc('search_awards', params)
+        result = await asyncio.to_thread(query_builder.execute)
+        rows = result.data or []
+        
+        if rows:
+            total = rows[0].pop('total_count')
+        elif offset:
+            # A page past the end has no rows to carry the window count, so
+            # fetch the first match alone; limit_count=0 would return no rows either
+            count_builder = db_service.supabase.rpc(
+                'search_awards', {**params, 'limit_count': 1, 'offset_count': 0}
+            )
+            count_result = await asyncio.to_thread(count_builder.execute)
+            total = count_result.data[0]['total_count'] if count_result.data else 0
+        else:
+            total = 0
+    except Exception as e:
+        logger.error(f"Award search failed: {e}")
+        rows, total = [], 0
+    
+    for row in rows[1:]:
+        row.pop('total_count', None)
+    
     return {
-        "awards": [],
-        "total": 0,
+        "awards": rows,
+        "total": total,
         "limit": limit,
         "offset": offset,
     }
@@ -29,13 +70,27 @@ async def search_awards(
 
 @router.get("/similar/{tender_id}")
 async def get_similar_awards(
-    tender_id: str,
+    tender_id: UUID,
     limit: int = Query(5, ge=1, le=20, description="Number of similar awards to return"),
 ) -> dict:
-    """Get awards similar to a specific tender using vector similarity."""
-    # TODO: Implement vector similarity search
+    """Get awards similar to a specific tender using vector similarity.
+    
+    The ``awards_similar`` RPC looks up the tender embedding and orders awards
+    with the pgvector ``<=>`` operator, so the HNSW index does the work.
+    """
+    try:
+        query_builder = db_service.supabase.rpc(
+            'awards_similar',
+            {'p_tender_id': str(tender_id), 'k': limit}
+        )
+        result = await asyncio.to_thread(query_builder.execute)
+        similar_awards = result.data or []
+    except Exception as e:
+        logger.error(f"Similar award lookup failed for {tender_id}: {e}")
+        similar_awards = []
+    
     return {
-        "similar_awards": [],
-        "tender_id": tender_id,
+        "similar_awards": similar_awards,
+        "tender_id": str(tender_id),
         "limit": limit,
     } 
\ No newline at end of file
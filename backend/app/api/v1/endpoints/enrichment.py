@@ -1,14 +1,128 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable, Hashable, List, Set, Tuple
+from collections import defaultdict
 import asyncio
+import logging
 import subprocess
 import os
+import sys
 from datetime import datetime, timezone
 
+from cachetools import TTLCache
+
 from app.services.database import db_service
 
+# gap_detector lives in the backend root, next to the app package
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+if _BACKEND_DIR not in sys.path:
+    sys.path.append(_BACKEND_DIR)
+
+from gap_detector import AirtableClient, GapDetector
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Columns read by /incomplete (all possible field names) and by /process
+INCOMPLETE_COLUMNS = "id,title,organization,buyer,closing_date,deadline,contact_name,contact_email,contact_phone,description,summary_ai,documents_urls,created_at,external_id,source_name,source,source_url"
+PROCESS_COLUMNS = "id,title,organization,buyer,closing_date,deadline,contact_name,contact_email,contact_phone,documents_urls,external_id,source_name,source,source_url"
+
+# Placeholder values that don't count as real data
+_NAME_BAD = frozenset({"", "(000) 000-0000"})
+_EMAIL_BAD = frozenset({"", "N/A"})
+_PHONE_BAD = frozenset({"", "(000) 000-0000", "101", "5161"})
+_DATE_BAD = frozenset({"", "null", "None"})
+
+# Legacy column each field falls back to when the current one is empty
+_FALLBACKS = {
+    "organization": "buyer",
+    "closing_date": "deadline",
+    "source_name": "source",
+    "description": "summary_ai",
+}
+
+# Short-lived cache for the poll-heavy read endpoints, with one lock per key so
+# concurrent callers share a single Supabase round trip
+ENRICHMENT_CACHE_TTL = 30
+_enrichment_cache: TTLCache = TTLCache(maxsize=16, ttl=ENRICHMENT_CACHE_TTL)
+_enrichment_cache_locks: Dict[Hashable, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+async def _cached(key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached value for key, fetching it once if it is missing or expired."""
+    try:
+        return _enrichment_cache[key]
+    except KeyError:
+        pass
+    
+    async with _enrichment_cache_locks[key]:
+        # Another caller may have filled it while we waited
+        try:
+            return _enrichment_cache[key]
+        except KeyError:
+            pass
+        value = await fetch()
+        _enrichment_cache[key] = value
+        return value
+
+
+# /process takes at most this many tenders; one prefetched batch serves every limit
+PROCESS_MAX_LIMIT = 20
+_prefetch_tasks: Set[asyncio.Task] = set()
+
+
+def invalidate_enrichment_cache() -> None:
+    """Drop cached enrichment reads after tenders are sent for enrichment."""
+    _enrichment_cache.clear()
+
+# One Airtable client (and its keep-alive session) per process
+_airtable: Optional[Tuple[AirtableClient, GapDetector]] = None
+
+# Existing Airtable task ids barely change between /process calls; overlapping
+# calls wait on one lock and share a single listing
+EXISTING_TASKS_TTL = 30
+_existing_tasks_cache: TTLCache = TTLCache(maxsize=1, ttl=EXISTING_TASKS_TTL)
+_existing_tasks_lock = asyncio.Lock()
+
+
+def _get_airtable() -> Tuple[AirtableClient, GapDetector]:
+    """Return the shared Airtable client and gap detector, creating them on first use."""
+    global _airtable
+    if _airtable is None:
+        airtable_token = os.getenv("AIRTABLE_TOKEN")
+        airtable_base_id = os.getenv("AIRTABLE_BASE_ID")
+        
+        if not airtable_token or not airtable_base_id:
+            raise Exception("Airtable credentials not configured")
+        
+        airtable_client = AirtableClient(airtable_token, airtable_base_id)
+        _airtable = (airtable_client, GapDetector(airtable_client))
+    return _airtable
+
+
+async def _get_existing_tasks(airtable_client: AirtableClient) -> Set[str]:
+    """Existing Airtable opportunity ids, refreshed at most once per TTL.
+    
+    A failed listing falls back to an empty set for this call only, so the
+    next request retries instead of reading an empty cached list.
+    """
+    try:
+        return _existing_tasks_cache["existing"]
+    except KeyError:
+        pass
+    
+    async with _existing_tasks_lock:
+        try:
+            return _existing_tasks_cache["existing"]
+        except KeyError:
+            try:
+                existing_tasks = await asyncio.to_thread(airtable_client.fetch_existing_tasks)
+            except Exception as e:
+                logger.error(f"Error getting existing tasks: {e}")
+                return set()
+            _existing_tasks_cache["existing"] = existing_tasks
+            return existing_tasks
+
 # Global status tracking
 enrichment_status = {
     "running": False,
@@ -22,7 +136,7 @@ async def get_enrichment_status():
     """Get the current status of the enrichment system."""
     try:
         # Get count of incomplete tenders
-        incomplete_count = await get_incomplete_tenders_count()
+        incomplete_count = await _cached("incomplete_count", get_incomplete_tenders_count)
         
         return {
             "status": "running" if enrichment_status["running"] else "idle",
@@ -41,160 +155,167 @@ async def get_incomplete_tenders(
 ):
     """Get list of tenders that need enrichment."""
     try:
-        # Get all tenders that are not enriched (either null or false) - use all possible field names
-        response = db_service.supabase.table("tenders").select(
-            "id,title,organization,buyer,closing_date,deadline,contact_name,contact_email,contact_phone,description,summary_ai,documents_urls,created_at,enriched,external_id,source_name,source,source_url"
-        ).neq("enriched", True).limit(limit * 2).execute()  # Get more to filter
-        
-        print(f"DEBUG: Found {len(response.data)} tenders with enriched!=true")
+        result = await _cached(
+            ("incomplete", limit, include_missing_fields),
+            lambda: _fetch_incomplete_tenders(limit, include_missing_fields)
+        )
+        # The UI usually follows up with /process, so warm its batch now
+        _schedule_process_prefetch()
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching incomplete tenders: {str(e)}")
+
+async def _fetch_incomplete_tenders(limit: int, include_missing_fields: bool) -> Dict[str, Any]:
+    """Query tenders needing enrichment and shape them for the /incomplete response."""
+    incomplete_tenders = []
+    
+    # Unenriched tenders missing contact, closing date or attachments, a page at a time
+    async for tender, missing_fields in _iter_incomplete_tenders(
+        INCOMPLETE_COLUMNS, limit, with_missing_fields=include_missing_fields
+    ):
+        tender_data = {
+            "id": tender["id"],
+            "title": tender["title"],
+            "organization": _coalesce(tender, "organization") or "Unknown Organization",  # Use fallback with default
+            "closing_date": _coalesce(tender, "closing_date"),  # Use fallback
+            "contact_name": tender.get("contact_name"),
+            "contact_email": tender.get("contact_email"),
+            "contact_phone": tender.get("contact_phone"),
+            "description": _coalesce(tender, "description"),  # Use fallback
+            "documents_urls": tender.get("documents_urls"),
+            "created_at": tender.get("created_at"),
+            "external_id": tender.get("external_id") or tender["id"],  # Use tender ID if external_id is missing
+            "source_name": _coalesce(tender, "source_name") or "Unknown Source",  # Use fallback with default
+            "source_url": tender.get("source_url") or "",  # Provide empty string default
+        }
         
-        incomplete_tenders = []
+        # Only include missing_fields if requested (for internal use)
+        if include_missing_fields:
+            tender_data["missing_fields"] = missing_fields
         
-        for tender in response.data:
-            if needs_enrichment(tender):
-                # Build missing fields list if requested
-                missing_fields = []
-                if include_missing_fields:
-                    # Check what fields are missing
-                    contact_name = tender.get("contact_name")
-                    contact_email = tender.get("contact_email") 
-                    contact_phone = tender.get("contact_phone")
-                    
-                    has_contact = any([
-                        contact_name and str(contact_name).strip() and str(contact_name).strip() not in ['', '(000) 000-0000'],
-                        contact_email and str(contact_email).strip() and str(contact_email).strip() not in ['', 'N/A'],
-                        contact_phone and str(contact_phone).strip() and str(contact_phone).strip() not in ['', '(000) 000-0000', '101', '5161']
-                    ])
-                    
-                    # Use fallback logic for closing_date
-                    closing_date = tender.get("closing_date") or tender.get("deadline")
-                    has_closing_date = closing_date is not None and str(closing_date).strip() not in ['', 'null', 'None']
-                    
-                    documents_urls = tender.get("documents_urls")
-                    has_attachments = documents_urls is not None and len(documents_urls) > 0
-                    
-                    if not has_contact:
-                        missing_fields.append("contact_info")
-                    if not has_closing_date:
-                        missing_fields.append("closing_date")
-                    if not has_attachments:
-                        missing_fields.append("attachments")
-                
-                tender_data = {
-                    "id": tender["id"],
-                    "title": tender["title"],
-                    "organization": tender.get("organization") or tender.get("buyer") or "Unknown Organization",  # Use fallback with default
-                    "closing_date": tender.get("closing_date") or tender.get("deadline"),  # Use fallback
-                    "contact_name": tender.get("contact_name"),
-                    "contact_email": tender.get("contact_email"),
-                    "contact_phone": tender.get("contact_phone"),
-                    "description": tender.get("description") or tender.get("summary_ai"),  # Use fallback
-                    "documents_urls": tender.get("documents_urls"),
-                    "created_at": tender.get("created_at"),
-                    "external_id": tender.get("external_id") or tender["id"],  # Use tender ID if external_id is missing
-                    "source_name": tender.get("source_name") or tender.get("source") or "Unknown Source",  # Use fallback with default
-                    "source_url": tender.get("source_url") or "",  # Provide empty string default
-                }
-                
-                # Only include missing_fields if requested (for internal use)
-                if include_missing_fields:
-                    tender_data["missing_fields"] = missing_fields
-                
-                incomplete_tenders.append(tender_data)
+        incomplete_tenders.append(tender_data)
+        if len(incomplete_tenders) >= limit:
+            break
+    
+    logger.debug("Found %d tenders needing enrichment", len(incomplete_tenders))
+    
+    return {
+        "tenders": incomplete_tenders,
+        "count": len(incomplete_tenders)
+    }
+
+async def _iter_incomplete_tenders(
+    columns: str,
+    page_size: int,
+    with_missing_fields: bool = True
+) -> AsyncIterator[Tuple[dict, List[str]]]:
+    """Yield ``(tender, missing_fields)`` for tenders needing enrichment.
+    
+    Pages are read in id order with a keyset cursor, so callers can stop as
+    soon as they have enough rows. Without ``with_missing_fields`` rows are
+    only checked with the short-circuiting needs_enrichment() and yielded
+    with an empty list.
+    """
+    last_id = None
+    while True:
+        query = db_service.supabase.table("tenders").select(columns).eq(
+            "needs_enrichment", True
+        ).neq("enriched", True).order("id").limit(page_size)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        response = await asyncio.to_thread(query.execute)
         
-        # Limit to requested number
-        incomplete_tenders = incomplete_tenders[:limit]
+        rows = response.data or []
+        for tender in rows:
+            if not with_missing_fields:
+                if needs_enrichment(tender):
+                    yield tender, []
+                continue
+            needs, missing_fields = classify_tender(tender)
+            if needs:
+                yield tender, missing_fields
         
-        return {
-            "tenders": incomplete_tenders,
-            "count": len(incomplete_tenders)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching incomplete tenders: {str(e)}")
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]["id"]
 
 def needs_enrichment(tender: dict) -> bool:
     """
-    Simple boolean check for enrichment needs.
+    Simple boolean check for enrichment needs, mirroring the stored
+    ``tenders.needs_enrichment`` column for rows already in memory.
     A tender needs enrichment if it's missing ANY of:
     - Contact info (name, email, or phone)
     - Closing date
     - Attachments (documents_urls)
     """
-    # Check contact info - needs at least one contact field
-    contact_name = tender.get("contact_name")
-    contact_email = tender.get("contact_email") 
-    contact_phone = tender.get("contact_phone")
+    # Stop at the first missing category; only classify_tender needs the full list
+    if not _has_contact(tender):
+        return True
+    if not _has_closing_date(tender):
+        return True
+    if not _has_attachments(tender):
+        return True
+    return False
+
+def classify_tender(tender: dict) -> Tuple[bool, List[str]]:
+    """Return ``(needs_enrichment, missing_fields)`` for a tender in one pass."""
+    missing_fields = _extract_flags(tender)[3]
     
-    has_contact = any([
-        contact_name and str(contact_name).strip() and str(contact_name).strip() not in ['', '(000) 000-0000'],
-        contact_email and str(contact_email).strip() and str(contact_email).strip() not in ['', 'N/A'],
-        contact_phone and str(contact_phone).strip() and str(contact_phone).strip() not in ['', '(000) 000-0000', '101', '5161']
-    ])
+    # Needs enrichment if missing ANY of the three categories
+    return bool(missing_fields), missing_fields
+
+def _coalesce(tender: dict, field: str) -> Any:
+    """Value of field, or of its legacy fallback column when field is empty."""
+    value = tender.get(field)
+    return value if value else tender.get(_FALLBACKS[field])
+
+def _present(value: Any, placeholders: frozenset) -> bool:
+    """True when value is set and isn't blank or a known placeholder."""
+    return bool(value) and str(value).strip() not in placeholders
+
+def _has_contact(tender: dict) -> bool:
+    """Needs at least one usable contact field."""
+    return (
+        _present(tender.get("contact_name"), _NAME_BAD)
+        or _present(tender.get("contact_email"), _EMAIL_BAD)
+        or _present(tender.get("contact_phone"), _PHONE_BAD)
+    )
+
+def _has_closing_date(tender: dict) -> bool:
+    """Closing date under either the old or new field name."""
+    closing_date = _coalesce(tender, "closing_date")
+    return closing_date is not None and str(closing_date).strip() not in _DATE_BAD
+
+def _has_attachments(tender: dict) -> bool:
+    """documents_urls should exist and have items."""
+    documents_urls = tender.get("documents_urls")
+    return documents_urls is not None and len(documents_urls) > 0
+
+def _extract_flags(tender: dict) -> Tuple[bool, bool, bool, List[str]]:
+    """Check a tender's contact, closing date and attachments once.
     
-    # Check closing date - use fallback logic for both old and new field names
-    closing_date = tender.get("closing_date") or tender.get("deadline")
-    has_closing_date = closing_date is not None and str(closing_date).strip() not in ['', 'null', 'None']
+    Returns ``(has_contact, has_closing_date, has_attachments, missing_fields)``.
+    """
+    has_contact = _has_contact(tender)
+    has_closing_date = _has_closing_date(tender)
+    has_attachments = _has_attachments(tender)
     
-    # Check attachments - documents_urls should exist and have items
-    documents_urls = tender.get("documents_urls")
-    has_attachments = documents_urls is not None and len(documents_urls) > 0
+    missing_fields = []
+    if not has_contact:
+        missing_fields.append("contact_info")
+    if not has_closing_date:
+        missing_fields.append("closing_date")
+    if not has_attachments:
+        missing_fields.append("attachments")
     
-    # Return True if missing ANY of the three categories
-    return not has_contact or not has_closing_date or not has_attachments
+    return has_contact, has_closing_date, has_attachments, missing_fields
 
 @router.post("/process")
-async def process_enrichment(background_tasks: BackgroundTasks, limit: int = Query(4, ge=1, le=20)):
+async def process_enrichment(background_tasks: BackgroundTasks, limit: int = Query(4, ge=1, le=PROCESS_MAX_LIMIT)):
     """Process enrichment for tenders that need it."""
     try:
-        # Get tenders that need enrichment - use all possible field names
-        response = db_service.supabase.table("tenders").select(
-            "id,title,organization,buyer,closing_date,deadline,contact_name,contact_email,contact_phone,description,summary_ai,documents_urls,created_at,enriched,external_id,source_name,source,source_url"
-        ).neq("enriched", True).limit(limit * 2).execute()
-        
-        tenders_to_process = []
-        for tender in response.data:
-            if needs_enrichment(tender):
-                # Prepare tender data for Airtable
-                missing_fields = []
-                
-                # Check what fields are missing
-                contact_name = tender.get("contact_name")
-                contact_email = tender.get("contact_email") 
-                contact_phone = tender.get("contact_phone")
-                
-                has_contact = any([
-                    contact_name and str(contact_name).strip() and str(contact_name).strip() not in ['', '(000) 000-0000'],
-                    contact_email and str(contact_email).strip() and str(contact_email).strip() not in ['', 'N/A'],
-                    contact_phone and str(contact_phone).strip() and str(contact_phone).strip() not in ['', '(000) 000-0000', '101', '5161']
-                ])
-                
-                # Use fallback logic for closing_date
-                closing_date = tender.get("closing_date") or tender.get("deadline")
-                has_closing_date = closing_date is not None and str(closing_date).strip() not in ['', 'null', 'None']
-                
-                documents_urls = tender.get("documents_urls")
-                has_attachments = documents_urls is not None and len(documents_urls) > 0
-                
-                if not has_contact:
-                    missing_fields.append("contact_info")
-                if not has_closing_date:
-                    missing_fields.append("closing_date")
-                if not has_attachments:
-                    missing_fields.append("attachments")
-                
-                tender_data = {
-                    "id": tender["id"],
-                    "title": tender["title"],
-                    "organization": tender.get("organization") or tender.get("buyer"),  # Use fallback
-                    "external_id": tender.get("external_id") or tender["id"],  # Use tender ID if external_id is missing
-                    "source_name": tender.get("source_name") or tender.get("source"),  # Use fallback
-                    "source_url": tender.get("source_url"),
-                    "missing_fields": missing_fields
-                }
-                tenders_to_process.append(tender_data)
-                
-                if len(tenders_to_process) >= limit:
-                    break
+        # Batches are in id order, so the first `limit` rows match a query with that limit
+        tenders_to_process = (await _cached("process_batch", _fetch_process_batch))[:limit]
         
         if not tenders_to_process:
             return {
@@ -204,41 +325,28 @@ async def process_enrichment(background_tasks: BackgroundTasks, limit: int = Que
         
         # Send tenders to Airtable using the gap detector
         try:
-            import sys
-            import os
-            
-            # Add the backend directory to the path
-            backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            sys.path.append(backend_dir)
-            
-            from gap_detector import AirtableClient, GapDetector
-            from app.config import settings
-            
-            # Initialize Airtable client
-            airtable_token = os.getenv("AIRTABLE_TOKEN")
-            airtable_base_id = os.getenv("AIRTABLE_BASE_ID")
-            
-            if not airtable_token or not airtable_base_id:
-                raise Exception("Airtable credentials not configured")
-            
-            airtable_client = AirtableClient(airtable_token, airtable_base_id)
-            gap_detector = GapDetector(airtable_client)
+            airtable_client, gap_detector = _get_airtable()
             
             # Get existing tasks to avoid duplicates
-            existing_tasks = airtable_client.get_existing_tasks()
+            existing_tasks = await _get_existing_tasks(airtable_client)
+            existing_count = len(existing_tasks)
             
             # Create Airtable tasks
-            tasks_created = gap_detector.create_airtable_tasks(tenders_to_process, existing_tasks)
+            tasks_created = await gap_detector.create_airtable_tasks_async(
+                tenders_to_process, existing_tasks
+            )
+            # The ids of created tasks were added to existing_tasks, so the cached list stays current
+            invalidate_enrichment_cache()
             
             return {
                 "message": f"Enrichment process completed: {tasks_created} tasks created in Airtable",
                 "processed": len(tenders_to_process),
                 "tasks_created": tasks_created,
-                "existing_tasks": len(existing_tasks)
+                "existing_tasks": existing_count
             }
             
         except Exception as e:
-            print(f"Error sending to Airtable: {e}")
+            logger.error(f"Error sending to Airtable: {e}")
             return {
                 "message": f"Found {len(tenders_to_process)} tenders needing enrichment, but failed to send to Airtable",
                 "processed": len(tenders_to_process),
@@ -248,22 +356,55 @@ async def process_enrichment(background_tasks: BackgroundTasks, limit: int = Que
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing enrichment: {str(e)}")
 
+async def _fetch_process_batch() -> List[Dict[str, Any]]:
+    """Up to PROCESS_MAX_LIMIT tenders needing enrichment, shaped for Airtable tasks."""
+    # Get tenders that need enrichment - only the columns the Airtable task and checks use
+    tenders_to_process = []
+    async for tender, missing_fields in _iter_incomplete_tenders(PROCESS_COLUMNS, PROCESS_MAX_LIMIT):
+        # Prepare tender data for Airtable
+        tender_data = {
+            "id": tender["id"],
+            "title": tender["title"],
+            "organization": _coalesce(tender, "organization"),  # Use fallback
+            "external_id": tender.get("external_id") or tender["id"],  # Use tender ID if external_id is missing
+            "source_name": _coalesce(tender, "source_name"),  # Use fallback
+            "source_url": tender.get("source_url"),
+            "missing_fields": missing_fields
+        }
+        tenders_to_process.append(tender_data)
+        
+        if len(tenders_to_process) >= PROCESS_MAX_LIMIT:
+            break
+    
+    return tenders_to_process
+
+async def _prefetch_process_batch() -> None:
+    """Fill the /process batch cache, sharing any fetch already in flight."""
+    try:
+        await _cached("process_batch", _fetch_process_batch)
+    except Exception as e:
+        logger.warning(f"Error prefetching enrichment batch: {e}")
+
+def _schedule_process_prefetch() -> None:
+    """Start a background prefetch of the /process batch unless it is already cached."""
+    if "process_batch" in _enrichment_cache:
+        return
+    task = asyncio.create_task(_prefetch_process_batch())
+    # Keep a reference until it finishes so the task isn't garbage collected
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
+
 async def get_incomplete_tenders_count() -> int:
-    """Get count of tenders that need enrichment using simplified logic."""
+    """Get count of tenders that need enrichment from the count header alone."""
     try:
-        # Get all tenders that are not enriched
-        response = db_service.supabase.table("tenders").select(
-            "id,closing_date,contact_name,contact_email,contact_phone,documents_urls,enriched"
-        ).neq("enriched", True).execute()
-        
-        incomplete_count = 0
-        for tender in response.data:
-            if needs_enrichment(tender):
-                incomplete_count += 1
+        query = db_service.supabase.table("tenders").select(
+            "id", count="exact", head=True
+        ).eq("needs_enrichment", True).neq("enriched", True)
+        response = await asyncio.to_thread(query.execute)
         
-        return incomplete_count
+        return response.count or 0
     except Exception as e:
-        print(f"Error getting incomplete tenders count: {e}")
+        logger.error(f"Error getting incomplete tenders count: {e}")
         return 0
 
 @router.get("/logs")
@@ -291,73 +432,7 @@ async def get_enrichment_logs(limit: int = Query(50, ge=1, le=200)):
 async def debug_enrichment():
     """Debug endpoint to understand enrichment needs."""
     try:
-        # Get a few tenders to debug - use all possible field names
-        print("Making Supabase query...")
-        response = db_service.supabase.table("tenders").select(
-            "id,title,organization,buyer,closing_date,deadline,contact_name,contact_email,contact_phone,description,summary_ai,documents_urls,enriched,external_id,source_name,source,source_url"
-        ).limit(5).execute()
-        
-        print(f"Supabase response: data={response.data} count={len(response.data) if response.data else 0}")
-        
-        debug_info = []
-        for tender in response.data:
-            print(f"Processing tender: {tender}")
-            
-            # Check each enrichment category
-            contact_name = tender.get("contact_name")
-            contact_email = tender.get("contact_email") 
-            contact_phone = tender.get("contact_phone")
-            
-            has_contact = any([
-                contact_name and str(contact_name).strip() and str(contact_name).strip() not in ['', '(000) 000-0000'],
-                contact_email and str(contact_email).strip() and str(contact_email).strip() not in ['', 'N/A'],
-                contact_phone and str(contact_phone).strip() and str(contact_phone).strip() not in ['', '(000) 000-0000', '101', '5161']
-            ])
-            
-            # Use fallback logic for closing_date
-            closing_date = tender.get("closing_date") or tender.get("deadline")
-            has_closing_date = closing_date is not None and str(closing_date).strip() not in ['', 'null', 'None']
-            
-            documents_urls = tender.get("documents_urls")
-            has_attachments = documents_urls is not None and len(documents_urls) > 0
-            
-            needs_enrichment_result = needs_enrichment(tender)
-            
-            # Build missing fields list for debugging (only for debug endpoint)
-            missing_fields = []
-            if not has_contact:
-                missing_fields.append("contact_info")
-            if not has_closing_date:
-                missing_fields.append("closing_date")
-            if not has_attachments:
-                missing_fields.append("attachments")
-            
-            debug_info.append({
-                "id": tender["id"],
-                "title": tender["title"][:50] + "..." if len(tender["title"]) > 50 else tender["title"],
-                "enriched": tender.get("enriched"),
-                "needs_enrichment": needs_enrichment_result,
-                "missing_fields": missing_fields,  # Only for debug endpoint
-                "has_contact": has_contact,
-                "has_closing_date": has_closing_date,
-                "has_attachments": has_attachments,
-                "contact_name": contact_name,
-                "contact_email": contact_email,
-                "contact_phone": contact_phone,
-                "closing_date": closing_date,
-                "documents_urls": documents_urls,
-                "external_id": tender.get("external_id"),
-                "source_name": tender.get("source_name") or tender.get("source"),  # Use fallback
-                "source_url": tender.get("source_url"),
-                "organization": tender.get("organization") or tender.get("buyer"),  # Use fallback
-                "description": tender.get("description") or tender.get("summary_ai")  # Use fallback
-            })
-        
-        return {
-            "debug_info": debug_info,
-            "total_tenders_checked": len(response.data),
-            "needs_enrichment_count": sum(1 for item in debug_info if item["needs_enrichment"])
-        }
+        return await _cached("debug", _fetch_debug_info)
     except Exception as e:
         import traceback
         return {
@@ -365,4 +440,53 @@ async def debug_enrichment():
             "traceback": traceback.format_exc(),
             "debug_info": [],
             "total_tenders_checked": 0
-        } 
\ No newline at end of file
+        }
+
+async def _fetch_debug_info() -> Dict[str, Any]:
+    """Sample a few tenders and break down why each does or doesn't need enrichment."""
+    # Get a few tenders to debug - use all possible field names
+    query = db_service.supabase.table("tenders").select(
+        "id,title,organization,buyer,closing_date,deadline,contact_name,contact_email,contact_phone,description,summary_ai,documents_urls,enriched,external_id,source_name,source,source_url"
+    ).limit(5)
+    response = await asyncio.to_thread(query.execute)
+    
+    logger.debug("Debug sample returned %d tenders", len(response.data or []))
+    
+    debug_info = []
+    for tender in response.data:
+        # Check each enrichment category
+        has_contact, has_closing_date, has_attachments, missing_fields = _extract_flags(tender)
+        needs_enrichment_result = bool(missing_fields)
+        
+        contact_name = tender.get("contact_name")
+        contact_email = tender.get("contact_email")
+        contact_phone = tender.get("contact_phone")
+        closing_date = _coalesce(tender, "closing_date")
+        documents_urls = tender.get("documents_urls")
+        
+        debug_info.append({
+            "id": tender["id"],
+            "title": tender["title"][:50] + "..." if len(tender["title"]) > 50 else tender["title"],
+            "enriched": tender.get("enriched"),
+            "needs_enrichment": needs_enrichment_result,
+            "missing_fields": missing_fields,  # Only for debug endpoint
+            "has_contact": has_contact,
+            "has_closing_date": has_closing_date,
+            "has_attachments": has_attachments,
+            "contact_name": contact_name,
+            "contact_email": contact_email,
+            "contact_phone": contact_phone,
+            "closing_date": closing_date,
+            "documents_urls": documents_urls,
+            "external_id": tender.get("external_id"),
+            "source_name": _coalesce(tender, "source_name"),  # Use fallback
+            "source_url": tender.get("source_url"),
+            "organization": _coalesce(tender, "organization"),  # Use fallback
+            "description": _coalesce(tender, "description")  # Use fallback
+        })
+    
+    return {
+        "debug_info": debug_info,
+        "total_tenders_checked": len(response.data),
+        "needs_enrichment_count": sum(1 for item in debug_info if item["needs_enrichment"])
+    }
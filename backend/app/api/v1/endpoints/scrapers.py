@@ -1,7 +1,11 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from typing import Dict, List, Optional, Any
+from collections import Counter
+from itertools import islice
 import logging
 
+from cachetools import TTLCache
+
 from app.services.scraper_service import scraper_service
 from app.services.job_queue import job_queue, JobStatus
 from app.services.scheduler import scraper_scheduler
@@ -10,6 +14,28 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Health probes poll every few seconds; reuse status snapshots for a second
+HEALTH_CACHE_TTL = 1
+_health_cache: TTLCache = TTLCache(maxsize=2, ttl=HEALTH_CACHE_TTL)
+
+
+def _cached_scheduler_status() -> Dict[str, Any]:
+    """Scheduler status, refreshed at most once per HEALTH_CACHE_TTL."""
+    try:
+        return _health_cache["scheduler"]
+    except KeyError:
+        status = _health_cache["scheduler"] = scraper_scheduler.get_status()
+        return status
+
+
+async def _cached_scraper_status() -> Dict[str, Any]:
+    """All scraper statuses, refreshed at most once per HEALTH_CACHE_TTL."""
+    try:
+        return _health_cache["scrapers"]
+    except KeyError:
+        status = _health_cache["scrapers"] = await scraper_service.get_scraper_status()
+        return status
+
 
 @router.get("/status")
 async def get_scraper_status(scraper_id: Optional[str] = None) -> Dict[str, Any]:
@@ -89,15 +115,14 @@ async def get_jobs(
             except ValueError:
                 raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
         
-        jobs = job_queue.get_jobs(status=job_status, limit=limit)
-        job_data = [job.to_dict() for job in jobs]
+        job_data = [job.to_dict() for job in islice(job_queue.iter_jobs(status=job_status), limit)]
         
         return {
             "success": True,
             "data": {
                 "jobs": job_data,
                 "total": len(job_data),
-                "running": len(job_queue.get_running_jobs())
+                "running": job_queue.running_count
             }
         }
     except Exception as e:
@@ -238,14 +263,15 @@ async def scraper_health_check() -> Dict[str, Any]:
     """Health check for scraper services."""
     try:
         # Check scheduler status
-        scheduler_status = scraper_scheduler.get_status()
+        scheduler_status = _cached_scheduler_status()
         
         # Check job queue status
-        running_jobs = len(job_queue.get_running_jobs())
+        running_jobs = job_queue.running_count
         total_jobs = len(job_queue.get_jobs())
         
         # Check scraper status
-        scraper_status = await scraper_service.get_scraper_status()
+        scraper_status = await _cached_scraper_status()
+        status_counts = Counter(s["status"] for s in scraper_status.values())
         
         health_status = {
             "scheduler": {
@@ -258,8 +284,8 @@ async def scraper_health_check() -> Dict[str, Any]:
             },
             "scrapers": {
                 "total": len(scraper_status),
-                "running": len([s for s in scraper_status.values() if s["status"] == "running"]),
-                "failed": len([s for s in scraper_status.values() if s["status"] == "failed"])
+                "running": status_counts["running"],
+                "failed": status_counts["failed"]
             }
         }
         
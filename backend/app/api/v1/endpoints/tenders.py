@@ -1,18 +1,71 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import List, Optional, Set
 from datetime import date
+import asyncio
+import hashlib
+import logging
+import orjson
 from pydantic import BaseModel
 
+from app.config import settings
+
 from app.models.tender import (
-    Tender, TenderCreate, TenderUpdate, TenderStatistics, 
+    TENDER_LIST_ADAPTER, Tender, TenderCreate, TenderUpdate, TenderStatistics, 
     TendersResponse, TenderFilters, SearchSuggestion, 
     SearchStatistics, SearchExample
 )
 from app.services.tender_service import tender_service
-from app.services.ai_search_service import ai_search_service, AISearchResponse
+from app.services.ai_search_service import ai_search_service, AISearchResponse, AISearchResult
+from app.services.search_cache import AISearchCache, ai_search_cache_key, get_ai_search_cache
+from app.utils.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Skip AI search for a while once live searches keep failing
+ai_search_breaker = CircuitBreaker("AI search", failure_threshold=5, reset_timeout=30.0)
+
+
+# Live AI searches that outlived their request budget and are still filling the cache
+_background_ai_searches: Set[asyncio.Task] = set()
+
+
+async def _run_ai_search(cache: AISearchCache, cache_key: str, search: str, page: int, limit: int) -> AISearchResponse:
+    """Run one AI search to completion, caching the response and reporting the outcome to the breaker."""
+    try:
+        ai_response = await ai_search_service.search(
+            query=search,
+            page=page,
+            page_size=limit,
+            explain_results=False
+        )
+    except Exception:
+        ai_search_breaker.record_failure()
+        raise
+    ai_search_breaker.record_success()
+    await cache.set(cache_key, ai_response.model_dump_json())
+    return ai_response
+
+
+def _json_response(model: BaseModel) -> Response:
+    """Serialize a validated model once, skipping FastAPI's response_model re-validation."""
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+# How long clients and shared caches may reuse slow-changing responses
+PUBLIC_CACHE_MAX_AGE = 60
+
+
+def _etag_response(request: Request, content: bytes) -> Response:
+    """Serve JSON with an ETag and public Cache-Control, or 304 when the client's copy is current."""
+    etag = f'"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={PUBLIC_CACHE_MAX_AGE}"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
 
 class AISearchRequest(BaseModel):
     """Request model for AI search endpoint."""
@@ -22,8 +75,29 @@ class AISearchRequest(BaseModel):
     explain_results: bool = Query(True, description="Generate AI explanations for top results")
 
 
+def _tenders_from_ai_results(results: List[AISearchResult]) -> List[Tender]:
+    """Validate a page of AI search results straight into Tenders.
+    
+    TenderSearchRow accepts the AI names (deadline, province, summary_raw, reference,
+    score) as aliases, so only the fields without a counterpart are added and
+    the page goes through the compiled validator in a single call.
+    """
+    return TENDER_LIST_ADAPTER.validate_python([
+        {
+            **ai_result.__dict__,
+            "source_name": "AI Search",
+            "contract_value": str(ai_result.value) if ai_result.value else None,
+            "highlight": f"AI Score: {ai_result.score:.3f}, Similarity: {ai_result.cosine_similarity:.3f}",
+        }
+        for ai_result in results
+    ])
+
+
 @router.post("/search/ai", response_model=AISearchResponse)
-async def ai_search(request: AISearchRequest) -> AISearchResponse:
+async def ai_search(
+    request: AISearchRequest,
+    cache: AISearchCache = Depends(get_ai_search_cache)
+) -> AISearchResponse:
     """
     Perform AI-powered search with natural language query parsing and hybrid ranking.
     
@@ -40,12 +114,22 @@ async def ai_search(request: AISearchRequest) -> AISearchResponse:
     - "healthcare equipment in Quebec closing next week"
     """
     try:
-        return await ai_search_service.search(
+        cache_key = ai_search_cache_key(
+            request.query, request.page, request.page_size, request.explain_results
+        )
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            # Already validated and serialized when it was stored
+            return Response(content=cached, media_type="application/json")
+        
+        response = await ai_search_service.search(
             query=request.query,
             page=request.page,
             page_size=request.page_size,
             explain_results=request.explain_results
         )
+        await cache.set(cache_key, response.model_dump_json())
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI search failed: {str(e)}")
 
@@ -61,7 +145,8 @@ async def get_tenders(
     limit: int = Query(50, ge=1, le=100, description="Number of results to return"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
     use_advanced_search: bool = Query(False, description="Use advanced search features"),
-    use_ai_search: bool = Query(True, description="Use AI-powered search")
+    use_ai_search: bool = Query(True, description="Use AI-powered search"),
+    cache: AISearchCache = Depends(get_ai_search_cache)
 ) -> TendersResponse:
     """
     Get list of tenders with optional filtering and pagination.
@@ -81,101 +166,79 @@ async def get_tenders(
     if use_ai_search and search:
         # Use AI search service
         try:
-            ai_response = await ai_search_service.search(
-                query=search,
-                page=(offset // limit) + 1,
-                page_size=limit,
-                explain_results=False
-            )
-            
-            # Convert AISearchResult objects to Tender objects
-            tenders = []
-            for ai_result in ai_response.results:
-                tender = {
-                    "id": ai_result.id,
-                    "title": ai_result.title,
-                    "summary_raw": ai_result.summary_raw,
-                    "organization": ai_result.organization,
-                    "category": ai_result.category,
-                    "reference": ai_result.reference,
-                    "naics": ai_result.naics,
-                    "province": ai_result.province,
-                    "value": ai_result.value,
-                    "deadline": ai_result.deadline,
-                    "url": ai_result.url,
-                    "created_at": ai_result.created_at,
-                    "updated_at": ai_result.updated_at,
-                    "source_name": "AI Search",
-                    "contract_value": str(ai_result.value) if ai_result.value else None,
-                    "closing_date": ai_result.deadline,
-                    "location": ai_result.province,
-                    "description": ai_result.summary_raw,
-                    "external_id": ai_result.reference,
-                    "buyer": ai_result.organization,
-                    "rank": ai_result.score,
-                    "highlight": f"AI Score: {ai_result.score:.3f}, Similarity: {ai_result.cosine_similarity:.3f}"
-                }
-                tenders.append(tender)
+            page = (offset // limit) + 1
+            cache_key = ai_search_cache_key(search, page, limit, False)
+            cached = await cache.get(cache_key)
+            ai_response = None
+            if cached is not None:
+                ai_response = AISearchResponse.model_validate_json(cached)
+            elif ai_search_breaker.allow_request():
+                # Shielded so a search that runs over budget still finishes, warms the
+                # cache for the next request and reports its real outcome to the breaker
+                search_task = asyncio.create_task(_run_ai_search(cache, cache_key, search, page, limit))
+                _background_ai_searches.add(search_task)
+                search_task.add_done_callback(_background_ai_searches.discard)
+                ai_response = await asyncio.wait_for(
+                    asyncio.shield(search_task),
+                    timeout=settings.ai_search_timeout_seconds
+                )
             
-            # Convert AI search response to TendersResponse format
-            return TendersResponse(
-                tenders=tenders,
-                total=ai_response.total,
-                offset=offset,
-                limit=limit,
-                has_more=offset + limit < ai_response.total,
-                filters_applied={
-                    "ai_search": True,
-                    "query": search,
-                    "parsed_filters": ai_response.filters.model_dump() if ai_response.filters else {}
-                },
-                query_info={
-                    "original_query": search,
-                    "parsed_query": "AI processed query",
-                    "filters": ai_response.filters.model_dump() if ai_response.filters else {},
-                    "field_filters": {},
-                    "wildcards": [],
-                    "has_errors": False
-                }
-            )
+            if ai_response is not None:
+                # Convert AISearchResult objects to Tender objects
+                tenders = _tenders_from_ai_results(ai_response.results)
+                parsed_filters = ai_response.filters.model_dump() if ai_response.filters else {}
+                
+                # Convert AI search response to TendersResponse format
+                return _json_response(TendersResponse(
+                    tenders=tenders,
+                    total=ai_response.total,
+                    offset=offset,
+                    limit=limit,
+                    has_more=offset + limit < ai_response.total,
+                    filters_applied={
+                        "ai_search": True,
+                        "query": search,
+                        "parsed_filters": parsed_filters
+                    },
+                    query_info={
+                        "original_query": search,
+                        "parsed_query": "AI processed query",
+                        "filters": parsed_filters,
+                        "field_filters": {},
+                        "wildcards": [],
+                        "has_errors": False
+                    }
+                ))
         except Exception as e:
-            # Fallback to regular search if AI search fails
-            return await tender_service.get_tenders(
-                limit=limit,
-                offset=offset,
-                search=search,
-                source=source,
-                province=province,
-                category=category,
-                sort_by=sort_by,
-                sort_order=sort_order,
-                use_advanced_search=use_advanced_search
-            )
-    else:
-        # Use regular search
-        return await tender_service.get_tenders(
-            limit=limit,
-            offset=offset,
-            search=search,
-            source=source,
-            province=province,
-            category=category,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            use_advanced_search=use_advanced_search
-        )
+            # Fallback to regular search if AI search fails or runs over budget
+            logger.warning(f"AI search failed, falling back to regular search: {e!r}")
+    
+    # Regular search, also used when AI search is skipped by the breaker or fails
+    return _json_response(await tender_service.get_tenders(
+        limit=limit,
+        offset=offset,
+        search=search,
+        source=source,
+        province=province,
+        category=category,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        use_advanced_search=use_advanced_search
+    ))
 
 
 @router.get("/statistics", response_model=TenderStatistics)
-async def get_tender_statistics() -> TenderStatistics:
+async def get_tender_statistics(request: Request) -> TenderStatistics:
     """Get tender statistics including counts, source distribution, and recent activity."""
-    return await tender_service.get_tender_statistics()
+    stats = await tender_service.get_tender_statistics()
+    return _etag_response(request, stats.model_dump_json().encode())
 
 
 @router.get("/filters", response_model=TenderFilters)
-async def get_tender_filters() -> TenderFilters:
+async def get_tender_filters(request: Request) -> TenderFilters:
     """Get available filter options for tenders."""
-    return await tender_service.get_tender_filters()
+    filters = await tender_service.get_tender_filters()
+    return _etag_response(request, filters.model_dump_json().encode())
 
 
 @router.get("/search-suggestions")
@@ -194,9 +257,10 @@ async def get_search_statistics() -> dict:
 
 
 @router.get("/search-examples", response_model=dict)
-async def get_search_examples() -> dict:
+async def get_search_examples(request: Request) -> dict:
     """Get example search queries for documentation."""
-    return await tender_service.get_search_examples()
+    examples = await tender_service.get_search_examples()
+    return _etag_response(request, orjson.dumps(examples))
 
 
 @router.get("/{tender_id}", response_model=Tender)
@@ -1,5 +1,5 @@
-from typing import List
-from pydantic import Field, computed_field
+from typing import Any, Tuple
+from pydantic import Field, PrivateAttr
 from pydantic_settings import BaseSettings
 
 
@@ -15,6 +15,7 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(..., description="OpenAI API key")
     openai_model: str = Field(default="gpt-4o", description="OpenAI model to use")
     openai_max_tokens: int = Field(default=1000, description="Maximum tokens for OpenAI requests")
+    ai_search_timeout_seconds: float = Field(default=1.5, description="Time budget for AI search before falling back to regular search")
     
     # SendGrid Configuration
     sendgrid_api_key: str = Field(..., description="SendGrid API key")
@@ -40,9 +41,11 @@ class Settings(BaseSettings):
         description="Allowed CORS origins (comma-separated)"
     )
     api_base_url: str = Field(default="http://localhost:8000", description="API base URL")
+    web_workers: int = Field(default=1, description="Uvicorn worker processes outside debug (each runs its own scraper scheduler)")
     
     # Database Configuration
     database_url: str = Field(..., description="Database connection URL")
+    redis_url: str = Field(default="", description="Redis URL for shared response caching (disabled if empty)")
     
     # Email Configuration
     email_digest_frequency: str = Field(default="daily", description="Email digest frequency")
@@ -63,11 +66,16 @@ class Settings(BaseSettings):
     enable_email_digest: bool = Field(default=True, description="Enable email digest")
     alpha_mode: bool = Field(default=True, description="Alpha mode enabled")
     
-    @computed_field
+    _cors_origins: Tuple[str, ...] = PrivateAttr(default=())
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Parse the comma-separated CORS origins once at load."""
+        self._cors_origins = tuple(origin.strip() for origin in self.cors_origins.split(',') if origin.strip())
+    
     @property
-    def cors_origins_list(self) -> List[str]:
-        """Get CORS origins as a list."""
-        return [origin.strip() for origin in self.cors_origins.split(',') if origin.strip()]
+    def cors_origins_list(self) -> Tuple[str, ...]:
+        """Get CORS origins as a tuple."""
+        return self._cors_origins
     
     class Config:
         env_file = ".env"
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 import asyncio
 import logging
@@ -8,12 +9,21 @@ from datetime import datetime, timezone
 
 from app.config import settings
 from app.api.v1.api import api_router
+from app.services.advanced_search_service import advanced_search_service
 from app.services.scheduler import scraper_scheduler
+from app.services.search_cache import ai_search_cache
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=logging.DEBUG if settings.debug else logging.INFO)
+if not settings.debug:
+    # Client libraries log every request/frame at INFO/DEBUG
+    for noisy_logger in ("openai", "httpx", "httpcore", "hpack"):
+        logging.getLogger(noisy_logger).setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
+# How often the cached /health payload is refreshed
+HEALTH_TICK_SECONDS = 1.0
+
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
@@ -24,6 +34,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
+        default_response_class=ORJSONResponse,
     )
     
     # Add CORS middleware
@@ -35,32 +46,76 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Compress large JSON payloads (tender pages run to hundreds of KB)
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    
     # Include API router
     app.include_router(api_router, prefix="/api/v1")
     
+    # /health serves these snapshots instead of rebuilding them per probe
+    app.state.health_ts = ""
+    app.state.health_scheduler = {"running": False, "initialized": False}
+    
+    def _refresh_health() -> None:
+        app.state.health_ts = datetime.now(timezone.utc).isoformat()
+        scheduler_status = scraper_scheduler.get_status()
+        app.state.health_scheduler = {
+            "running": scheduler_status["running"],
+            "initialized": scheduler_status["initialized"]
+        }
+    
+    def _refresh_health_safely() -> None:
+        try:
+            _refresh_health()
+        except Exception as e:
+            logger.warning(f"Failed to refresh health status: {e}")
+    
+    async def _health_tick():
+        while True:
+            await asyncio.sleep(HEALTH_TICK_SECONDS)
+            _refresh_health_safely()
+    
     @app.on_event("startup")
     async def startup_event():
         """Startup event handler."""
         logger.info("Starting BidSense API...")
         
+        try:
+            await ai_search_cache.connect()
+        except Exception as e:
+            logger.error(f"Failed to connect AI search cache: {e}")
+        
         # Start the scraper scheduler in the background
         try:
             await scraper_scheduler.start()
             logger.info("Scraper scheduler started successfully")
         except Exception as e:
             logger.error(f"Failed to start scraper scheduler: {e}")
+        
+        # Populate the snapshot before serving so the first probe sees real values
+        _refresh_health_safely()
+        app.state.health_task = asyncio.create_task(_health_tick())
+        
+        # Warm the suggestion index without delaying startup; the scheduler refreshes it
+        app.state.suggestion_index_task = asyncio.create_task(advanced_search_service.refresh_suggestion_index())
     
     @app.on_event("shutdown")
     async def shutdown_event():
         """Shutdown event handler."""
         logger.info("Shutting down BidSense API...")
         
+        health_task = getattr(app.state, "health_task", None)
+        if health_task is not None:
+            health_task.cancel()
+        
         # Stop the scraper scheduler
         try:
             await scraper_scheduler.stop()
             logger.info("Scraper scheduler stopped successfully")
         except Exception as e:
             logger.error(f"Error stopping scraper scheduler: {e}")
+        
+        await ai_search_cache.close()
     
     @app.get("/")
     async def root():
@@ -76,16 +131,10 @@ def create_app() -> FastAPI:
     @app.get("/health")
     async def health_check():
         """Health check endpoint."""
-        # Get scheduler status
-        scheduler_status = scraper_scheduler.get_status()
-        
         return {
             "status": "healthy",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "scheduler": {
-                "running": scheduler_status["running"],
-                "initialized": scheduler_status["initialized"]
-            }
+            "timestamp": app.state.health_ts,
+            "scheduler": app.state.health_scheduler
         }
     
     @app.exception_handler(Exception)
@@ -107,10 +156,23 @@ app = create_app()
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=settings.debug,
-        log_level="info" if not settings.debug else "debug",
-    ) 
\ No newline at end of file
+    if settings.debug:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="debug",
+        )
+    else:
+        # uvloop + httptools ship with uvicorn[standard]
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=settings.web_workers,
+            access_log=False,
+            log_level="info",
+        )
\ No newline at end of file
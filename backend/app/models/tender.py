@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -53,8 +53,40 @@ class Tender(TenderBase):
     """Complete tender model with all fields."""
     id: str = Field(..., description="Tender ID")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TenderSearchRow(Tender):
+    """Read-only Tender built from search rows.
+    
+    Fields whose database/AI-search name differs also accept that name on
+    input, so search rows validate without remapping. Kept off TenderBase so
+    create/update payloads never pick up a value under the wrong column.
+    """
+    description: Optional[str] = Field(
+        None, description="Tender description",
+        validation_alias=AliasChoices("description", "summary_raw")
+    )
+    closing_date: Optional[datetime] = Field(
+        None, description="Closing date",
+        validation_alias=AliasChoices("closing_date", "deadline")
+    )
+    location: Optional[str] = Field(
+        None, description="Location",
+        validation_alias=AliasChoices("location", "province")
+    )
+    external_id: Optional[str] = Field(
+        None, description="External ID",
+        validation_alias=AliasChoices("external_id", "reference")
+    )
+    rank: Optional[float] = Field(
+        None, description="Search relevance rank",
+        validation_alias=AliasChoices("rank", "score")
+    )
+
+
+# Built once; validates a whole page of search rows in a single compiled call
+TENDER_LIST_ADAPTER: TypeAdapter[List[TenderSearchRow]] = TypeAdapter(List[TenderSearchRow])
 
 
 class TenderList(BaseModel):
@@ -11,18 +11,77 @@ This service provides advanced search capabilities including:
 """
 
 from typing import Dict, List, Any, Optional, Tuple
+import asyncio
 import logging
+from collections import Counter
 from datetime import datetime
 
+from cachetools import TTLCache
+
 from app.services.database import db_service
-from app.utils.query_parser import parse_search_query, ParsedQuery
+from app.utils.prefix_index import PrefixIndex
+from app.utils.query_parser import parse_search_query
 
 logger = logging.getLogger(__name__)
 
+# Search statistics change on the order of minutes but are polled by dashboards
+SEARCH_STATS_CACHE_TTL = 60
+
+# Columns returned by search_tenders_advanced, kept under their own names
+_RESULT_COLUMNS: Tuple[str, ...] = (
+    "id", "title", "organization", "description", "summary_raw", "category", "reference",
+    "naics", "province", "closing_date", "contract_value", "source_name", "contact_name",
+    "contact_email", "contact_phone", "documents_urls", "original_url",
+    # Search-specific fields
+    "rank", "highlight",
+)
+
+# (response key, column) pairs copied from an already mapped column
+_RESULT_ALIASES: Tuple[Tuple[str, str], ...] = (
+    ("created_at", "closing_date"),  # Use closing_date as created_at for now
+    ("updated_at", "closing_date"),
+    ("url", "original_url"),
+    ("location", "province"),
+)
+
+# Rows fetched per request while building the suggestion index
+SUGGESTION_INDEX_PAGE_SIZE = 1000
+
+_SEARCH_EXAMPLES: Tuple[Dict[str, str], ...] = (
+    {
+        "query": 'Show me bridge maintenance tenders in BC closing this month over $500K',
+        "description": "Natural language query for specific requirements"
+    },
+    {
+        "query": 'IT services in Ontario under $100K',
+        "description": "Find IT services with budget constraints"
+    },
+    {
+        "query": 'construction projects in Alberta and Saskatchewan',
+        "description": "Multi-province construction search"
+    },
+    {
+        "query": 'healthcare equipment in Quebec closing next week',
+        "description": "Time-sensitive healthcare search"
+    },
+    {
+        "query": 'software development services for government',
+        "description": "Broad category search with context"
+    },
+    {
+        "query": 'environmental consulting in western provinces',
+        "description": "Regional service search"
+    },
+)
+
 
 class AdvancedSearchService:
     """Service for advanced search operations."""
     
+    def __init__(self):
+        self._stats_cache: TTLCache = TTLCache(maxsize=1, ttl=SEARCH_STATS_CACHE_TTL)
+        self._suggestion_index: Optional[PrefixIndex] = None
+    
     async def search_tenders_advanced(
         self,
         query: str,
@@ -73,22 +132,15 @@ class AdvancedSearchService:
                 "province_filter": parsed_query.filter_clauses.get("province"),
                 "naics_filter": parsed_query.filter_clauses.get("naics"),
                 "limit_count": limit,
-                "offset_count": offset
+                "offset_count": offset,
+                # Multi-value filters and sorting are applied in SQL, before LIMIT/OFFSET
+                "field_filters": parsed_query.field_filters or None,
+                "sort_by": sort_by,
+                "sort_order": sort_order
             }
             
-            # Execute the advanced search function
-            result = await self._execute_advanced_search(search_params)
-            
-            # Apply additional field filters if any
-            if parsed_query.field_filters:
-                result = await self._apply_field_filters(result, parsed_query.field_filters)
-            
-            # Apply sorting
-            if sort_by != "rank":
-                result = await self._apply_sorting(result, sort_by, sort_order)
-            
-            # Get total count for pagination
-            total_count = await self._get_search_count(parsed_query)
+            # Execute the advanced search function (page and total in one call)
+            result, total_count = await self._execute_advanced_search(search_params)
             
             return {
                 "tenders": result,
@@ -119,109 +171,43 @@ class AdvancedSearchService:
                 }
             }
     
-    async def _execute_advanced_search(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Execute the advanced search database function."""
+    async def _execute_advanced_search(self, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
+        """Execute the advanced search database function, returning the page and the total match count."""
         try:
-            # Call the search_tenders_advanced function
-            response = db_service.supabase.rpc(
-                'search_tenders_advanced',
-                params
-            ).execute()
+            # Call the search_tenders_advanced function off the event loop
+            response = await asyncio.to_thread(
+                db_service.supabase.rpc('search_tenders_advanced', params).execute
+            )
             
             # Map the results to frontend format
             mapped_results = []
             for tender in response.data:
-                mapped_tender = {
-                    "id": tender.get("id"),
-                    "title": tender.get("title"),
-                    "organization": tender.get("organization"),
-                    "description": tender.get("description"),
-                    "summary_raw": tender.get("summary_raw"),
-                    "category": tender.get("category"),
-                    "reference": tender.get("reference"),
-                    "naics": tender.get("naics"),
-                    "province": tender.get("province"),
-                    "closing_date": tender.get("closing_date"),
-                    "contract_value": tender.get("contract_value"),
-                    "source_name": tender.get("source_name"),
-                    "contact_name": tender.get("contact_name"),
-                    "contact_email": tender.get("contact_email"),
-                    "contact_phone": tender.get("contact_phone"),
-                    "documents_urls": tender.get("documents_urls"),
-                    "original_url": tender.get("original_url"),
-                    "created_at": tender.get("closing_date"),  # Use closing_date as created_at for now
-                    "updated_at": tender.get("closing_date"),
-                    "url": tender.get("original_url"),
-                    "location": tender.get("province"),
-                    # Search-specific fields
-                    "rank": tender.get("rank", 0.0),
-                    "highlight": tender.get("highlight", ""),
-                }
+                mapped_tender = {column: tender.get(column) for column in _RESULT_COLUMNS}
+                for key, column in _RESULT_ALIASES:
+                    mapped_tender[key] = mapped_tender[column]
                 mapped_results.append(mapped_tender)
             
-            return mapped_results
-            
-        except Exception as e:
-            logger.error(f"Error executing advanced search: {e}")
-            return []
-    
-    async def _apply_field_filters(self, results: List[Dict[str, Any]], field_filters: Dict[str, List[str]]) -> List[Dict[str, Any]]:
-        """Apply additional field filters to search results."""
-        filtered_results = []
-        
-        for tender in results:
-            include_tender = True
-            
-            for field, values in field_filters.items():
-                tender_value = tender.get(field, "").lower()
-                if not any(value.lower() in tender_value for value in values):
-                    include_tender = False
-                    break
-            
-            if include_tender:
-                filtered_results.append(tender)
-        
-        return filtered_results
-    
-    async def _apply_sorting(self, results: List[Dict[str, Any]], sort_by: str, sort_order: str) -> List[Dict[str, Any]]:
-        """Apply sorting to search results."""
-        reverse = sort_order.lower() == "desc"
-        
-        if sort_by == "closing_date":
-            results.sort(key=lambda x: x.get("closing_date") or "", reverse=reverse)
-        elif sort_by == "created_at":
-            results.sort(key=lambda x: x.get("created_at") or "", reverse=reverse)
-        elif sort_by == "title":
-            results.sort(key=lambda x: x.get("title", "").lower(), reverse=reverse)
-        elif sort_by == "organization":
-            results.sort(key=lambda x: x.get("organization", "").lower(), reverse=reverse)
-        # rank is already sorted by the database function
-        
-        return results
-    
-    async def _get_search_count(self, parsed_query: ParsedQuery) -> int:
-        """Get total count for search results."""
-        try:
-            # Build a count query based on the parsed query
-            count_params = {
-                "search_query": parsed_query.fts_query if parsed_query.fts_query else "''",
-                "buyer_filter": parsed_query.filter_clauses.get("organization"),
-                "province_filter": parsed_query.filter_clauses.get("province"),
-                "naics_filter": parsed_query.filter_clauses.get("naics"),
-                "limit_count": 1000,  # Large limit to get all results for counting
-                "offset_count": 0
-            }
-            
-            response = db_service.supabase.rpc(
-                'search_tenders_advanced',
-                count_params
-            ).execute()
+            # Every row carries the count of all matches, taken before LIMIT/OFFSET
+            if response.data:
+                total_count = response.data[0].get("total_count", 0)
+            elif params.get("offset_count"):
+                # A page past the end has no rows to carry the count, so fetch the
+                # first match alone; limit_count=0 would return no rows either
+                count_response = await asyncio.to_thread(
+                    db_service.supabase.rpc(
+                        'search_tenders_advanced',
+                        {**params, "limit_count": 1, "offset_count": 0}
+                    ).execute
+                )
+                total_count = count_response.data[0].get("total_count", 0) if count_response.data else 0
+            else:
+                total_count = 0
             
-            return len(response.data)
+            return mapped_results, total_count
             
         except Exception as e:
-            logger.error(f"Error getting search count: {e}")
-            return 0
+            logger.error(f"Error executing advanced search: {e}")
+            return [], 0
     
     async def get_advanced_search_suggestions(
         self, 
@@ -229,7 +215,8 @@ class AdvancedSearchService:
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """
-        Get advanced search suggestions using the database function.
+        Get advanced search suggestions from the in-memory index, or the database
+        function until the index has been built.
         
         Args:
             query_prefix: The query prefix to get suggestions for
@@ -238,15 +225,23 @@ class AdvancedSearchService:
         Returns:
             List of suggestion objects
         """
+        if self._suggestion_index is not None:
+            return [
+                {"text": word, "type": "word", "frequency": frequency}
+                for word, frequency in self._suggestion_index.complete(query_prefix, limit)
+            ]
+        
         try:
-            # Call the get_search_suggestions_advanced function
-            response = db_service.supabase.rpc(
-                'get_search_suggestions_advanced',
-                {
-                    "query_prefix": query_prefix,
-                    "limit_count": limit
-                }
-            ).execute()
+            # Call the get_search_suggestions_advanced function off the event loop
+            response = await asyncio.to_thread(
+                db_service.supabase.rpc(
+                    'get_search_suggestions_advanced',
+                    {
+                        "query_prefix": query_prefix,
+                        "limit_count": limit
+                    }
+                ).execute
+            )
             
             suggestions = []
             for suggestion in response.data:
@@ -262,21 +257,56 @@ class AdvancedSearchService:
             logger.error(f"Error getting advanced search suggestions: {e}")
             return []
     
+    async def refresh_suggestion_index(self) -> None:
+        """Rebuild the suggestion index from tender titles, organizations and categories."""
+        try:
+            counts = await asyncio.to_thread(self._count_suggestion_words)
+            self._suggestion_index = PrefixIndex(counts)
+            logger.info(f"Suggestion index built with {len(counts)} words")
+        except Exception as e:
+            logger.error(f"Error building suggestion index: {e}")
+    
+    def _count_suggestion_words(self) -> Counter:
+        """Count the words get_search_suggestions_advanced suggests, across all tenders."""
+        counts: Counter = Counter()
+        start = 0
+        while True:
+            response = (
+                db_service.supabase.table("tenders")
+                .select("title,organization,category")
+                .order("id")
+                .range(start, start + SUGGESTION_INDEX_PAGE_SIZE - 1)
+                .execute()
+            )
+            for tender in response.data:
+                text = " ".join(filter(None, (tender.get("title"), tender.get("organization"), tender.get("category"))))
+                counts.update(word for word in text.lower().split() if len(word) > 2)
+            
+            if len(response.data) < SUGGESTION_INDEX_PAGE_SIZE:
+                return counts
+            start += SUGGESTION_INDEX_PAGE_SIZE
+    
     async def get_search_statistics(self) -> Dict[str, Any]:
-        """Get search-related statistics."""
+        """Get search-related statistics, cached for SEARCH_STATS_CACHE_TTL seconds."""
+        try:
+            return self._stats_cache["stats"]
+        except KeyError:
+            pass
+        
         try:
             # Call the get_search_statistics function
-            response = db_service.supabase.rpc('get_search_statistics').execute()
+            response = await asyncio.to_thread(db_service.supabase.rpc('get_search_statistics').execute)
             
             if response.data:
                 stats = response.data[0]
-                return {
+                result = self._stats_cache["stats"] = {
                     "total_tenders": stats.get("total_tenders", 0),
                     "tenders_with_summary": stats.get("tenders_with_summary", 0),
                     "tenders_with_documents": stats.get("tenders_with_documents", 0),
                     "tenders_with_contacts": stats.get("tenders_with_contacts", 0),
                     "avg_search_vector_length": stats.get("avg_search_vector_length", 0)
                 }
+                return result
             
             return {
                 "total_tenders": 0,
@@ -298,32 +328,7 @@ class AdvancedSearchService:
     
     async def get_search_examples(self) -> List[Dict[str, str]]:
         """Get example search queries for documentation."""
-        return [
-            {
-                "query": 'Show me bridge maintenance tenders in BC closing this month over $500K',
-                "description": "Natural language query for specific requirements"
-            },
-            {
-                "query": 'IT services in Ontario under $100K',
-                "description": "Find IT services with budget constraints"
-            },
-            {
-                "query": 'construction projects in Alberta and Saskatchewan',
-                "description": "Multi-province construction search"
-            },
-            {
-                "query": 'healthcare equipment in Quebec closing next week',
-                "description": "Time-sensitive healthcare search"
-            },
-            {
-                "query": 'software development services for government',
-                "description": "Broad category search with context"
-            },
-            {
-                "query": 'environmental consulting in western provinces',
-                "description": "Regional service search"
-            }
-        ]
+        return list(_SEARCH_EXAMPLES)
 
 
 # Global advanced search service instance
@@ -4,12 +4,16 @@ AI Province Detection Service
 Uses OpenAI GPT to analyze tender content and accurately assign Canadian provinces.
 """
 
+import hashlib
 import logging
-from typing import Optional, Dict, Any
+import re
+from collections import Counter
+from typing import Optional, Dict, Any, Tuple
 import asyncio
-from functools import lru_cache
 
 import openai
+import orjson
+from cachetools import LRUCache
 from pydantic import BaseModel, Field
 
 from app.config import settings
@@ -17,26 +21,86 @@ from app.utils.retry import retry_async
 
 logger = logging.getLogger(__name__)
 
+# Tenders analysed per GPT call in detect_province_batch
+PROVINCE_BATCH_SIZE = 20
+# Completion tokens budgeted per tender in a batch call
+PROVINCE_BATCH_TOKENS_PER_TENDER = 120
+# Batch calls in flight at once
+PROVINCE_BATCH_CONCURRENCY = 3
+# Detections kept per distinct analysis text
+PROVINCE_CACHE_SIZE = 4096
 
-class ProvinceDetectionResult(BaseModel):
-    """Result of AI province detection."""
-    
-    province: str = Field(..., description="Detected province code (e.g., 'NS', 'ON', 'BC')")
-    confidence: float = Field(..., description="Confidence score (0-1)")
-    reasoning: str = Field(..., description="Explanation of why this province was chosen")
+# Character budgets for the text sent to GPT per tender
+ANALYSIS_TITLE_CHARS = 300
+ANALYSIS_SUMMARY_CHARS = 600
+ANALYSIS_CATEGORY_CHARS = 100
+ANALYSIS_TEXT_MAX_CHARS = 1500
 
+_HTML_TAG = re.compile(r"<[^>]+>")
+_WHITESPACE = re.compile(r"\s+")
 
-class AIProvinceService:
-    """Service for AI-powered province detection from tender content."""
-    
-    def __init__(self):
-        self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
-        self.model = settings.openai_model
-        
-    @lru_cache(maxsize=1)
-    def _get_system_prompt(self) -> str:
-        """Get the system prompt for province detection."""
-        return """You are an expert at analyzing Canadian government tender documents to determine which province they belong to.
+
+def _clean_text(text: str) -> str:
+    """Strip HTML tags and collapse whitespace."""
+    return _WHITESPACE.sub(" ", _HTML_TAG.sub(" ", text)).strip()
+
+
+def _analysis_key(analysis_text: str) -> str:
+    """Cache key for the analysis text of a tender."""
+    return hashlib.blake2b(analysis_text.encode(), digest_size=16).hexdigest()
+
+
+# Place names that point to a single province. Ottawa/Gatineau are left out:
+# federal buyers list them wherever the work actually is.
+_PROVINCE_PLACES: Dict[str, Tuple[str, ...]] = {
+    "BC": ("British Columbia", "Vancouver", "Surrey", "Burnaby", "Kelowna", "Nanaimo", "Kamloops", "Prince George"),
+    "AB": ("Alberta", "Calgary", "Edmonton", "Red Deer", "Lethbridge", "Medicine Hat", "Grande Prairie"),
+    "SK": ("Saskatchewan", "Regina", "Saskatoon", "Moose Jaw", "Prince Albert"),
+    "MB": ("Manitoba", "Winnipeg", "Steinbach"),
+    "ON": ("Ontario", "Toronto", "Mississauga", "Brampton", "Hamilton", "Sudbury", "Thunder Bay", "Kitchener"),
+    "QC": ("Quebec", "Québec", "Montreal", "Montréal", "Laval", "Sherbrooke", "Trois-Rivières", "Saguenay"),
+    "NB": ("New Brunswick", "Fredericton", "Moncton", "Miramichi"),
+    "NS": ("Nova Scotia", "Halifax", "Dartmouth", "Cape Breton", "Truro"),
+    "PE": ("Prince Edward Island", "Charlottetown", "Summerside"),
+    "NL": ("Newfoundland", "Labrador", "St. John's", "Corner Brook", "Gander"),
+    "NT": ("Northwest Territories", "Yellowknife", "Inuvik", "Hay River"),
+    "NU": ("Nunavut", "Iqaluit", "Rankin Inlet", "Cambridge Bay"),
+    "YT": ("Yukon", "Whitehorse", "Dawson City"),
+}
+_PLACE_PROVINCES = {place.lower(): province for province, places in _PROVINCE_PLACES.items() for place in places}
+_PLACE_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(place) for place in sorted(_PLACE_PROVINCES, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+
+# First letter of a postal code; X is shared by NT and NU
+_POSTAL_PROVINCES = {
+    "A": "NL", "B": "NS", "C": "PE", "E": "NB", "G": "QC", "H": "QC", "J": "QC",
+    "K": "ON", "L": "ON", "M": "ON", "N": "ON", "P": "ON", "R": "MB", "S": "SK",
+    "T": "AB", "V": "BC", "Y": "YT",
+}
+_POSTAL_PATTERN = re.compile(r"\b([ABCEGHJ-NPRSTVXY])\d[ABCEGHJ-NPRSTV-Z] ?\d[ABCEGHJ-NPRSTV-Z]\d\b")
+
+# References needed before a rule match skips GPT
+RULE_MIN_HITS = 2
+
+
+def _rule_based_province(analysis_text: str) -> Optional[Tuple[str, int]]:
+    """Return (province, hits) when place names and postal codes point to exactly one province often enough."""
+    hits = Counter(_PLACE_PROVINCES[match.group(0).lower()] for match in _PLACE_PATTERN.finditer(analysis_text))
+    hits.update(
+        _POSTAL_PROVINCES[match.group(1)]
+        for match in _POSTAL_PATTERN.finditer(analysis_text)
+        if match.group(1) in _POSTAL_PROVINCES
+    )
+    if len(hits) == 1:
+        province, count = hits.most_common(1)[0]
+        if count >= RULE_MIN_HITS:
+            return province, count
+    return None
+
+
+_SYSTEM_PROMPT = """You are an expert at analyzing Canadian government tender documents to determine which province they belong to.
 
 Your task is to analyze tender information and determine the most likely Canadian province based on:
 1. Organization/buyer name (e.g., "Halifax Regional Municipality" = Nova Scotia)
@@ -69,34 +133,90 @@ IMPORTANT RULES:
 
 Return your analysis in the specified JSON format."""
 
-    def _get_function_schema(self) -> Dict[str, Any]:
-        """Get the function schema for province detection."""
-        return {
-            "name": "detect_province",
-            "description": "Detect the Canadian province for a tender based on content analysis",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "province": {
-                        "type": "string",
-                        "enum": ["BC", "AB", "SK", "MB", "ON", "QC", "NB", "NS", "PE", "NL", "NT", "NU", "YT"],
-                        "description": "The detected Canadian province code"
-                    },
-                    "confidence": {
-                        "type": "number",
-                        "minimum": 0,
-                        "maximum": 1,
-                        "description": "Confidence score for the detection (0-1)"
+_FUNCTION_SCHEMA: Dict[str, Any] = {
+    "name": "detect_province",
+    "description": "Detect the Canadian province for a tender based on content analysis",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "province": {
+                "type": "string",
+                "enum": ["BC", "AB", "SK", "MB", "ON", "QC", "NB", "NS", "PE", "NL", "NT", "NU", "YT"],
+                "description": "The detected Canadian province code"
+            },
+            "confidence": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": 1,
+                "description": "Confidence score for the detection (0-1)"
+            },
+            "reasoning": {
+                "type": "string",
+                "description": "Explanation of why this province was chosen"
+            }
+        },
+        "required": ["province", "confidence", "reasoning"]
+    }
+}
+
+# Same detection fields, for a numbered list of tenders
+_BATCH_FUNCTION_SCHEMA: Dict[str, Any] = {
+    "name": "detect_provinces",
+    "description": "Detect the Canadian province for each tender in a numbered list",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "description": "One detection per tender",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tender": {
+                            "type": "integer",
+                            "description": "Number of the tender in the list"
+                        },
+                        **_FUNCTION_SCHEMA["parameters"]["properties"]
                     },
-                    "reasoning": {
-                        "type": "string",
-                        "description": "Explanation of why this province was chosen"
-                    }
-                },
-                "required": ["province", "confidence", "reasoning"]
+                    "required": ["tender", *_FUNCTION_SCHEMA["parameters"]["required"]]
+                }
             }
-        }
+        },
+        "required": ["results"]
+    }
+}
+
+
+class ProvinceDetectionResult(BaseModel):
+    """Result of AI province detection."""
+    
+    province: str = Field(..., description="Detected province code (e.g., 'NS', 'ON', 'BC')")
+    confidence: float = Field(..., description="Confidence score (0-1)")
+    reasoning: str = Field(..., description="Explanation of why this province was chosen")
+
 
+class AIProvinceService:
+    """Service for AI-powered province detection from tender content."""
+    
+    def __init__(self):
+        self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+        self.model = settings.openai_model
+        self._detection_cache: LRUCache = LRUCache(maxsize=PROVINCE_CACHE_SIZE)
+        
+    def _known_detection(self, analysis_text: str) -> Optional[ProvinceDetectionResult]:
+        """Detection available without GPT: an unambiguous rule match or a cached result."""
+        rule_match = _rule_based_province(analysis_text)
+        if rule_match is not None:
+            province, hits = rule_match
+            return ProvinceDetectionResult(
+                province=province,
+                confidence=0.95,
+                reasoning=f"Rule-based match: {hits} place name or postal code references to {province} and no other province."
+            )
+        
+        # Re-analysing the same tender text gives the same answer
+        return self._detection_cache.get(_analysis_key(analysis_text))
+    
     @retry_async(max_retries=2, base_delay=1, max_delay=15)
     async def detect_province(self, tender_data: Dict[str, Any]) -> ProvinceDetectionResult:
         """
@@ -112,15 +232,19 @@ Return your analysis in the specified JSON format."""
             # Extract relevant information for analysis
             analysis_text = self._prepare_analysis_text(tender_data)
             
+            known = self._known_detection(analysis_text)
+            if known is not None:
+                return known
+            
             logger.info(f"Analyzing tender for province detection: {tender_data.get('title', 'Unknown')[:100]}...")
             
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
+                    {"role": "system", "content": _SYSTEM_PROMPT},
                     {"role": "user", "content": f"Analyze this tender and detect the Canadian province:\n\n{analysis_text}"}
                 ],
-                functions=[self._get_function_schema()],
+                functions=[_FUNCTION_SCHEMA],
                 function_call={"name": "detect_province"},
                 max_tokens=300,
                 temperature=0.1  # Low temperature for consistent results
@@ -132,10 +256,10 @@ Return your analysis in the specified JSON format."""
                 raise ValueError("GPT did not return expected function call")
             
             # Parse the result
-            import json
-            result_data = json.loads(function_call.arguments)
+            result_data = orjson.loads(function_call.arguments)
             
             result = ProvinceDetectionResult(**result_data)
+            self._detection_cache[_analysis_key(analysis_text)] = result
             
             logger.info(f"Detected province: {result.province} (confidence: {result.confidence:.2f}) - {result.reasoning}")
             return result
@@ -150,77 +274,113 @@ Return your analysis in the specified JSON format."""
             )
 
     def _prepare_analysis_text(self, tender_data: Dict[str, Any]) -> str:
-        """Prepare text for AI analysis from tender data."""
+        """Prepare compact text for AI analysis from tender data."""
         analysis_parts = []
         
         # Title
         if tender_data.get('title'):
-            analysis_parts.append(f"Title: {tender_data['title']}")
+            analysis_parts.append(f"Title: {_clean_text(tender_data['title'])[:ANALYSIS_TITLE_CHARS]}")
         
         # Organization/Buyer
         if tender_data.get('organization'):
-            analysis_parts.append(f"Organization: {tender_data['organization']}")
+            analysis_parts.append(f"Organization: {_clean_text(tender_data['organization'])}")
         elif tender_data.get('buyer'):
-            analysis_parts.append(f"Buyer: {tender_data['buyer']}")
+            analysis_parts.append(f"Buyer: {_clean_text(tender_data['buyer'])}")
         
-        # Summary/Description
+        # Summary/Description, stripped of markup to keep tokens for actual content
         if tender_data.get('summary_raw'):
-            # Limit summary to avoid token limits
-            summary = tender_data['summary_raw'][:1000]
-            analysis_parts.append(f"Summary: {summary}")
+            analysis_parts.append(f"Summary: {_clean_text(tender_data['summary_raw'])[:ANALYSIS_SUMMARY_CHARS]}")
         elif tender_data.get('description'):
-            description = tender_data['description'][:1000]
-            analysis_parts.append(f"Description: {description}")
+            analysis_parts.append(f"Description: {_clean_text(tender_data['description'])[:ANALYSIS_SUMMARY_CHARS]}")
         
         # Category
         if tender_data.get('category'):
-            analysis_parts.append(f"Category: {tender_data['category']}")
+            analysis_parts.append(f"Category: {_clean_text(tender_data['category'])[:ANALYSIS_CATEGORY_CHARS]}")
         
-        # URL (might contain location clues)
-        if tender_data.get('url'):
-            analysis_parts.append(f"URL: {tender_data['url']}")
-        
-        # Current province (if any, for context)
-        if tender_data.get('province'):
-            analysis_parts.append(f"Current Province Assignment: {tender_data['province']}")
-        
-        return "\n".join(analysis_parts)
+        return "\n".join(analysis_parts)[:ANALYSIS_TEXT_MAX_CHARS]
 
     async def detect_province_batch(self, tender_list: list[Dict[str, Any]]) -> list[ProvinceDetectionResult]:
         """
-        Detect provinces for multiple tenders in parallel.
+        Detect provinces for multiple tenders, several tenders per GPT call.
         
         Args:
             tender_list: List of tender dictionaries
             
         Returns:
-            List of ProvinceDetectionResult objects
+            List of ProvinceDetectionResult objects, in the order of tender_list
         """
-        # Process in batches to avoid rate limits
-        batch_size = 5
-        results = []
-        
-        for i in range(0, len(tender_list), batch_size):
-            batch = tender_list[i:i + batch_size]
-            batch_tasks = [self.detect_province(tender) for tender in batch]
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    logger.error(f"Batch detection failed: {result}")
-                    results.append(ProvinceDetectionResult(
+        analysis_texts = [self._prepare_analysis_text(tender) for tender in tender_list]
+        results: list[Optional[ProvinceDetectionResult]] = [
+            self._known_detection(text) for text in analysis_texts
+        ]
+        
+        # Only tenders without a rule match or cached detection go to GPT
+        pending = [i for i, result in enumerate(results) if result is None]
+        chunks = [pending[i:i + PROVINCE_BATCH_SIZE] for i in range(0, len(pending), PROVINCE_BATCH_SIZE)]
+        semaphore = asyncio.Semaphore(PROVINCE_BATCH_CONCURRENCY)
+        
+        async def detect_chunk(chunk: list[int]) -> list[ProvinceDetectionResult]:
+            async with semaphore:
+                return await self._detect_province_chunk([analysis_texts[i] for i in chunk])
+        
+        chunk_results = await asyncio.gather(*(detect_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            if isinstance(chunk_result, Exception):
+                logger.error(f"Batch detection failed: {chunk_result}")
+                chunk_result = [
+                    ProvinceDetectionResult(
                         province="ON",
                         confidence=0.1,
-                        reasoning=f"Batch processing failed: {str(result)}"
-                    ))
-                else:
-                    results.append(result)
-            
-            # Small delay between batches to respect rate limits
-            await asyncio.sleep(0.5)
+                        reasoning=f"Batch processing failed: {str(chunk_result)}"
+                    )
+                    for _ in chunk
+                ]
+            for i, result in zip(chunk, chunk_result):
+                results[i] = result
         
         return results
 
+    @retry_async(max_retries=2, base_delay=1, max_delay=15)
+    async def _detect_province_chunk(self, analysis_texts: list[str]) -> list[ProvinceDetectionResult]:
+        """Detect provinces for a few tenders in one GPT call, raising if the call or its output fails."""
+        tender_text = "\n\n".join(
+            f"Tender {number}:\n{analysis_text}"
+            for number, analysis_text in enumerate(analysis_texts, 1)
+        )
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": f"Analyze each of these {len(analysis_texts)} tenders and detect its Canadian province:\n\n{tender_text}"}
+            ],
+            functions=[_BATCH_FUNCTION_SCHEMA],
+            function_call={"name": "detect_provinces"},
+            max_tokens=PROVINCE_BATCH_TOKENS_PER_TENDER * len(analysis_texts),
+            temperature=0.1  # Low temperature for consistent results
+        )
+        
+        function_call = response.choices[0].message.function_call
+        if not function_call or function_call.name != "detect_provinces":
+            raise ValueError("GPT did not return expected function call")
+        
+        detections: Dict[int, ProvinceDetectionResult] = {}
+        for item in orjson.loads(function_call.arguments)["results"]:
+            number = item.pop("tender", None)
+            if isinstance(number, int) and 1 <= number <= len(analysis_texts):
+                detection = detections[number] = ProvinceDetectionResult(**item)
+                self._detection_cache[_analysis_key(analysis_texts[number - 1])] = detection
+        
+        return [
+            detections.get(number) or ProvinceDetectionResult(
+                province="ON",
+                confidence=0.1,
+                reasoning="AI detection returned no result for this tender. Defaulted to Ontario."
+            )
+            for number in range(1, len(analysis_texts) + 1)
+        ]
+
 
 # Global instance
 ai_province_service = AIProvinceService() 
\ No newline at end of file
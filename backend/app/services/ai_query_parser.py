@@ -4,7 +4,6 @@ AI Query Parser Service
 Converts natural language queries into structured search filters using GPT function calling.
 """
 
-import json
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
@@ -12,6 +11,7 @@ import asyncio
 from functools import lru_cache
 
 import openai
+from cachetools import TTLCache
 from pydantic import BaseModel, Field
 
 from app.config import settings
@@ -19,6 +19,16 @@ from app.utils.retry import retry_async
 
 logger = logging.getLogger(__name__)
 
+# Parsed filters kept per normalized query. Relative dates ("closing this month")
+# are resolved at parse time, so entries expire instead of living forever.
+PARSE_CACHE_SIZE = 10000
+PARSE_CACHE_TTL = 3600
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so equivalent queries share cache entries."""
+    return " ".join(query.lower().split())
+
 
 class SearchFilters(BaseModel):
     """Structured search filters extracted from natural language query."""
@@ -41,6 +51,7 @@ class AIQueryParser:
     def __init__(self):
         self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_model
+        self._parse_cache: TTLCache = TTLCache(maxsize=PARSE_CACHE_SIZE, ttl=PARSE_CACHE_TTL)
         
     @lru_cache(maxsize=100)
     def _get_system_prompt(self) -> str:
@@ -153,53 +164,71 @@ IMPORTANT RULES:
             Exception: If GPT API call fails after retries
         """
         try:
-            logger.info(f"Parsing query: {query}")
-            
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
-                    {"role": "user", "content": f"Parse this query into search filters: {query}"}
-                ],
-                functions=[self._get_function_schema()],
-                function_call={"name": "parse_search_query"},
-                max_tokens=settings.openai_max_tokens,
-                temperature=0.1  # Low temperature for consistent parsing
-            )
-            
-            # Extract function call arguments
-            function_call = response.choices[0].message.function_call
-            if not function_call or function_call.name != "parse_search_query":
-                raise ValueError("GPT did not return expected function call")
-            
-            # Parse the arguments
-            args = json.loads(function_call.arguments)
-            
-            # Convert to SearchFilters object
-            filters = SearchFilters(**args)
-            
-            logger.info(f"Parsed query into filters: {filters}")
-            return filters
-            
+            return await self._request_filters(query)
         except Exception as e:
             logger.error(f"Failed to parse query '{query}': {e}")
             # Fallback to keyword-only search
             return SearchFilters(keywords=[query.strip()])
 
+    async def _request_filters(self, query: str) -> SearchFilters:
+        """Ask GPT for the filters of a query, raising if the call or its output fails."""
+        logger.info(f"Parsing query: {query}")
+        
+        schema = self._get_function_schema()
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self._get_system_prompt()},
+                {"role": "user", "content": f"Parse this query into search filters: {query}"}
+            ],
+            # Structured output: the reply body is the filters JSON itself
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": schema["name"],
+                    "description": schema["description"],
+                    "schema": schema["parameters"]
+                }
+            },
+            max_tokens=settings.openai_max_tokens,
+            temperature=0.1  # Low temperature for consistent parsing
+        )
+        
+        content = response.choices[0].message.content
+        if not content:
+            raise ValueError("GPT did not return search filters")
+        
+        # Validate the JSON straight into SearchFilters
+        filters = SearchFilters.model_validate_json(content)
+        
+        logger.info(f"Parsed query into filters: {filters}")
+        return filters
+
     async def parse_query_with_cache(self, query: str, cache_key: Optional[str] = None) -> SearchFilters:
         """
         Parse query with optional caching.
         
         Args:
             query: Natural language query string
-            cache_key: Optional cache key (if None, uses query hash)
+            cache_key: Optional cache key (if None, uses the normalized query)
             
         Returns:
             SearchFilters object
         """
-        # TODO: Implement Redis caching here
-        # For now, just call parse_query directly
-        return await self.parse_query(query)
+        key = cache_key or normalize_query(query)
+        filters = self._parse_cache.get(key)
+        if filters is not None:
+            return filters
+        
+        try:
+            filters = await self._request_filters(query)
+        except Exception as e:
+            logger.error(f"Failed to parse query '{query}': {e}")
+            # Fallback to keyword-only search, left uncached so the next call retries GPT
+            return SearchFilters(keywords=[query.strip()])
+        
+        self._parse_cache[key] = filters
+        return filters
 
 
 # Global instance
@@ -5,19 +5,24 @@ Combines GPT query parsing with hybrid ranking (cosine similarity + full-text se
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from array import array
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from datetime import datetime
 
 import openai
+from cachetools import LRUCache
 from pydantic import BaseModel, Field
 
 from app.config import settings
 from app.services.database import db_service
-from app.services.ai_query_parser import ai_query_parser, SearchFilters
+from app.services.ai_query_parser import ai_query_parser, normalize_query, SearchFilters
 from app.utils.retry import retry_async
 
 logger = logging.getLogger(__name__)
 
+# Query embeddings kept per normalized query, stored as packed doubles (~12 KB each)
+EMBEDDING_CACHE_SIZE = 1024
+
 
 class AISearchResult(BaseModel):
     """AI search result with hybrid ranking and optional explanation."""
@@ -61,6 +66,7 @@ class AISearchService:
     def __init__(self):
         self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_model
+        self._embedding_cache: LRUCache = LRUCache(maxsize=EMBEDDING_CACHE_SIZE)
         
     async def search(
         self, 
@@ -85,10 +91,10 @@ class AISearchService:
         
         try:
             # Step 1: Parse query using GPT
-            filters = await ai_query_parser.parse_query(query)
+            filters = await ai_query_parser.parse_query_with_cache(query)
             
             # Step 2: Generate embedding for query
-            query_embedding = await self._generate_embedding(query)
+            query_embedding = await self._embed(query)
             
             # Step 3: Execute hybrid search using database function
             results = await self._execute_ai_search(filters, query_embedding, page, page_size)
@@ -115,6 +121,20 @@ class AISearchService:
             # Fallback to basic search
             return await self._fallback_search(query, page, page_size)
 
+    async def _embed(self, query: str) -> Sequence[float]:
+        """Embedding for a query, reused across queries that normalize the same."""
+        key = normalize_query(query)
+        embedding = self._embedding_cache.get(key)
+        if embedding is not None:
+            return embedding
+        
+        embedding = await self._generate_embedding(key)
+        # The zero vector is a failure fallback; don't pin it in the cache
+        if any(embedding):
+            embedding = array("d", embedding)
+            self._embedding_cache[key] = embedding
+        return embedding
+
     @retry_async(max_retries=2, base_delay=1, max_delay=15)
     async def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text using OpenAI."""
@@ -132,7 +152,7 @@ class AISearchService:
     async def _execute_ai_search(
         self, 
         filters: SearchFilters, 
-        query_embedding: List[float],
+        query_embedding: Sequence[float],
         page: int,
         page_size: int
     ) -> List[AISearchResult]:
@@ -201,10 +221,8 @@ class AISearchService:
             return []
 
     async def _get_total_count(self, filters: SearchFilters, query: str) -> int:
-        """Get total count of matching results."""
+        """Count the tenders the search can return, using the same predicate as search_tenders_ai."""
         try:
-            # For now, return a reasonable estimate based on the search results
-            # In a production system, you'd want a proper count function
             search_query = " ".join(filters.keywords) if filters.keywords else ""
             
             # Check if we have any tenders with province data
@@ -214,26 +232,19 @@ class AISearchService:
             # Only use province filter if we have province data
             province_filter = filters.provinces[0] if filters.provinces and has_province_data else None
             
-            # Use the same search function but with a larger limit to get count
-            embedding = [0.1] * 1536  # Dummy embedding for count
-            embedding_array = f"[{','.join(map(str, embedding))}]"
-            
             result = db_service.supabase.rpc(
-                'search_tenders_ai',
+                'count_tenders_ai',
                 {
                     'search_query': search_query,
-                    'query_embedding': embedding_array,
                     'province_filter': province_filter,
                     'min_value': filters.min_value,
                     'max_value': filters.max_value,
                     'deadline_before': filters.deadline_before,
-                    'deadline_after': filters.deadline_after,
-                    'limit_count': 1000,  # Large limit to get count
-                    'offset_count': 0
+                    'deadline_after': filters.deadline_after
                 }
             ).execute()
             
-            return len(result.data) if result.data else 0
+            return int(result.data or 0)
             
         except Exception as e:
             logger.error(f"Failed to get total count: {e}")
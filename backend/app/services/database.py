@@ -1,12 +1,15 @@
 from supabase import create_client, Client
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Columns read when mapping related tenders
+RELATED_TENDER_COLUMNS = "id,title,organization,buyer,source_name,source,closing_date,deadline,scraped_at,source_url"
+
 
 class DatabaseService:
     """Service for database operations using Supabase."""
@@ -30,7 +33,8 @@ class DatabaseService:
     ) -> Dict[str, Any]:
         """Get tenders with optional filtering and pagination."""
         try:
-            query = self.supabase.table("tenders").select("*")
+            # count=exact returns the filtered total with the page, saving a second round trip
+            query = self.supabase.table("tenders").select("*", count="exact")
             
             # Apply search filter (use organization column)
             if search:
@@ -60,8 +64,8 @@ class DatabaseService:
             # Apply pagination
             query = query.range(offset, offset + limit - 1)
             
-            # Execute query
-            response = query.execute()
+            # Execute query off the event loop
+            response = await asyncio.to_thread(query.execute)
             
             # Debug logging
             logger.info(f"Database query returned {len(response.data)} tenders")
@@ -101,18 +105,7 @@ class DatabaseService:
                 }
                 mapped_tenders.append(mapped_tender)
             
-            # Get total count for pagination
-            count_query = self.supabase.table("tenders").select("id", count="exact")
-            if search:
-                count_query = count_query.or_(f"title.ilike.%{search}%,organization.ilike.%{search}%")
-            if source:
-                count_query = count_query.or_(f"source_name.eq.{source},source.eq.{source}")
-            if province:
-                count_query = count_query.eq("province", province)
-            if category:
-                count_query = count_query.eq("category", category)
-            count_response = count_query.execute()
-            total_count = count_response.count or 0
+            total_count = response.count or 0
             
             return {
                 "tenders": mapped_tenders,
@@ -166,33 +159,20 @@ class DatabaseService:
             return None
     
     async def get_tender_statistics(self) -> Dict[str, Any]:
-        """Get tender statistics."""
+        """Get tender statistics from the tender_stats_mv materialized view."""
         try:
-            # Get total count
-            total_response = self.supabase.table("tenders").select("id", count="exact").execute()
-            total_tenders = total_response.count or 0
-            
-            # Get recent tenders (last 7 days) - use scraped_at
-            week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-            recent_response = self.supabase.table("tenders").select("id").gte("scraped_at", week_ago.isoformat()).execute()
-            recent_tenders = len(recent_response.data)
-            
-            # Get source counts - use source_name column
-            source_response = self.supabase.table("tenders").select("source_name").execute()
-            source_counts = {}
-            for tender in source_response.data:
-                source = tender.get("source_name", "Unknown")
-                source_counts[source] = source_counts.get(source, 0) + 1
-            
-            # Get last updated - use scraped_at
-            last_updated_response = self.supabase.table("tenders").select("scraped_at").order("scraped_at", desc=True).limit(1).execute()
-            last_updated = last_updated_response.data[0]["scraped_at"] if last_updated_response.data else None
+            response = await asyncio.to_thread(
+                self.supabase.table("tender_stats_mv").select("*").limit(1).execute
+            )
+            if not response.data:
+                raise ValueError("tender_stats_mv is empty")
+            stats = response.data[0]
             
             return {
-                "total_tenders": total_tenders,
-                "recent_tenders": recent_tenders,
-                "source_counts": source_counts,
-                "last_updated": last_updated
+                "total_tenders": stats["total_tenders"],
+                "recent_tenders": stats["recent_tenders"],
+                "source_counts": stats["source_counts"] or {},
+                "last_updated": stats["last_updated"]
             }
             
         except Exception as e:
@@ -320,33 +300,24 @@ class DatabaseService:
             return None
     
     async def get_tender_filters(self) -> Dict[str, Any]:
-        """Get available filter options for tenders."""
+        """Get available filter options from the tender_filters_mv materialized view."""
         try:
-            # Get unique sources
-            source_response = self.supabase.table("tenders").select("source_name").execute()
-            sources = list(set([tender.get("source_name") for tender in source_response.data if tender.get("source_name")]))
-            
-            # Get unique provinces
-            province_response = self.supabase.table("tenders").select("province").execute()
-            provinces = list(set([tender.get("province") for tender in province_response.data if tender.get("province")]))
-            
-            # Get unique categories
-            category_response = self.supabase.table("tenders").select("category").execute()
-            categories = list(set([tender.get("category") for tender in category_response.data if tender.get("category")]))
-            
-            # Get date range
-            date_response = self.supabase.table("tenders").select("scraped_at").order("scraped_at", desc=False).execute()
-            if date_response.data:
-                earliest = date_response.data[0].get("scraped_at")
-                latest = date_response.data[-1].get("scraped_at")
-                date_range = {"earliest": earliest, "latest": latest}
+            response = await asyncio.to_thread(
+                self.supabase.table("tender_filters_mv").select("*").limit(1).execute
+            )
+            if not response.data:
+                raise ValueError("tender_filters_mv is empty")
+            filters = response.data[0]
+            
+            if filters["earliest"] is not None:
+                date_range = {"earliest": filters["earliest"], "latest": filters["latest"]}
             else:
                 date_range = None
             
             return {
-                "sources": sources,
-                "provinces": provinces,
-                "categories": categories,
+                "sources": filters["sources"] or [],
+                "provinces": filters["provinces"] or [],
+                "categories": filters["categories"] or [],
                 "date_range": date_range
             }
         except Exception as e:
@@ -358,6 +329,11 @@ class DatabaseService:
                 "date_range": None
             }
     
+    async def refresh_tender_aggregates(self) -> None:
+        """Refresh the materialized views behind get_tender_statistics and get_tender_filters."""
+        await asyncio.to_thread(self.supabase.rpc("refresh_tender_aggregates").execute)
+        logger.info("Refreshed tender aggregate views")
+    
     async def get_search_suggestions(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get search suggestions based on tender titles and organizations."""
         try:
@@ -397,7 +373,7 @@ class DatabaseService:
         """Get related tenders based on organization, category, or similar criteria."""
         try:
             # Get the original tender
-            tender_response = self.supabase.table("tenders").select("*").eq("id", tender_id).execute()
+            tender_response = self.supabase.table("tenders").select("organization,category").eq("id", tender_id).execute()
             if not tender_response.data:
                 return []
             
@@ -409,12 +385,12 @@ class DatabaseService:
             related_tenders = []
             
             if organization:
-                org_response = self.supabase.table("tenders").select("*").eq("organization", organization).neq("id", tender_id).limit(limit).execute()
+                org_response = self.supabase.table("tenders").select(RELATED_TENDER_COLUMNS).eq("organization", organization).neq("id", tender_id).limit(limit).execute()
                 related_tenders.extend(org_response.data)
             
             # If we need more, add by category
             if len(related_tenders) < limit and category:
-                cat_response = self.supabase.table("tenders").select("*").eq("category", category).neq("id", tender_id).limit(limit - len(related_tenders)).execute()
+                cat_response = self.supabase.table("tenders").select(RELATED_TENDER_COLUMNS).eq("category", category).neq("id", tender_id).limit(limit - len(related_tenders)).execute()
                 related_tenders.extend(cat_response.data)
             
             # Map to frontend format
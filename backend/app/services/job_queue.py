@@ -2,7 +2,8 @@ import asyncio
 import uuid
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, Iterator, List, Optional, Any, Callable
+from itertools import islice
 from dataclasses import dataclass, asdict
 import logging
 from contextlib import asynccontextmanager
@@ -194,21 +195,20 @@ class JobQueue:
         """Get a job by ID."""
         return self._jobs.get(job_id)
     
+    def iter_jobs(self, status: Optional[JobStatus] = None) -> Iterator[Job]:
+        """Iterate jobs newest first, optionally filtered by status."""
+        # Jobs are inserted as they are created, so reverse insertion order is newest first
+        for job in reversed(self._jobs.values()):
+            if status is None or job.status == status:
+                yield job
+    
     def get_jobs(
         self, 
         status: Optional[JobStatus] = None,
         limit: int = 100
     ) -> List[Job]:
         """Get jobs with optional filtering."""
-        jobs = list(self._jobs.values())
-        
-        if status:
-            jobs = [job for job in jobs if job.status == status]
-        
-        # Sort by creation date (newest first)
-        jobs.sort(key=lambda x: x.created_at, reverse=True)
-        
-        return jobs[:limit]
+        return list(islice(self.iter_jobs(status), limit))
     
     def get_job_history(
         self, 
@@ -225,7 +225,12 @@ class JobQueue:
     
     def get_running_jobs(self) -> List[Job]:
         """Get all currently running jobs."""
-        return [job for job in self._jobs.values() if job.status == JobStatus.RUNNING]
+        return [self._jobs[job_id] for job_id in self._running_jobs]
+    
+    @property
+    def running_count(self) -> int:
+        """Number of running jobs, tracked as jobs start, finish or are cancelled."""
+        return len(self._running_jobs)
     
     def cleanup_old_jobs(self, max_age_hours: int = 24):
         """Clean up old completed/failed jobs."""
@@ -8,9 +8,14 @@ import sys
 
 from .scraper_service import scraper_service
 from .job_queue import job_queue
+from .database import db_service
+from .advanced_search_service import advanced_search_service
 
 logger = logging.getLogger(__name__)
 
+# How often the statistics/filter views and the suggestion index are refreshed
+AGGREGATE_REFRESH_HOURS = 1
+
 
 @dataclass
 class ScheduledTask:
@@ -251,6 +256,18 @@ class ScraperScheduler:
                     interval_hours=config.get('schedule_hours', 1)
                 )
         
+        # Keep /statistics and /filters views in step with scraped data
+        await self.scheduler.add_task(
+            name="refresh_tender_aggregates",
+            func=db_service.refresh_tender_aggregates,
+            interval_hours=AGGREGATE_REFRESH_HOURS
+        )
+        await self.scheduler.add_task(
+            name="refresh_suggestion_index",
+            func=advanced_search_service.refresh_suggestion_index,
+            interval_hours=AGGREGATE_REFRESH_HOURS
+        )
+        
         self._initialized = True
         logger.info("Scraper scheduler initialized")
     
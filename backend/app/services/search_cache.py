@@ -0,0 +1,74 @@
+"""
+AI Search Cache
+
+Redis-backed cache of serialized AI search responses, shared across workers.
+"""
+
+import hashlib
+import logging
+from typing import Optional
+
+from redis import asyncio as aioredis
+
+from app.config import settings
+from app.services.ai_query_parser import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# How long a cached AI search response stays valid
+AI_SEARCH_CACHE_TTL = 300
+
+
+def ai_search_cache_key(query: str, page: int, page_size: int, explain_results: bool) -> str:
+    """Cache key for one page of AI search results."""
+    raw = f"{normalize_query(query)}|{page}|{page_size}|{explain_results}"
+    return f"aisearch:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+class AISearchCache:
+    """Thin Redis wrapper that degrades to a no-op when Redis is unset or unavailable."""
+
+    def __init__(self):
+        self._redis: Optional[aioredis.Redis] = None
+
+    async def connect(self) -> None:
+        """Connect to Redis if a URL is configured."""
+        if not settings.redis_url:
+            logger.info("REDIS_URL not set; AI search cache disabled")
+            return
+        self._redis = aioredis.from_url(settings.redis_url)
+        logger.info("AI search cache connected to Redis")
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached JSON for key, or None on a miss or Redis error."""
+        if self._redis is None:
+            return None
+        try:
+            return await self._redis.get(key)
+        except Exception as e:
+            logger.warning(f"AI search cache read failed: {e}")
+            return None
+
+    async def set(self, key: str, value: str, ttl: int = AI_SEARCH_CACHE_TTL) -> None:
+        """Store JSON under key for ttl seconds, ignoring Redis errors."""
+        if self._redis is None:
+            return
+        try:
+            await self._redis.setex(key, ttl, value)
+        except Exception as e:
+            logger.warning(f"AI search cache write failed: {e}")
+
+
+# Global instance
+ai_search_cache = AISearchCache()
+
+
+def get_ai_search_cache() -> AISearchCache:
+    """FastAPI dependency returning the shared AI search cache."""
+    return ai_search_cache
@@ -2,7 +2,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 import logging
 
-from app.models.tender import Tender, TenderCreate, TenderUpdate, TenderStatistics, TendersResponse, TenderFilters
+from app.models.tender import TENDER_LIST_ADAPTER, Tender, TenderCreate, TenderUpdate, TenderStatistics, TendersResponse, TenderFilters
 from app.services.database import db_service
 from app.services.advanced_search_service import advanced_search_service
 
@@ -42,7 +42,7 @@ class TenderService:
                 )
                 
                 # Convert to Tender models
-                tenders = []
+                mapped_tenders = []
                 for tender_data in result["tenders"]:
                     # Map advanced search fields to Tender model
                     mapped_tender = {
@@ -78,7 +78,8 @@ class TenderService:
                         "rank": tender_data.get("rank"),
                         "highlight": tender_data.get("highlight"),
                     }
-                    tenders.append(Tender(**mapped_tender))
+                    mapped_tenders.append(mapped_tender)
+                tenders = TENDER_LIST_ADAPTER.validate_python(mapped_tenders)
                 
                 # Calculate if there are more results
                 has_more = (offset + limit) < result["total"]
@@ -121,7 +122,7 @@ class TenderService:
             )
             
             # Convert database fields to frontend model fields
-            tenders = []
+            mapped_tenders = []
             for tender_data in result["tenders"]:
                 mapped_tender = {
                     "id": tender_data.get("id"),
@@ -153,7 +154,8 @@ class TenderService:
                     "selection_criteria": tender_data.get("selection_criteria"),
                     "commodity_unspsc": tender_data.get("commodity_unspsc"),
                 }
-                tenders.append(Tender(**mapped_tender))
+                mapped_tenders.append(mapped_tender)
+            tenders = TENDER_LIST_ADAPTER.validate_python(mapped_tenders)
             
             # Calculate if there are more results
             has_more = (offset + limit) < result["total"]
@@ -0,0 +1,77 @@
+"""
+Circuit breaker for calls to slow or failing dependencies.
+"""
+
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    
+    After ``failure_threshold`` failures in a row the breaker opens and callers
+    should skip the protected call. Once ``reset_timeout`` seconds pass it goes
+    half-open: exactly one trial call is admitted and every other caller is
+    rejected until that trial records a success (closing the breaker) or a
+    failure (reopening it). A trial that never reports back is abandoned after
+    another ``reset_timeout`` so the breaker cannot stay half-open forever.
+    
+    Args:
+        name: Name used in log messages
+        failure_threshold: Consecutive failures that open the breaker
+        reset_timeout: Seconds to stay open before allowing a trial call
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failure_count = 0
+        self.opened_at: Optional[float] = None
+        self.trial_started_at: Optional[float] = None
+    
+    def allow_request(self) -> bool:
+        """Whether the caller may make the protected call; claims the trial when half-open."""
+        if self.state == CLOSED:
+            return True
+        
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+        elif now - self.trial_started_at < self.reset_timeout:
+            # Half-open with the trial still outstanding
+            return False
+        
+        self.trial_started_at = now
+        return True
+    
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self.state = CLOSED
+        self.failure_count = 0
+        self.opened_at = None
+        self.trial_started_at = None
+    
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold or when a trial fails."""
+        self.failure_count += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failure_count >= self.failure_threshold):
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.trial_started_at = None
+            logger.warning(
+                f"{self.name} circuit opened for {self.reset_timeout:.0f}s "
+                f"after {self.failure_count} consecutive failures"
+            )
@@ -0,0 +1,39 @@
+"""
+In-memory prefix index for search-as-you-type suggestions.
+"""
+
+import heapq
+from bisect import bisect_left
+from typing import Dict, List, Mapping, Tuple
+
+# Sorts after any character a word can contain, closing the prefix range
+_PREFIX_END = "\U0010ffff"
+
+
+class PrefixIndex:
+    """
+    Immutable word -> frequency index answering "most frequent words starting with a prefix".
+
+    Words are kept in one sorted list, so a prefix maps to a contiguous slice found
+    by two binary searches -- the flat-array form of walking a trie to the prefix
+    node -- and only that slice is ranked.
+
+    Args:
+        counts: Frequency of each (lowercased) word
+    """
+
+    def __init__(self, counts: Mapping[str, int]):
+        self._counts: Dict[str, int] = dict(counts)
+        self._words: List[str] = sorted(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Return up to limit (word, frequency) pairs for prefix, most frequent first, ties alphabetical."""
+        prefix = prefix.lower()
+        start = bisect_left(self._words, prefix)
+        end = bisect_left(self._words, prefix + _PREFIX_END, lo=start)
+        counts = self._counts
+        top = heapq.nsmallest(limit, self._words[start:end], key=lambda word: (-counts[word], word))
+        return [(word, counts[word]) for word in top]
@@ -15,9 +15,15 @@ import json
 import asyncio
 import argparse
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Iterator, Optional, Set
 from datetime import datetime, timezone
 import requests
+from requests.adapters import HTTPAdapter
+from tenacity import RetryCallState, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
@@ -36,6 +42,121 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Retry budget for Airtable calls rejected with 429/5xx
+RETRY_ATTEMPTS = 3
+RETRY_MAX_WAIT = 30
+_exponential_wait = wait_exponential(min=1, max=RETRY_MAX_WAIT)
+
+# Tasks created in parallel by create_airtable_tasks_async
+TASK_CREATION_CONCURRENCY = 8
+
+
+class RateLimitError(Exception):
+    """Airtable rejected a request with 429 or a 5xx and it may be retried."""
+    
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Airtable returned {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """Airtable calls are failing fast after repeated rate limiting."""
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header given as seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    """Exponential backoff that never retries sooner than the server asked."""
+    backoff = _exponential_wait(retry_state)
+    retry_after = getattr(retry_state.outcome.exception(), "retry_after", None)
+    if retry_after is None:
+        return backoff
+    return max(backoff, min(retry_after, RETRY_MAX_WAIT))
+
+
+class AIMDController:
+    """
+    Adaptive concurrency limit for outbound Airtable requests.
+    
+    The limit grows by one after each request that completes within the
+    latency target and is halved on every 429/5xx. After ``failure_threshold``
+    consecutive failures the circuit opens and calls fail fast for
+    ``cooldown`` seconds. Requests run on worker threads, so slots are guarded
+    by a threading condition rather than an asyncio semaphore.
+    """
+    
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 16,
+        latency_target: float = 1.0,
+        decrease_factor: float = 0.5,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0
+    ):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._inflight = 0
+        self._failures = 0
+        self._open_until = 0.0
+        self._cond = threading.Condition()
+    
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of the currently allowed concurrent request slots."""
+        with self._cond:
+            while True:
+                if time.monotonic() < self._open_until:
+                    raise CircuitOpenError("Airtable circuit is open")
+                if self._inflight < int(self.limit):
+                    break
+                self._cond.wait()
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._inflight -= 1
+                self._cond.notify_all()
+    
+    def record_success(self, latency: float) -> None:
+        """Additive increase while requests stay under the latency target."""
+        with self._cond:
+            self._failures = 0
+            if latency <= self.latency_target:
+                self.limit = min(float(self.maximum), self.limit + 1)
+                self._cond.notify_all()
+    
+    def record_failure(self) -> None:
+        """Multiplicative decrease, opening the circuit on a failure streak."""
+        with self._cond:
+            self.limit = max(float(self.minimum), self.limit * self.decrease_factor)
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.cooldown
+                self._failures = 0
+                logger.warning(f"Airtable circuit opened for {self.cooldown:.0f}s after repeated failures")
+
 
 class AirtableClient:
     """Client for interacting with Airtable API."""
@@ -52,6 +173,32 @@ class AirtableClient:
         }
         # Cache for portal name to record ID mapping
         self._portal_cache = {}
+        # Keep-alive session so repeated calls reuse pooled connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=15)
+        self.session.mount("https://", adapter)
+        self.limiter = AIMDController(maximum=15)
+    
+    @retry(
+        wait=_wait_retry_after,
+        stop=stop_after_attempt(RETRY_ATTEMPTS),
+        retry=retry_if_exception_type(RateLimitError),
+        reraise=True
+    )
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send one request through the AIMD limiter, raising RateLimitError on 429/5xx."""
+        with self.limiter.slot():
+            started = time.monotonic()
+            response = self.session.request(method, url, **kwargs)
+            if response.status_code == 429 or response.status_code >= 500:
+                self.limiter.record_failure()
+                raise RateLimitError(
+                    response.status_code,
+                    _parse_retry_after(response.headers.get("Retry-After"))
+                )
+            self.limiter.record_success(time.monotonic() - started)
+            return response
     
     def get_portal_record_id(self, portal_name: str, portal_field_name: str = "Portal Name") -> Optional[str]:
         """Get the record ID for a portal name from the Portals table."""
@@ -69,9 +216,9 @@ class AirtableClient:
             
             logger.info(f"Looking up Portal record for '{portal_name}' in field '{portal_field_name}'")
             
-            response = requests.get(
+            response = self._request(
+                "GET",
                 self.portals_url,
-                headers=self.headers,
                 params=params
             )
             
@@ -108,9 +255,9 @@ class AirtableClient:
             # Debug: Log the exact payload being sent
             logger.info(f"Full payload: {json.dumps(payload, indent=2)}")
             
-            response = requests.post(
+            response = self._request(
+                "POST",
                 self.base_url,
-                headers=self.headers,
                 data=json.dumps(payload)
             )
             
@@ -125,38 +272,40 @@ class AirtableClient:
             logger.error(f"Error creating Airtable task: {e}")
             return False
     
-    def get_existing_tasks(self) -> List[str]:
-        """Get list of existing opportunity IDs in Airtable to avoid duplicates."""
+    def fetch_existing_tasks(self) -> Set[str]:
+        """Get the set of existing opportunity IDs in Airtable, raising if the listing fails."""
+        # Get all records with just the OpportunityID field
+        params = {
+            "fields[]": ["OpportunityID"],
+            "maxRecords": 1000
+        }
+        
+        response = self._request(
+            "GET",
+            self.base_url,
+            params=params
+        )
+        
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to get existing tasks: {response.status_code}")
+        
+        data = response.json()
+        existing_ids = set()
+        for record in data.get("records", []):
+            opportunity_id = record.get("fields", {}).get("OpportunityID")
+            if opportunity_id:
+                existing_ids.add(opportunity_id)
+        
+        logger.info(f"Found {len(existing_ids)} existing tasks in Airtable")
+        return existing_ids
+    
+    def get_existing_tasks(self) -> Set[str]:
+        """Get the set of existing opportunity IDs in Airtable to avoid duplicates."""
         try:
-            # Get all records with just the OpportunityID field
-            params = {
-                "fields[]": ["OpportunityID"],
-                "maxRecords": 1000
-            }
-            
-            response = requests.get(
-                self.base_url,
-                headers=self.headers,
-                params=params
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                existing_ids = []
-                for record in data.get("records", []):
-                    opportunity_id = record.get("fields", {}).get("OpportunityID")
-                    if opportunity_id:
-                        existing_ids.append(opportunity_id)
-                
-                logger.info(f"Found {len(existing_ids)} existing tasks in Airtable")
-                return existing_ids
-            else:
-                logger.error(f"Failed to get existing tasks: {response.status_code}")
-                return []
-                
+            return self.fetch_existing_tasks()
         except Exception as e:
             logger.error(f"Error getting existing tasks: {e}")
-            return []
+            return set()
 
 
 class GapDetector:
@@ -244,101 +393,143 @@ class GapDetector:
     def create_airtable_tasks(
         self,
         incomplete_tenders: List[Dict[str, Any]],
-        existing_tasks: List[str]
+        existing_tasks: Set[str]
     ) -> int:
         """
         Create Airtable tasks for incomplete tenders.
         
         Args:
             incomplete_tenders: List of tender dictionaries
-            existing_tasks: List of existing opportunity IDs in Airtable
+            existing_tasks: Set of existing opportunity IDs in Airtable
             
         Returns:
             Number of tasks successfully created
         """
-        created_count = 0
+        return sum(
+            self._create_task_for_tender(tender, existing_tasks)
+            for tender in incomplete_tenders
+        )
+    
+    async def create_airtable_tasks_async(
+        self,
+        incomplete_tenders: List[Dict[str, Any]],
+        existing_tasks: Set[str],
+        max_concurrency: int = TASK_CREATION_CONCURRENCY
+    ) -> int:
+        """
+        Create Airtable tasks concurrently, at most ``max_concurrency`` at a time.
         
-        for tender in incomplete_tenders:
-            try:
-                opportunity_id = tender.get("external_id") or tender.get("id")  # Use tender ID if external_id is missing
-                if not opportunity_id:
-                    logger.warning(f"Skipping tender without external_id or id: {tender.get('title')}")
-                    continue
-                
-                # Skip if task already exists
-                if opportunity_id in existing_tasks:
-                    logger.info(f"Task already exists for {opportunity_id}, skipping")
-                    continue
-                
-                # Calculate missing fields if not provided by API
-                missing_fields = tender.get("missing_fields", [])
-                if not missing_fields:
-                    # Calculate missing fields directly
-                    contact_name = tender.get("contact_name")
-                    contact_email = tender.get("contact_email") 
-                    contact_phone = tender.get("contact_phone")
-                    
-                    has_contact = any([
-                        contact_name and str(contact_name).strip() and str(contact_name).strip() not in ['', '(000) 000-0000'],
-                        contact_email and str(contact_email).strip() and str(contact_email).strip() not in ['', 'N/A'],
-                        contact_phone and str(contact_phone).strip() and str(contact_phone).strip() not in ['', '(000) 000-0000', '101', '5161']
-                    ])
-                    
-                    # Use fallback logic for closing_date
-                    closing_date = tender.get("closing_date") or tender.get("deadline")
-                    has_closing_date = closing_date is not None and str(closing_date).strip() not in ['', 'null', 'None']
-                    
-                    documents_urls = tender.get("documents_urls")
-                    has_attachments = documents_urls is not None and len(documents_urls) > 0
-                    
-                    if not has_contact:
-                        missing_fields.append("Contact")
-                    if not has_closing_date:
-                        missing_fields.append("ClosingDate")
-                    if not has_attachments:
-                        missing_fields.append("Attachments")
-                
-                # Choose ONE of the following based on your Airtable field configuration:
-                # Option 1: Multiple Select field (send as array)
-                missing_fields_value = missing_fields  # Multiple Select needs array with correct options
-                # Option 2: Long Text field (send as string) - uncomment next line if needed
-                # missing_fields_value = ", ".join(missing_fields) if missing_fields else ""
-                
-                # Get Portal record ID from Portals table
-                portal_name = self.map_portal_from_source(tender.get("source_name", ""))
+        Each request still passes through the client's AIMD limiter, so the
+        effective concurrency backs off further when Airtable pushes back.
+        
+        Args:
+            incomplete_tenders: List of tender dictionaries
+            existing_tasks: Set of existing opportunity IDs in Airtable; the IDs of
+                tasks created here are added to it
+            max_concurrency: Upper bound on tasks created in parallel
+            
+        Returns:
+            Number of tasks successfully created
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def create_one(tender: Dict[str, Any]) -> bool:
+            async with semaphore:
+                return await asyncio.to_thread(self._create_task_for_tender, tender, existing_tasks)
+        
+        results = await asyncio.gather(
+            *(create_one(tender) for tender in incomplete_tenders),
+            return_exceptions=True
+        )
+        
+        # Record only the tasks that were actually created as existing
+        created = 0
+        for tender, result in zip(incomplete_tenders, results):
+            if result is True:
+                existing_tasks.add(tender.get("external_id") or tender.get("id"))
+                created += 1
+        return created
+    
+    def _create_task_for_tender(self, tender: Dict[str, Any], existing_tasks: Set[str]) -> bool:
+        """Create the Airtable task for one tender, returning whether it was created."""
+        try:
+            opportunity_id = tender.get("external_id") or tender.get("id")  # Use tender ID if external_id is missing
+            if not opportunity_id:
+                logger.warning(f"Skipping tender without external_id or id: {tender.get('title')}")
+                return False
+            
+            # Skip if task already exists
+            if opportunity_id in existing_tasks:
+                logger.info(f"Task already exists for {opportunity_id}, skipping")
+                return False
+            
+            # Calculate missing fields if not provided by API
+            missing_fields = tender.get("missing_fields", [])
+            if not missing_fields:
+                # Calculate missing fields directly
+                contact_name = tender.get("contact_name")
+                contact_email = tender.get("contact_email") 
+                contact_phone = tender.get("contact_phone")
                 
-                # Handle empty or unknown source names
-                if not portal_name or portal_name == "Unknown Source" or portal_name == "":
-                    portal_name = "CanadaBuys"  # Default portal
+                has_contact = any([
+                    contact_name and str(contact_name).strip() and str(contact_name).strip() not in ['', '(000) 000-0000'],
+                    contact_email and str(contact_email).strip() and str(contact_email).strip() not in ['', 'N/A'],
+                    contact_phone and str(contact_phone).strip() and str(contact_phone).strip() not in ['', '(000) 000-0000', '101', '5161']
+                ])
                 
-                # Use only PortalName field since that's what exists in Airtable
-                portal_record_id = self.airtable.get_portal_record_id(portal_name, "PortalName")
+                # Use fallback logic for closing_date
+                closing_date = tender.get("closing_date") or tender.get("deadline")
+                has_closing_date = closing_date is not None and str(closing_date).strip() not in ['', 'null', 'None']
                 
-                if not portal_record_id:
-                    logger.error(f"Could not find Portal record for '{portal_name}' in PortalName field, skipping task")
-                    continue
+                documents_urls = tender.get("documents_urls")
+                has_attachments = documents_urls is not None and len(documents_urls) > 0
                 
-                # Prepare Airtable task data
-                task_data = {
-                    "OpportunityID": opportunity_id,
-                    "SourceURL": tender.get("source_url", ""),
-                    "Portal": [portal_record_id],  # Send as array of record IDs for linked field
-                    "MissingFields": missing_fields_value,  # Format depends on Airtable field type
-                    "Status": "Unassigned"  # Single Select field
-                }
+                if not has_contact:
+                    missing_fields.append("Contact")
+                if not has_closing_date:
+                    missing_fields.append("ClosingDate")
+                if not has_attachments:
+                    missing_fields.append("Attachments")
+            
+            # Choose ONE of the following based on your Airtable field configuration:
+            # Option 1: Multiple Select field (send as array)
+            missing_fields_value = missing_fields  # Multiple Select needs array with correct options
+            # Option 2: Long Text field (send as string) - uncomment next line if needed
+            # missing_fields_value = ", ".join(missing_fields) if missing_fields else ""
+            
+            # Get Portal record ID from Portals table
+            portal_name = self.map_portal_from_source(tender.get("source_name", ""))
+            
+            # Handle empty or unknown source names
+            if not portal_name or portal_name == "Unknown Source" or portal_name == "":
+                portal_name = "CanadaBuys"  # Default portal
+            
+            # Use only PortalName field since that's what exists in Airtable
+            portal_record_id = self.airtable.get_portal_record_id(portal_name, "PortalName")
+            
+            if not portal_record_id:
+                logger.error(f"Could not find Portal record for '{portal_name}' in PortalName field, skipping task")
+                return False
+            
+            # Prepare Airtable task data
+            task_data = {
+                "OpportunityID": opportunity_id,
+                "SourceURL": tender.get("source_url", ""),
+                "Portal": [portal_record_id],  # Send as array of record IDs for linked field
+                "MissingFields": missing_fields_value,  # Format depends on Airtable field type
+                "Status": "Unassigned"  # Single Select field
+            }
+            
+            # Create the task
+            if self.airtable.create_task(task_data):
+                logger.info(f"Created task: {tender.get('title', 'Unknown')[:50]}...")
+                return True
+            logger.error(f"Failed to create task for {opportunity_id}")
+            return False
                 
-                # Create the task
-                if self.airtable.create_task(task_data):
-                    created_count += 1
-                    logger.info(f"Created task {created_count}: {tender.get('title', 'Unknown')[:50]}...")
-                else:
-                    logger.error(f"Failed to create task for {opportunity_id}")
-                    
-            except Exception as e:
-                logger.error(f"Error creating task for tender {tender.get('id')}: {e}")
-                continue
-        
-        return created_count
+        except Exception as e:
+            logger.error(f"Error creating task for tender {tender.get('id')}: {e}")
+            return False
     
     async def run_gap_detection(
         self,
@@ -360,7 +551,7 @@ class GapDetector:
         logger.info("Starting gap detection process")
         
         # Get existing tasks to avoid duplicates
-        existing_tasks = [] if dry_run else self.airtable.get_existing_tasks()
+        existing_tasks = set() if dry_run else self.airtable.get_existing_tasks()
         
         # Detect incomplete tenders
         incomplete_tenders = await self.detect_incomplete_tenders(
@@ -400,7 +591,7 @@ class GapDetector:
             }
         
         # Create Airtable tasks
-        tasks_created = self.create_airtable_tasks(new_tenders, existing_tasks)
+        tasks_created = await self.create_airtable_tasks_async(new_tenders, existing_tasks)
         
         logger.info(f"Gap detection completed: {tasks_created} tasks created")
         
@@ -0,0 +1,27 @@
+from app.services.ai_province_service import _rule_based_province
+
+
+def test_rule_based_province_single_province():
+    """Two references to one province resolve without GPT."""
+    assert _rule_based_province("Road resurfacing, Calgary, AB T2P 1J9") == ("AB", 2)
+
+
+def test_rule_based_province_needs_minimum_hits():
+    """A single reference is not enough to skip GPT."""
+    assert _rule_based_province("Snow clearing in Winnipeg") is None
+
+
+def test_rule_based_province_multiple_provinces():
+    """References to more than one province are left to GPT."""
+    assert _rule_based_province("Offices in Toronto and Vancouver, Ontario") is None
+
+
+def test_rule_based_province_shared_x_postal_code():
+    """X postal codes are shared by NT and NU and count for neither."""
+    assert _rule_based_province("Delivery to X1A 2P3, X0A 0H0") is None
+    assert _rule_based_province("Yellowknife depot, X1A 2P3") is None
+
+
+def test_rule_based_province_postal_code_hits():
+    """Postal codes count alongside place names."""
+    assert _rule_based_province("Site at V6B 4Y8, yard at V5K 0A1") == ("BC", 2)
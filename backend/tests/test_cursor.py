@@ -0,0 +1,52 @@
+import base64
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# The cursor helpers belong to the top-level API's app package, which this
+# suite's own app package shadows, so load the module from its file
+_CURSOR_PATH = Path(__file__).resolve().parents[2] / "app" / "core" / "cursor.py"
+_spec = importlib.util.spec_from_file_location("tender_cursor", _CURSOR_PATH)
+_cursor = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_cursor)
+
+encode_cursor = _cursor.encode_cursor
+decode_cursor = _cursor.decode_cursor
+
+CREATED_AT = "2025-03-01T12:30:45.123456+00:00"
+TENDER_ID = "0b6f6a5e-8f3c-4c7a-9a53-2f1f8d3c9e10"
+
+
+def _raw_cursor(text):
+    """Encode arbitrary text the way encode_cursor does."""
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes back to the row it was built from."""
+    assert decode_cursor(encode_cursor(CREATED_AT, TENDER_ID)) == (CREATED_AT, TENDER_ID)
+
+
+def test_cursor_normalizes_values():
+    """Test that decoded values are re-serialized, not passed through."""
+    created_at, tender_id = decode_cursor(encode_cursor("2025-03-01T12:30:45+00:00", TENDER_ID.upper()))
+    assert created_at == "2025-03-01T12:30:45+00:00"
+    assert tender_id == TENDER_ID
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    _raw_cursor("no-separator"),
+    _raw_cursor(f"|{TENDER_ID}"),
+    _raw_cursor(f"{CREATED_AT}|"),
+    _raw_cursor(f"yesterday|{TENDER_ID}"),
+    _raw_cursor(f"{CREATED_AT}|42"),
+    # Attempts to break out of the PostgREST or=(...) filter
+    _raw_cursor(f'{CREATED_AT}",id.gt.0)|{TENDER_ID}'),
+    _raw_cursor(f"{CREATED_AT}|{TENDER_ID}),or(id.not.is.null"),
+])
+def test_cursor_rejects_malformed_input(cursor):
+    """Test that malformed or crafted cursors raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
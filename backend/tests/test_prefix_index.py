@@ -0,0 +1,27 @@
+from app.utils.prefix_index import PrefixIndex
+
+
+def test_prefix_index_ranks_by_frequency_then_alphabetically():
+    """Completions are ordered by frequency, ties alphabetical."""
+    index = PrefixIndex({"road": 5, "roof": 9, "roadway": 5, "rock": 1})
+    assert index.complete("ro") == [("roof", 9), ("road", 5), ("roadway", 5), ("rock", 1)]
+
+
+def test_prefix_index_range_stops_at_prefix_end():
+    """Words sorting right after the prefix range are not included."""
+    index = PrefixIndex({"pav": 1, "pave": 2, "paving": 3, "pavz": 4, "paw": 10, "pb": 10})
+    assert index.complete("pav") == [("pavz", 4), ("paving", 3), ("pave", 2), ("pav", 1)]
+
+
+def test_prefix_index_range_includes_non_ascii_words():
+    """The end sentinel sorts after accented characters too."""
+    index = PrefixIndex({"montréal": 3, "montreal": 2, "moose": 1})
+    assert index.complete("mont") == [("montréal", 3), ("montreal", 2)]
+
+
+def test_prefix_index_limit_and_case():
+    """Prefixes are lowercased and results capped at limit."""
+    index = PrefixIndex({"bridge": 4, "brick": 3, "brush": 2})
+    assert index.complete("BR", limit=2) == [("bridge", 4), ("brick", 3)]
+    assert index.complete("zz") == []
+    assert len(index) == 3
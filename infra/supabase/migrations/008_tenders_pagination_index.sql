@@ -0,0 +1,4 @@
+-- Migration: Composite index for stable tender pagination
+-- Description: Supports ORDER BY created_at DESC, id DESC and keyset (cursor) pagination
+
+CREATE INDEX IF NOT EXISTS idx_tenders_created_at_id ON tenders(created_at DESC, id DESC);
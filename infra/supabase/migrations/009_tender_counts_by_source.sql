@@ -0,0 +1,12 @@
+-- Migration: Per-source tender counts
+-- Description: Single grouped query used by the scraper status endpoints
+
+CREATE OR REPLACE FUNCTION tender_counts_by_source()
+RETURNS TABLE (
+    source_name TEXT,
+    tender_count BIGINT
+) AS $$
+    SELECT t.source_name, count(*) AS tender_count
+    FROM tenders t
+    GROUP BY t.source_name;
+$$ LANGUAGE sql STABLE;
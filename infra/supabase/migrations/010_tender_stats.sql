@@ -0,0 +1,20 @@
+-- Migration: Tender statistics
+-- Description: Totals, recent count and per-source counts in one round trip
+
+CREATE OR REPLACE FUNCTION tender_stats(since TIMESTAMPTZ)
+RETURNS JSON AS $$
+    WITH source_counts AS (
+        SELECT source_name, count(*) AS cnt
+        FROM tenders
+        GROUP BY source_name
+    )
+    SELECT json_build_object(
+        'total_tenders', (SELECT count(*) FROM tenders),
+        'recent_tenders', (SELECT count(*) FROM tenders WHERE created_at >= since),
+        'source_counts', (
+            SELECT coalesce(jsonb_object_agg(coalesce(source_name, 'unknown'), cnt), '{}'::jsonb)
+            FROM source_counts
+        ),
+        'last_updated', now()
+    );
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,5 @@
+-- Migration: Per-source recency index
+-- Description: Covering index so per-source counts and created_at range filters in tender_stats can run index-only
+-- (idx_tenders_source_name from 002 and idx_tenders_created_at_id from 008 already cover the single-column cases)
+
+CREATE INDEX IF NOT EXISTS idx_tenders_source_created ON tenders(source_name, created_at DESC) INCLUDE (id);
@@ -0,0 +1,91 @@
+-- Migration: Award search and similarity
+-- Description: Full-text and vector indexes for awards plus RPCs that push filtering, ranking and pagination into Postgres
+
+-- Full-text index over award title and description
+CREATE INDEX IF NOT EXISTS idx_awards_fts ON awards
+    USING gin(to_tsvector('english', title || ' ' || coalesce(description, '')));
+
+-- HNSW index so nearest-award lookups are an index scan; it replaces the
+-- unnamed IVFFlat index 001 created on the same column
+DROP INDEX IF EXISTS award_embeddings_embedding_idx;
+
+CREATE INDEX IF NOT EXISTS idx_award_embeddings_hnsw ON award_embeddings
+    USING hnsw (embedding vector_cosine_ops);
+
+-- Awards closest to a tender's embedding
+CREATE OR REPLACE FUNCTION awards_similar(p_tender_id UUID, k INTEGER DEFAULT 5)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    vendor TEXT,
+    value DECIMAL(15,2),
+    award_date DATE,
+    score DOUBLE PRECISION
+) AS $$
+DECLARE
+    emb VECTOR(1536);
+BEGIN
+    SELECT te.embedding INTO emb
+    FROM tender_embeddings te
+    WHERE te.tender_id = p_tender_id;
+
+    IF emb IS NULL THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        a.id,
+        a.title,
+        a.vendor,
+        a.value,
+        a.award_date,
+        1 - (ae.embedding <=> emb) AS score
+    FROM award_embeddings ae
+    JOIN awards a ON a.id = ae.award_id
+    ORDER BY ae.embedding <=> emb
+    LIMIT k;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Ranked full-text award search with filters and the total match count
+CREATE OR REPLACE FUNCTION search_awards(
+    search_query TEXT,
+    vendor_filter TEXT DEFAULT NULL,
+    min_value DECIMAL DEFAULT NULL,
+    max_value DECIMAL DEFAULT NULL,
+    limit_count INTEGER DEFAULT 20,
+    offset_count INTEGER DEFAULT 0
+)
+RETURNS TABLE (
+    id UUID,
+    source TEXT,
+    external_id TEXT,
+    title TEXT,
+    vendor TEXT,
+    value DECIMAL(15,2),
+    award_date DATE,
+    description TEXT,
+    rank REAL,
+    total_count BIGINT
+) AS $$
+    SELECT
+        a.id,
+        a.source,
+        a.external_id,
+        a.title,
+        a.vendor,
+        a.value,
+        a.award_date,
+        a.description,
+        ts_rank(to_tsvector('english', a.title || ' ' || coalesce(a.description, '')), q) AS rank,
+        count(*) OVER () AS total_count
+    FROM awards a, websearch_to_tsquery('english', search_query) q
+    WHERE to_tsvector('english', a.title || ' ' || coalesce(a.description, '')) @@ q
+      AND (vendor_filter IS NULL OR a.vendor ILIKE '%' || vendor_filter || '%')
+      AND (search_awards.min_value IS NULL OR a.value >= search_awards.min_value)
+      AND (search_awards.max_value IS NULL OR a.value <= search_awards.max_value)
+    ORDER BY rank DESC, a.award_date DESC NULLS LAST
+    LIMIT limit_count
+    OFFSET offset_count;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,4 @@
+-- Migration: Natural key for scraped tenders
+-- Description: Unique (source_name, external_id) so bulk saves can upsert with ON CONFLICT
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tenders_source_external_unique ON tenders(source_name, external_id);
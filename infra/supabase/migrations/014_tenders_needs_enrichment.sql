@@ -0,0 +1,18 @@
+-- Migration: Stored needs_enrichment flag
+-- Description: Compute needs_enrichment once per write (no usable contact, no closing date, or no attachments;
+-- placeholder contact values count as missing) so enrichment counts and listings hit a partial index
+
+ALTER TABLE tenders ADD COLUMN IF NOT EXISTS needs_enrichment BOOLEAN GENERATED ALWAYS AS (
+    (
+        COALESCE(btrim(contact_name), '') IN ('', '(000) 000-0000')
+        AND COALESCE(btrim(contact_email), '') IN ('', 'N/A')
+        AND COALESCE(btrim(contact_phone), '') IN ('', '(000) 000-0000', '101', '5161')
+    )
+    OR (closing_date IS NULL AND deadline IS NULL)
+    OR COALESCE(cardinality(documents_urls), 0) = 0
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_tenders_needs_enrichment ON tenders(id)
+WHERE needs_enrichment AND NOT enriched;
+
+COMMENT ON COLUMN tenders.needs_enrichment IS 'Missing contact info, closing date or attachments; mirrors needs_enrichment() in the enrichment API';
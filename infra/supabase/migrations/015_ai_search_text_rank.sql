@@ -0,0 +1,98 @@
+-- Migration: Normalized text rank for AI search
+-- Description: Rank the full-text half of search_tenders_ai with length-normalized, saturating ts_rank
+-- (flags 1 | 32: divide by 1 + log(document length), then rank / (rank + 1)) instead of raw ts_rank, and
+-- build the tsquery and each score term once per row. pg_textsearch/BM25 isn't available on Supabase, so
+-- this is the closest BM25-shaped ranking stock Postgres offers: TF saturation plus document-length normalization.
+
+CREATE OR REPLACE FUNCTION search_tenders_ai(
+    search_query TEXT,
+    query_embedding VECTOR(1536),
+    province_filter TEXT DEFAULT NULL,
+    min_value DECIMAL DEFAULT NULL,
+    max_value DECIMAL DEFAULT NULL,
+    deadline_before DATE DEFAULT NULL,
+    deadline_after DATE DEFAULT NULL,
+    limit_count INTEGER DEFAULT 20,
+    offset_count INTEGER DEFAULT 0
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    summary_raw TEXT,
+    buyer TEXT,
+    category TEXT,
+    external_id TEXT,
+    naics TEXT,
+    province TEXT,
+    value DECIMAL,
+    deadline DATE,
+    url TEXT,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    score DOUBLE PRECISION,
+    cosine_similarity DOUBLE PRECISION,
+    text_rank DOUBLE PRECISION,
+    province_bonus DOUBLE PRECISION
+) AS $$
+#variable_conflict use_column
+DECLARE
+    ts_query tsquery := plainto_tsquery('english', search_query);
+BEGIN
+    RETURN QUERY
+    SELECT
+        r.id,
+        r.title,
+        r.summary_raw,
+        r.buyer,
+        r.category,
+        r.external_id,
+        r.naics,
+        r.province,
+        r.value,
+        r.deadline,
+        r.url,
+        r.created_at,
+        r.updated_at,
+        -- Hybrid score: 60% vector similarity + 30% text rank + 10% province bonus
+        (0.6 * r.cosine_similarity + 0.3 * r.text_rank + 0.1 * r.province_bonus) AS score,
+        r.cosine_similarity,
+        r.text_rank,
+        r.province_bonus
+    FROM (
+        SELECT
+            t.id,
+            t.title,
+            t.summary_raw,
+            t.buyer,
+            t.category,
+            t.external_id,
+            t.naics,
+            t.province,
+            t.value,
+            t.deadline,
+            t.url,
+            t.created_at,
+            t.updated_at,
+            COALESCE(1 - (te.embedding <=> query_embedding), 0)::DOUBLE PRECISION AS cosine_similarity,
+            COALESCE(ts_rank(t.search_vector, ts_query, 1 | 32), 0)::DOUBLE PRECISION AS text_rank,
+            (CASE
+                WHEN t.province ILIKE '%' || COALESCE(province_filter, '') || '%' THEN 1.0
+                ELSE 0.0
+            END)::DOUBLE PRECISION AS province_bonus
+        FROM tenders t
+        LEFT JOIN tender_embeddings te ON t.id = te.tender_id
+        WHERE
+            -- Basic filters
+            (province_filter IS NULL OR t.province ILIKE '%' || province_filter || '%')
+            AND (min_value IS NULL OR t.value >= min_value)
+            AND (max_value IS NULL OR t.value <= max_value)
+            AND (deadline_before IS NULL OR t.deadline <= deadline_before)
+            AND (deadline_after IS NULL OR t.deadline >= deadline_after)
+            -- Text search
+            AND (search_query = '' OR t.search_vector @@ ts_query)
+    ) r
+    ORDER BY score DESC
+    LIMIT limit_count
+    OFFSET offset_count;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,199 @@
+-- Migration: HNSW index for tender embeddings
+-- Description: Replace the IVFFlat cosine indexes on tender_embeddings with pgvector HNSW (m = 16, ef_construction = 64),
+-- which needs no training lists and keeps recall as embeddings are added. When search_tenders_ai has no query
+-- text and no filters, its candidates come from an ORDER BY embedding <=> query_embedding LIMIT n scan (the shape
+-- HNSW serves) and are re-ranked by the hybrid score. Keyword or filtered searches, and pages beyond the
+-- largest candidate set, scan every matching tender instead, so a candidate cut can never hide a match.
+-- count_tenders_ai counts with the same predicate for the response total. Only tenders with an embedding are
+-- searched (without one they scored at most 0.4 and ranked last anyway).
+
+-- Both IVFFlat indexes: 006's named one and the unnamed one 001 created
+DROP INDEX IF EXISTS idx_tender_embeddings_embedding;
+DROP INDEX IF EXISTS tender_embeddings_embedding_idx;
+
+CREATE INDEX IF NOT EXISTS idx_tender_embeddings_embedding_hnsw ON tender_embeddings
+USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+
+CREATE OR REPLACE FUNCTION search_tenders_ai(
+    search_query TEXT,
+    query_embedding VECTOR(1536),
+    province_filter TEXT DEFAULT NULL,
+    min_value DECIMAL DEFAULT NULL,
+    max_value DECIMAL DEFAULT NULL,
+    deadline_before DATE DEFAULT NULL,
+    deadline_after DATE DEFAULT NULL,
+    limit_count INTEGER DEFAULT 20,
+    offset_count INTEGER DEFAULT 0
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    summary_raw TEXT,
+    buyer TEXT,
+    category TEXT,
+    external_id TEXT,
+    naics TEXT,
+    province TEXT,
+    value DECIMAL,
+    deadline DATE,
+    url TEXT,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    score DOUBLE PRECISION,
+    cosine_similarity DOUBLE PRECISION,
+    text_rank DOUBLE PRECISION,
+    province_bonus DOUBLE PRECISION
+) AS $$
+#variable_conflict use_column
+DECLARE
+    ts_query tsquery := plainto_tsquery('english', search_query);
+    -- An HNSW scan returns at most ef_search rows (pgvector caps it at 1000), so the two move together
+    candidate_limit INTEGER := GREATEST(200, limit_count + offset_count);
+BEGIN
+    IF search_query = '' AND province_filter IS NULL AND min_value IS NULL AND max_value IS NULL
+        AND deadline_before IS NULL AND deadline_after IS NULL AND candidate_limit <= 1000 THEN
+        -- Pure similarity search: re-rank the nearest neighbours from the index.
+        -- Local to this call: the function's SET clause restores the setting on exit.
+        PERFORM set_config('hnsw.ef_search', candidate_limit::TEXT, true);
+
+        RETURN QUERY
+        WITH candidates AS (
+            SELECT te.tender_id, te.embedding <=> query_embedding AS distance
+            FROM tender_embeddings te
+            ORDER BY te.embedding <=> query_embedding
+            LIMIT candidate_limit
+        )
+        SELECT
+            r.id,
+            r.title,
+            r.summary_raw,
+            r.buyer,
+            r.category,
+            r.external_id,
+            r.naics,
+            r.province,
+            r.value,
+            r.deadline,
+            r.url,
+            r.created_at,
+            r.updated_at,
+            -- Hybrid score: 60% vector similarity + 30% text rank + 10% province bonus
+            (0.6 * r.cosine_similarity + 0.3 * r.text_rank + 0.1 * r.province_bonus) AS score,
+            r.cosine_similarity,
+            r.text_rank,
+            r.province_bonus
+        FROM (
+            SELECT
+                t.id,
+                t.title,
+                t.summary_raw,
+                t.buyer,
+                t.category,
+                t.external_id,
+                t.naics,
+                t.province,
+                t.value,
+                t.deadline,
+                t.url,
+                t.created_at,
+                t.updated_at,
+                (1 - c.distance)::DOUBLE PRECISION AS cosine_similarity,
+                COALESCE(ts_rank(t.search_vector, ts_query, 1 | 32), 0)::DOUBLE PRECISION AS text_rank,
+                (CASE
+                    WHEN t.province ILIKE '%' || COALESCE(province_filter, '') || '%' THEN 1.0
+                    ELSE 0.0
+                END)::DOUBLE PRECISION AS province_bonus
+            FROM candidates c
+            JOIN tenders t ON t.id = c.tender_id
+        ) r
+        ORDER BY score DESC
+        LIMIT limit_count
+        OFFSET offset_count;
+        RETURN;
+    END IF;
+
+    -- Keyword or filtered search: score every matching tender so none is cut off
+    RETURN QUERY
+    SELECT
+        r.id,
+        r.title,
+        r.summary_raw,
+        r.buyer,
+        r.category,
+        r.external_id,
+        r.naics,
+        r.province,
+        r.value,
+        r.deadline,
+        r.url,
+        r.created_at,
+        r.updated_at,
+        -- Hybrid score: 60% vector similarity + 30% text rank + 10% province bonus
+        (0.6 * r.cosine_similarity + 0.3 * r.text_rank + 0.1 * r.province_bonus) AS score,
+        r.cosine_similarity,
+        r.text_rank,
+        r.province_bonus
+    FROM (
+        SELECT
+            t.id,
+            t.title,
+            t.summary_raw,
+            t.buyer,
+            t.category,
+            t.external_id,
+            t.naics,
+            t.province,
+            t.value,
+            t.deadline,
+            t.url,
+            t.created_at,
+            t.updated_at,
+            (1 - (te.embedding <=> query_embedding))::DOUBLE PRECISION AS cosine_similarity,
+            COALESCE(ts_rank(t.search_vector, ts_query, 1 | 32), 0)::DOUBLE PRECISION AS text_rank,
+            (CASE
+                WHEN t.province ILIKE '%' || COALESCE(province_filter, '') || '%' THEN 1.0
+                ELSE 0.0
+            END)::DOUBLE PRECISION AS province_bonus
+        FROM tenders t
+        JOIN tender_embeddings te ON t.id = te.tender_id
+        WHERE
+            -- Basic filters
+            (province_filter IS NULL OR t.province ILIKE '%' || province_filter || '%')
+            AND (min_value IS NULL OR t.value >= min_value)
+            AND (max_value IS NULL OR t.value <= max_value)
+            AND (deadline_before IS NULL OR t.deadline <= deadline_before)
+            AND (deadline_after IS NULL OR t.deadline >= deadline_after)
+            -- Text search
+            AND (search_query = '' OR t.search_vector @@ ts_query)
+    ) r
+    ORDER BY score DESC
+    LIMIT limit_count
+    OFFSET offset_count;
+END;
+$$ LANGUAGE plpgsql
+SET hnsw.ef_search = 200;
+
+-- Number of tenders search_tenders_ai can return for the same text and filters
+CREATE OR REPLACE FUNCTION count_tenders_ai(
+    search_query TEXT,
+    province_filter TEXT DEFAULT NULL,
+    min_value DECIMAL DEFAULT NULL,
+    max_value DECIMAL DEFAULT NULL,
+    deadline_before DATE DEFAULT NULL,
+    deadline_after DATE DEFAULT NULL
+)
+RETURNS BIGINT AS $$
+    SELECT count(*)
+    FROM tenders t
+    JOIN tender_embeddings te ON t.id = te.tender_id,
+        plainto_tsquery('english', search_query) ts_query
+    WHERE
+        -- Basic filters
+        (province_filter IS NULL OR t.province ILIKE '%' || province_filter || '%')
+        AND (count_tenders_ai.min_value IS NULL OR t.value >= count_tenders_ai.min_value)
+        AND (count_tenders_ai.max_value IS NULL OR t.value <= count_tenders_ai.max_value)
+        AND (deadline_before IS NULL OR t.deadline <= deadline_before)
+        AND (deadline_after IS NULL OR t.deadline >= deadline_after)
+        -- Text search
+        AND (search_query = '' OR t.search_vector @@ ts_query);
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,43 @@
+-- Migration: Materialized tender statistics and filter options
+-- Description: Precompute the /statistics and /filters aggregates so each request reads a single row;
+-- refresh_tender_aggregates() is called by the scraper scheduler to bring them up to date
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS tender_stats_mv AS
+SELECT
+    1 AS id,
+    count(*) AS total_tenders,
+    -- "Recent" is relative to the last refresh
+    count(*) FILTER (WHERE scraped_at >= now() - INTERVAL '7 days') AS recent_tenders,
+    (
+        SELECT coalesce(jsonb_object_agg(s.source_name, s.cnt), '{}'::jsonb)
+        FROM (
+            SELECT coalesce(source_name, 'Unknown') AS source_name, count(*) AS cnt
+            FROM tenders
+            GROUP BY 1
+        ) s
+    ) AS source_counts,
+    max(scraped_at) AS last_updated
+FROM tenders;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tender_stats_mv_id ON tender_stats_mv(id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS tender_filters_mv AS
+SELECT
+    1 AS id,
+    coalesce(array_agg(DISTINCT source_name) FILTER (WHERE source_name <> ''), '{}') AS sources,
+    coalesce(array_agg(DISTINCT province) FILTER (WHERE province <> ''), '{}') AS provinces,
+    coalesce(array_agg(DISTINCT category) FILTER (WHERE category <> ''), '{}') AS categories,
+    min(scraped_at) AS earliest,
+    max(scraped_at) AS latest
+FROM tenders;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tender_filters_mv_id ON tender_filters_mv(id);
+
+-- CONCURRENTLY keeps the views readable during refresh (needs the unique indexes above)
+CREATE OR REPLACE FUNCTION refresh_tender_aggregates()
+RETURNS VOID AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY tender_stats_mv;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY tender_filters_mv;
+END;
+$$ LANGUAGE plpgsql;
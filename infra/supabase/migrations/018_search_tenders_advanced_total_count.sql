@@ -0,0 +1,74 @@
+-- Migration: Total count from search_tenders_advanced
+-- Description: Return the full match count on every row (COUNT(*) OVER (), taken before LIMIT/OFFSET)
+-- so one RPC yields both the page and the pagination total
+
+-- The return type changes, so the function has to be dropped first
+DROP FUNCTION IF EXISTS search_tenders_advanced(TEXT, TEXT, TEXT, TEXT, INTEGER, INTEGER);
+
+CREATE OR REPLACE FUNCTION search_tenders_advanced(
+    search_query TEXT,
+    buyer_filter TEXT DEFAULT NULL,
+    province_filter TEXT DEFAULT NULL,
+    naics_filter TEXT DEFAULT NULL,
+    limit_count INTEGER DEFAULT 50,
+    offset_count INTEGER DEFAULT 0
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    organization TEXT,
+    description TEXT,
+    summary_raw TEXT,
+    category TEXT,
+    reference TEXT,
+    naics TEXT,
+    province TEXT,
+    closing_date DATE,
+    contract_value TEXT,
+    source_name TEXT,
+    contact_name TEXT,
+    contact_email TEXT,
+    contact_phone TEXT,
+    documents_urls TEXT[],
+    original_url TEXT,
+    rank DOUBLE PRECISION,
+    highlight TEXT,
+    total_count BIGINT
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        t.id,
+        t.title,
+        t.organization,
+        t.description,
+        t.summary_raw,
+        t.category,
+        t.reference,
+        t.naics,
+        t.province,
+        t.closing_date,
+        t.contract_value,
+        t.source_name,
+        t.contact_name,
+        t.contact_email,
+        t.contact_phone,
+        t.documents_urls,
+        t.original_url,
+        ts_rank(t.search_vector, to_tsquery('english', search_query))::DOUBLE PRECISION AS rank,
+        ts_headline('english', 
+                   COALESCE(t.summary_raw, t.description, ''), 
+                   to_tsquery('english', search_query),
+                   'MaxFragments=2, MinWords=5, MaxWords=15, StartSel=<mark>, StopSel=</mark>') AS highlight,
+        COUNT(*) OVER () AS total_count
+    FROM tenders t
+    WHERE t.search_vector @@ to_tsquery('english', search_query)
+      AND (buyer_filter IS NULL OR t.organization ILIKE '%' || buyer_filter || '%')
+      AND (province_filter IS NULL OR t.province = province_filter)
+      AND (naics_filter IS NULL OR t.naics = naics_filter)
+    ORDER BY rank DESC
+    LIMIT limit_count OFFSET offset_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION search_tenders_advanced IS 'Advanced search function with boolean operators, highlighting, field filtering and total match count';
@@ -0,0 +1,127 @@
+-- Migration: Field filters and sorting inside search_tenders_advanced
+-- Description: Apply multi-value field filters (buyer:a,b style, case-insensitive substring match) and the
+-- requested sort before LIMIT/OFFSET, so pages and total_count are correct and no post-filtering happens in the API
+
+DROP FUNCTION IF EXISTS search_tenders_advanced(TEXT, TEXT, TEXT, TEXT, INTEGER, INTEGER);
+
+CREATE OR REPLACE FUNCTION search_tenders_advanced(
+    search_query TEXT,
+    buyer_filter TEXT DEFAULT NULL,
+    province_filter TEXT DEFAULT NULL,
+    naics_filter TEXT DEFAULT NULL,
+    limit_count INTEGER DEFAULT 50,
+    offset_count INTEGER DEFAULT 0,
+    field_filters JSONB DEFAULT NULL,
+    sort_by TEXT DEFAULT 'rank',
+    sort_order TEXT DEFAULT 'desc'
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    organization TEXT,
+    description TEXT,
+    summary_raw TEXT,
+    category TEXT,
+    reference TEXT,
+    naics TEXT,
+    province TEXT,
+    closing_date DATE,
+    contract_value TEXT,
+    source_name TEXT,
+    contact_name TEXT,
+    contact_email TEXT,
+    contact_phone TEXT,
+    documents_urls TEXT[],
+    original_url TEXT,
+    rank DOUBLE PRECISION,
+    highlight TEXT,
+    total_count BIGINT
+) AS $$
+#variable_conflict use_column
+DECLARE
+    ts_query tsquery := to_tsquery('english', search_query);
+    -- created_at is reported as closing_date by the API, so both sort the same way
+    sort_key TEXT := CASE WHEN sort_by = 'created_at' THEN 'closing_date' ELSE sort_by END;
+    sort_desc BOOLEAN := lower(sort_order) = 'desc';
+BEGIN
+    RETURN QUERY
+    SELECT
+        r.id,
+        r.title,
+        r.organization,
+        r.description,
+        r.summary_raw,
+        r.category,
+        r.reference,
+        r.naics,
+        r.province,
+        r.closing_date,
+        r.contract_value,
+        r.source_name,
+        r.contact_name,
+        r.contact_email,
+        r.contact_phone,
+        r.documents_urls,
+        r.original_url,
+        r.rank,
+        -- Highlight only the rows on the returned page
+        ts_headline('english', 
+                   COALESCE(r.summary_raw, r.description, ''), 
+                   ts_query,
+                   'MaxFragments=2, MinWords=5, MaxWords=15, StartSel=<mark>, StopSel=</mark>') AS highlight,
+        r.total_count
+    FROM (
+        SELECT 
+            t.id,
+            t.title,
+            t.organization,
+            t.description,
+            t.summary_raw,
+            t.category,
+            t.reference,
+            t.naics,
+            t.province,
+            t.closing_date,
+            t.contract_value,
+            t.source_name,
+            t.contact_name,
+            t.contact_email,
+            t.contact_phone,
+            t.documents_urls,
+            t.original_url,
+            ts_rank(t.search_vector, ts_query)::DOUBLE PRECISION AS rank,
+            COUNT(*) OVER () AS total_count
+        FROM tenders t
+        WHERE t.search_vector @@ ts_query
+          AND (buyer_filter IS NULL OR t.organization ILIKE '%' || buyer_filter || '%')
+          AND (province_filter IS NULL OR t.province = province_filter)
+          AND (naics_filter IS NULL OR t.naics = naics_filter)
+          AND (field_filters->'organization' IS NULL OR t.organization ILIKE ANY (
+              ARRAY(SELECT '%' || v || '%' FROM jsonb_array_elements_text(field_filters->'organization') v)))
+          AND (field_filters->'province' IS NULL OR t.province ILIKE ANY (
+              ARRAY(SELECT '%' || v || '%' FROM jsonb_array_elements_text(field_filters->'province') v)))
+          AND (field_filters->'naics' IS NULL OR t.naics ILIKE ANY (
+              ARRAY(SELECT '%' || v || '%' FROM jsonb_array_elements_text(field_filters->'naics') v)))
+          AND (field_filters->'category' IS NULL OR t.category ILIKE ANY (
+              ARRAY(SELECT '%' || v || '%' FROM jsonb_array_elements_text(field_filters->'category') v)))
+          AND (field_filters->'source_name' IS NULL OR t.source_name ILIKE ANY (
+              ARRAY(SELECT '%' || v || '%' FROM jsonb_array_elements_text(field_filters->'source_name') v)))
+          AND (field_filters->'reference' IS NULL OR t.reference ILIKE ANY (
+              ARRAY(SELECT '%' || v || '%' FROM jsonb_array_elements_text(field_filters->'reference') v)))
+          AND (field_filters->'contract_value' IS NULL OR t.contract_value ILIKE ANY (
+              ARRAY(SELECT '%' || v || '%' FROM jsonb_array_elements_text(field_filters->'contract_value') v)))
+    ) r
+    ORDER BY
+        CASE WHEN sort_key = 'closing_date' AND NOT sort_desc THEN r.closing_date END ASC NULLS FIRST,
+        CASE WHEN sort_key = 'closing_date' AND sort_desc THEN r.closing_date END DESC NULLS LAST,
+        CASE WHEN sort_key = 'title' AND NOT sort_desc THEN lower(COALESCE(r.title, '')) END ASC,
+        CASE WHEN sort_key = 'title' AND sort_desc THEN lower(COALESCE(r.title, '')) END DESC,
+        CASE WHEN sort_key = 'organization' AND NOT sort_desc THEN lower(COALESCE(r.organization, '')) END ASC,
+        CASE WHEN sort_key = 'organization' AND sort_desc THEN lower(COALESCE(r.organization, '')) END DESC,
+        -- Relevance is the default order and the tie-breaker for the others
+        r.rank DESC
+    LIMIT limit_count OFFSET offset_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION search_tenders_advanced IS 'Advanced search function with boolean operators, highlighting, field filtering, sorting and total match count';
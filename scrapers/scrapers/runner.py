@@ -1,5 +1,7 @@
 import asyncio
 import argparse
+import json
+import time
 from typing import List, Dict
 
 from loguru import logger
@@ -81,6 +83,11 @@ async def main():
         default=True,
         help="Run browser in headless mode"
     )
+    parser.add_argument(
+        "--result-json",
+        default=None,
+        help="Write the run summary as JSON to this path"
+    )
     
     args = parser.parse_args()
     
@@ -93,14 +100,22 @@ async def main():
     )
     
     runner = ScraperRunner()
+    started = time.monotonic()
     
     if args.scraper == "all":
         results = await runner.run_all_scrapers(limit=args.limit)
         for scraper, count in results.items():
             print(f"{scraper}: {count} tenders")
+        summary = {"tender_count": sum(results.values()), "results": results}
     else:
         count = await runner.run_scraper(args.scraper, limit=args.limit)
         print(f"{args.scraper}: {count} tenders")
+        summary = {"tender_count": count}
+    
+    if args.result_json:
+        summary["duration_ms"] = int((time.monotonic() - started) * 1000)
+        with open(args.result_json, "w") as f:
+            json.dump(summary, f)
 
 
 if __name__ == "__main__":